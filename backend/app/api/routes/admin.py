@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.profiling import sampling_profiler
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def _check_token(token: Optional[str]) -> None:
+    if not sampling_profiler.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiling is disabled"
+        )
+    if settings.admin_token and token != settings.admin_token:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin token"
+        )
+
+
+@router.get("/profiles")
+async def get_profiles(x_admin_token: Optional[str] = Header(None)) -> Dict[str, Dict[str, float]]:
+    """Profiled requests and sample counts per route."""
+
+    _check_token(x_admin_token)
+    return sampling_profiler.summary()
+
+
+@router.get("/profiles/collapsed", response_class=PlainTextResponse)
+async def get_collapsed_stacks(route: Optional[str] = None, x_admin_token: Optional[str] = Header(None)):
+    """Collapsed stacks for flamegraph tools, for one route ('GET /api/v1/hands/') or all."""
+
+    _check_token(x_admin_token)
+    return sampling_profiler.collapsed(route)
+
+
+@router.delete("/profiles", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_profiles(x_admin_token: Optional[str] = Header(None)):
+    """Discard aggregated profiles."""
+
+    _check_token(x_admin_token)
+    sampling_profiler.reset()
+    return None
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException, status
+from app.schemas.equity import RangeEquityRequest, RangeEquityResponse
+from app.core.executor import cpu_executor
+from app.services.poker_service import poker_service
+
+router = APIRouter(prefix="/equity", tags=["equity"])
+
+
+@router.post("/ranges", response_model=RangeEquityResponse)
+async def range_equity(request: RangeEquityRequest):
+    """Calculate range-vs-range equity on a board."""
+
+    try:
+        result = await cpu_executor.run(
+            poker_service.calculate_range_equity,
+            request.range_a,
+            request.range_b,
+            request.board_cards
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return RangeEquityResponse(**result)
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, status
+from psycopg2.errors import UniqueViolation
 from typing import List
 from app.schemas.hand import HandCreate, HandResponse, HandHistoryResponse
-from app.models.hand import Hand
 from app.repositories.hand_repository import hand_repository
-from app.services.poker_service import poker_service
+from app.services.settlement import settle_hand
+from app.services.table_relay import table_relay
+from app.core.config import settings
+from app.core.executor import cpu_executor, ExecutorOverloadedError, ExecutorTimeoutError
 
 router = APIRouter(prefix="/hands", tags=["hands"])
 
@@ -19,35 +22,18 @@ async def create_hand(hand_data: HandCreate):
                 detail=f"Hand with ID {hand_data.hand_id} already exists"
             )
 
-        player_cards_int = {
-            int(k): v for k, v in hand_data.player_cards.items()
-        }
-
-        winnings = poker_service.calculate_winnings(
-            stack_size=hand_data.stack_size,
-            player_cards=hand_data.player_cards,
-            actions=hand_data.actions,
-            board_cards=hand_data.board_cards
-        )
-
-        actions_short = poker_service.convert_actions_to_short_format(
-            hand_data.actions
-        )
-
-        hand = Hand(
-            hand_id=hand_data.hand_id,
-            stack_size=hand_data.stack_size,
-            dealer_position=hand_data.dealer_position,
-            small_blind_position=hand_data.small_blind_position,
-            big_blind_position=hand_data.big_blind_position,
-            player_cards=player_cards_int,
-            actions=actions_short,
-            board_cards=hand_data.board_cards,
-            winnings=winnings
-        )
+        hand = await cpu_executor.run(settle_hand, hand_data)
 
         saved_hand = hand_repository.create(hand)
 
+        table_relay.publish(settings.history_channel, {
+            "latest_hand": {
+                "hand_id": saved_hand.hand_id,
+                "display_lines": saved_hand.format_for_history(),
+                "created_at": saved_hand.created_at.isoformat() if saved_hand.created_at else None
+            }
+        })
+
         response_data = saved_hand.to_dict()
         response_data["player_cards"] = {
             str(k): v for k, v in response_data["player_cards"].items()
@@ -58,8 +44,19 @@ async def create_hand(hand_data: HandCreate):
 
         return HandResponse(**response_data)
 
-    except HTTPException:
+    except (HTTPException, ExecutorOverloadedError, ExecutorTimeoutError):
         raise
+    except UniqueViolation:
+        # A concurrent insert of the same hand_id won the race past the exists() check.
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Hand with ID {hand_data.hand_id} already exists"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid hand: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,50 @@
+import asyncio
+import contextlib
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from typing import Any, Dict
+from app.schemas.table import TableUpdate
+from app.services.table_hub import table_hub
+
+router = APIRouter(prefix="/tables", tags=["tables"])
+
+
+@router.get("/{table_id}")
+async def get_table(table_id: str) -> Dict[str, Any]:
+    """Get the current live state of a table."""
+
+    return table_hub.get_state(table_id)
+
+
+@router.websocket("/{table_id}/ws")
+async def table_channel(websocket: WebSocket, table_id: str):
+    """Stream table state diffs; the first client to push an update owns the table."""
+
+    await websocket.accept()
+    connection = table_hub.connect(table_id, websocket)
+    sender = asyncio.create_task(table_hub.run_sender(connection))
+
+    try:
+        while not connection.evicted:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            try:
+                update = TableUpdate.model_validate_json(message.get("text") or message.get("bytes") or "")
+            except ValidationError as e:
+                table_hub.send_error(connection, f"Invalid update: {e.errors()[0]['msg']}")
+                continue
+
+            if not table_hub.claim(connection):
+                table_hub.send_error(connection, f"Table {table_id} is owned by another publisher")
+                continue
+
+            table_hub.publish(table_id, update.state)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        table_hub.disconnect(connection)
+        sender.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sender
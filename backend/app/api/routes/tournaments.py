@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException, status
+from app.schemas.tournament import ICMRequest, ICMResponse
+from app.core.executor import cpu_executor
+from app.services.poker_service import poker_service
+
+router = APIRouter(prefix="/tournaments", tags=["tournaments"])
+
+
+@router.post("/icm", response_model=ICMResponse)
+async def icm(request: ICMRequest):
+    """Convert stacks and a payout structure into prize equity."""
+
+    try:
+        result = await cpu_executor.run(
+            poker_service.calculate_tournament_equity,
+            request.stacks,
+            request.payouts
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return ICMResponse(**result)
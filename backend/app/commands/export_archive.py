@@ -0,0 +1,34 @@
+import argparse
+import sys
+import time
+from datetime import datetime
+from app.repositories.hand_repository import hand_repository
+from app.services.archive import ArchiveWriter
+
+
+def main(argv=None) -> int:
+    """Export stored hands into a compressed columnar archive file."""
+    parser = argparse.ArgumentParser(description="Export hands to a columnar archive")
+    parser.add_argument("output", help="Archive file to write")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None, help="Created at or after (ISO)")
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None, help="Created before (ISO)")
+    parser.add_argument("--block-size", type=int, default=65536, help="Hands per compressed block")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per database fetch")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    exported = 0
+
+    with ArchiveWriter(args.output, block_size=args.block_size) as writer:
+        for rows in hand_repository.stream_by_time(args.since, args.until, chunk_size=args.chunk_size):
+            writer.extend(rows)
+            exported += len(rows)
+            rate = exported / max(time.monotonic() - started, 1e-9)
+            print(f"{args.output}: {exported} hands ({rate:.0f} hands/s)", file=sys.stderr)
+
+    print(f"Exported {writer.rows} hands in {len(writer.blocks)} blocks to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import argparse
+import sys
+import time
+from app.services.history_importer import HistoryImporter, ImportProgress
+
+
+def main(argv=None) -> int:
+    """Import hand-history text files into the database."""
+    parser = argparse.ArgumentParser(description="Import hand-history text files")
+    parser.add_argument("paths", nargs="+", help="Hand-history files to import")
+    parser.add_argument("--checkpoint", help="Checkpoint file for resuming (one per input file: <path>.<n>)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Hands per bulk insert")
+    parser.add_argument("--workers", type=int, default=None, help="Settlement worker processes (0 = in-process)")
+    parser.add_argument("--mmap", action="store_true", help="Read input files through mmap")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+
+    def report(progress: ImportProgress) -> None:
+        percent = 100 * progress.offset / progress.total_bytes if progress.total_bytes else 100
+        rate = progress.parsed / max(time.monotonic() - started, 1e-9)
+        print(
+            f"{progress.path}: {percent:5.1f}% parsed={progress.parsed} "
+            f"imported={progress.imported} skipped={progress.skipped} ({rate:.0f} hands/s)",
+            file=sys.stderr
+        )
+
+    importer = HistoryImporter(
+        batch_size=args.batch_size,
+        workers=args.workers,
+        use_mmap=args.mmap,
+        on_progress=report
+    )
+
+    for index, path in enumerate(args.paths):
+        checkpoint = f"{args.checkpoint}.{index}" if args.checkpoint and len(args.paths) > 1 else args.checkpoint
+        progress = importer.run(path, checkpoint_path=checkpoint)
+        print(f"Imported {progress.imported} hands from {path} ({progress.skipped} skipped)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+import httpx
+from app.core.cards import CARD_NAMES
+from app.core.config import settings
+
+OPERATIONS = ("create", "get", "list")
+
+
+def synthetic_hand(rng: random.Random, num_players: int = 6, stack_size: int = 10000) -> Dict:
+    """Build a random but well-formed POST /api/v1/hands payload."""
+    deck = list(CARD_NAMES)
+    rng.shuffle(deck)
+
+    def seat(position: int) -> int:
+        return (position - 1) % num_players + 1
+
+    dealer = rng.randint(1, num_players)
+    small_blind = dealer if num_players == 2 else seat(dealer + 1)
+    big_blind = seat(small_blind + 1)
+
+    player_cards = {str(p): deck.pop() + deck.pop() for p in range(1, num_players + 1)}
+    order = [seat(big_blind + i) for i in range(1, num_players + 1)]
+
+    actions = []
+    active = list(order)
+    current_bet = settings.big_blind
+    for player in order:
+        roll = rng.random()
+        if roll < 0.45 and player != big_blind:
+            actions.append({"round": "preflop", "player": player, "action": "fold"})
+            active.remove(player)
+        elif roll < 0.9 or current_bet > settings.big_blind:
+            if player == big_blind and current_bet == settings.big_blind:
+                actions.append({"round": "preflop", "player": player, "action": "check"})
+            else:
+                actions.append({"round": "preflop", "player": player, "action": "call", "amount": current_bet})
+        else:
+            current_bet *= 3
+            actions.append({"round": "preflop", "player": player, "action": "raise", "amount": current_bet})
+
+    board_cards = ""
+    for round_name, count in (("flop", 3), ("turn", 1), ("river", 1)):
+        if len(active) < 2:
+            break
+        cards = "".join(deck.pop() for _ in range(count))
+        board_cards += cards
+        actions.append({"round": round_name, "cards": cards})
+
+        bet = 0
+        for player in list(active):
+            roll = rng.random()
+            if bet and roll < 0.3 and len(active) > 1:
+                actions.append({"round": round_name, "player": player, "action": "fold"})
+                active.remove(player)
+            elif bet:
+                actions.append({"round": round_name, "player": player, "action": "call", "amount": bet})
+            elif roll < 0.3:
+                bet = settings.big_blind * rng.randint(1, 5)
+                actions.append({"round": round_name, "player": player, "action": "bet", "amount": bet})
+            else:
+                actions.append({"round": round_name, "player": player, "action": "check"})
+
+    return {
+        "hand_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "stack_size": stack_size,
+        "num_players": num_players,
+        "dealer_position": dealer,
+        "small_blind_position": small_blind,
+        "big_blind_position": big_blind,
+        "player_cards": player_cards,
+        "actions": actions,
+        "board_cards": board_cards or None
+    }
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+@dataclass
+class LoadResult:
+    """Latencies (seconds) and status codes collected per operation."""
+
+    elapsed: float = 0.0
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: {op: [] for op in OPERATIONS})
+    statuses: Dict[str, Dict[int, int]] = field(default_factory=lambda: {op: {} for op in OPERATIONS})
+    errors: Dict[str, int] = field(default_factory=lambda: {op: 0 for op in OPERATIONS})
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Throughput and latency percentiles (ms) per operation."""
+        report = {}
+        for op in OPERATIONS:
+            values = sorted(self.latencies[op])
+            report[op] = {
+                "requests": len(values),
+                "errors": self.errors[op],
+                "rps": len(values) / self.elapsed if self.elapsed else 0.0,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p90_ms": percentile(values, 90) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": (values[-1] if values else 0.0) * 1000,
+            }
+        return report
+
+
+class LoadGenerator:
+    """Drives the hands API with a weighted mix of creates, gets and lists."""
+
+    def __init__(
+            self,
+            client: httpx.AsyncClient,
+            concurrency: int = 16,
+            mix: Optional[Dict[str, float]] = None,
+            table_sizes: Sequence[int] = (settings.num_players,),
+            history_limit: int = 10,
+            seed: int = 0
+    ):
+        self.client = client
+        self.concurrency = concurrency
+        self.mix = mix or {"create": 0.2, "get": 0.3, "list": 0.5}
+        self.table_sizes = list(table_sizes)
+        self.history_limit = history_limit
+        self.rng = random.Random(seed)
+        self.hand_ids: List[str] = []
+
+    def _choose(self) -> str:
+        op = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        if op == "get" and not self.hand_ids:
+            return "create"
+        return op
+
+    async def _request(self, op: str) -> httpx.Response:
+        if op == "create":
+            payload = synthetic_hand(self.rng, num_players=self.rng.choice(self.table_sizes))
+            response = await self.client.post("/api/v1/hands/", json=payload)
+            if response.status_code == 201:
+                self.hand_ids.append(payload["hand_id"])
+            return response
+        if op == "get":
+            return await self.client.get(f"/api/v1/hands/{self.rng.choice(self.hand_ids)}")
+        return await self.client.get("/api/v1/hands/", params={"limit": self.history_limit})
+
+    async def warm_up(self, hands: int) -> None:
+        """Create some hands first so reads have something to fetch."""
+        for _ in range(hands):
+            await self._request("create")
+
+    async def run(self, duration: Optional[float] = None, requests: Optional[int] = None) -> LoadResult:
+        """Run until ``duration`` seconds pass or ``requests`` have been sent."""
+        result = LoadResult()
+        deadline = time.perf_counter() + duration if duration else None
+        remaining = [requests] if requests else None
+
+        async def worker() -> None:
+            while True:
+                if deadline and time.perf_counter() >= deadline:
+                    return
+                if remaining is not None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+
+                op = self._choose()
+                started = time.perf_counter()
+                try:
+                    response = await self._request(op)
+                except httpx.HTTPError:
+                    result.errors[op] += 1
+                    continue
+                result.latencies[op].append(time.perf_counter() - started)
+                statuses = result.statuses[op]
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code >= 500:
+                    result.errors[op] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        result.elapsed = time.perf_counter() - started
+        return result
+
+
+def start_app(port: int, workers: int) -> subprocess.Popen:
+    """Migrate the local database and start uvicorn in a subprocess."""
+    subprocess.run([sys.executable, "-m", "app.commands.migrate"], check=True)
+    process = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning"
+    ], env={**os.environ, "PYTHONUNBUFFERED": "1"})
+
+    for _ in range(100):
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError("App did not become healthy")
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse 'create=1,get=3,list=6' into weights."""
+    weights = {}
+    for part in mix.split(","):
+        op, _, weight = part.partition("=")
+        if op not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation: {op}")
+        weights[op] = float(weight)
+    return weights
+
+
+def main(argv=None) -> int:
+    """Load-test the hands API and print throughput and latency percentiles."""
+    parser = argparse.ArgumentParser(description="Load-test the hands API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of a running app")
+    parser.add_argument("--start-app", action="store_true", help="Start a local app against the configured database")
+    parser.add_argument("--port", type=int, default=8011, help="Port for --start-app")
+    parser.add_argument("--app-workers", type=int, default=1, help="uvicorn workers for --start-app")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client connections")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests instead")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("create=2,get=3,list=5"), help="Operation weights")
+    parser.add_argument("--table-sizes", default=str(settings.num_players), help="Comma-separated table sizes")
+    parser.add_argument("--warmup", type=int, default=20, help="Hands created before measuring")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for payloads")
+    args = parser.parse_args(argv)
+
+    process = start_app(args.port, args.app_workers) if args.start_app else None
+    base_url = f"http://127.0.0.1:{args.port}" if args.start_app else args.url
+
+    async def run() -> LoadResult:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            generator = LoadGenerator(
+                client,
+                concurrency=args.concurrency,
+                mix=args.mix,
+                table_sizes=[int(size) for size in args.table_sizes.split(",")],
+                seed=args.seed
+            )
+            await generator.warm_up(args.warmup)
+            return await generator.run(
+                duration=None if args.requests else args.duration,
+                requests=args.requests
+            )
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    total = sum(len(values) for values in result.latencies.values())
+    print(f"{total} requests in {result.elapsed:.1f}s ({total / result.elapsed:.0f} req/s), "
+          f"concurrency {args.concurrency}")
+    print(f"{'op':<8}{'reqs':>8}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for op, row in result.summary().items():
+        print(f"{op:<8}{row['requests']:>8}{row['errors']:>8}{row['rps']:>9.0f}"
+              f"{row['p50_ms']:>9.1f}{row['p90_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+    for op, statuses in result.statuses.items():
+        if statuses:
+            print(f"{op} status codes: {dict(sorted(statuses.items()))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+import sys
+import time
+from app.core.database import shards
+
+
+def main(argv=None) -> int:
+    """Create or upgrade the database schema once, outside the API workers."""
+    started = time.perf_counter()
+    print(f"Migrating database schema on {len(shards)} shard(s)...")
+    shards.init_db()
+    print(f"Database schema up to date ({(time.perf_counter() - started) * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+import argparse
+import sys
+import time
+from app.core.database import shards
+from app.services.rebalance import rebalance_shard
+
+
+def main(argv=None) -> int:
+    """Move hands to the shard their hand_id hashes to after DATABASE_SHARDS grew."""
+    parser = argparse.ArgumentParser(description="Rebalance hands across shards")
+    parser.add_argument("--shard", type=int, default=None, help="Only scan this shard (default: every shard)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per fetch and move")
+    parser.add_argument("--dry-run", action="store_true", help="Count misplaced rows without moving them")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    shards.init_db()
+
+    verb = "would move" if args.dry_run else "moved"
+    shard_indexes = [args.shard] if args.shard is not None else range(len(shards))
+    for shard in shard_indexes:
+        stats = rebalance_shard(shard, chunk_size=args.chunk_size, dry_run=args.dry_run)
+        print(f"Shard {shard}: scanned {stats.scanned} hands, {verb} {stats.moved}")
+
+    print(f"Rebalanced {len(shards)} shard(s) in {time.monotonic() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
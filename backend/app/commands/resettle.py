@@ -0,0 +1,52 @@
+import argparse
+import sys
+import time
+from app.core.database import shards
+from app.services.resettlement import ResettleJob, ResettleStats
+
+
+def main(argv=None) -> int:
+    """Re-run settlement over stored hands and fix winnings that changed."""
+    parser = argparse.ArgumentParser(description="Re-settle stored hands")
+    parser.add_argument("--start-id", type=int, default=None, help="First row id (inclusive)")
+    parser.add_argument("--end-id", type=int, default=None, help="Last row id (exclusive)")
+    parser.add_argument("--partition-size", type=int, default=100_000, help="Ids per worker task")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per fetch and bulk update")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 = in-process)")
+    parser.add_argument("--checkpoint", help="File recording finished id ranges, for resuming")
+    parser.add_argument("--dry-run", action="store_true", help="Count changes without writing them")
+    parser.add_argument("--shard", type=int, default=None, help="Only this shard (default: every shard)")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+
+    def report(stats: ResettleStats, totals: ResettleStats) -> None:
+        rate = totals.scanned / max(time.monotonic() - started, 1e-9)
+        print(
+            f"ids {stats.start_id}-{stats.end_id}: scanned={stats.scanned} changed={stats.changed} "
+            f"failed={stats.failed} | total scanned={totals.scanned} changed={totals.changed} "
+            f"({rate:.0f} rows/s)",
+            file=sys.stderr
+        )
+
+    # Row ids are per shard, so each shard is re-settled (and checkpointed) on its own.
+    shard_indexes = [args.shard] if args.shard is not None else range(len(shards))
+    for shard in shard_indexes:
+        checkpoint = f"{args.checkpoint}.{shard}" if args.checkpoint and len(shards) > 1 else args.checkpoint
+        job = ResettleJob(
+            partition_size=args.partition_size,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            dry_run=args.dry_run,
+            on_progress=report,
+            shard=shard
+        )
+        totals = job.run(args.start_id, args.end_id, checkpoint_path=checkpoint)
+
+        verb = "would change" if args.dry_run else "changed"
+        print(f"Shard {shard}: scanned {totals.scanned} hands, {verb} {totals.changed}, {totals.failed} failed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from starlette.exceptions import HTTPException
+from app.core.config import settings
+from app.core.profiling import route_name
+
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request cannot be served within its route's deadline."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdaptiveLimit:
+    """Concurrency limit for one route, adjusted from observed latency (AIMD).
+
+    Latency is judged once per window of samples: the window's p90 is
+    compared with a baseline that slowly follows earlier windows, so jitter
+    and single slow requests do not move the limit. The limit grows by one
+    per busy window and shrinks multiplicatively when the p90 climbs past
+    ``tolerance`` times the baseline or too many requests fail.
+    """
+
+    def __init__(
+            self,
+            deadline: float,
+            initial: int = settings.admission_initial_limit,
+            min_limit: int = 1,
+            max_limit: int = 64,
+            tolerance: float = settings.admission_latency_tolerance,
+            backoff: float = 0.9,
+            window: int = 20,
+            baseline_decay: float = 0.05,
+            max_error_rate: float = 0.1
+    ):
+        self.deadline = deadline
+        self.limit = float(min(initial, max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.window = window
+        self.baseline_decay = baseline_decay
+        self.max_error_rate = max_error_rate
+        self.inflight = 0
+        self.waiting = 0
+        self.peak = 0
+        self.latency = 0.0
+        self.baseline = 0.0
+        self.samples = 0
+        self.rejected = 0
+        self._latencies: List[float] = []
+        self._failures = 0
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.inflight < int(self.limit)
+
+    def take(self) -> None:
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+
+    def on_sample(self, latency: float, failed: bool = False) -> None:
+        """Record one finished request; failures count against the limit but never the baseline."""
+        self.samples += 1
+        if failed:
+            self._failures += 1
+        else:
+            self.latency = latency if not self.latency else 0.9 * self.latency + 0.1 * latency
+            self._latencies.append(latency)
+
+        if self._failures + len(self._latencies) >= self.window:
+            self._adjust()
+
+    def _adjust(self) -> None:
+        total = self._failures + len(self._latencies)
+        overloaded = self._failures > total * self.max_error_rate
+
+        if self._latencies:
+            ordered = sorted(self._latencies)
+            p90 = ordered[(len(ordered) - 1) * 9 // 10]
+            if not self.baseline:
+                self.baseline = p90
+            overloaded = overloaded or p90 > self.baseline * self.tolerance
+            self.baseline += self.baseline_decay * (p90 - self.baseline)
+
+        if overloaded:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif self.peak * 2 >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1)
+
+        self._latencies = []
+        self._failures = 0
+        self.peak = self.inflight
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "limit": int(self.limit),
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "latency_ms": round(self.latency * 1000, 3),
+            "baseline_ms": round(self.baseline * 1000, 3),
+            "rejected": self.rejected,
+        }
+
+
+class Budget:
+    """Shared concurrency cap for every route of one kind (reads or writes)."""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self.inflight = 0
+        self.waiters: Deque[Tuple[AdaptiveLimit, asyncio.Future]] = deque()
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.inflight < self.max_concurrency
+
+
+class AdmissionController:
+    """Per-route adaptive limits inside separate read and write budgets.
+
+    A request that cannot get a slot right away may wait only if the
+    estimated wait still lets it finish before its deadline; otherwise it is
+    rejected at once so the client can retry elsewhere or later.
+    """
+
+    def __init__(
+            self,
+            enabled: bool = settings.admission_enabled,
+            read_max: int = settings.admission_read_max_concurrency,
+            write_max: int = settings.admission_write_max_concurrency,
+            read_deadline: float = settings.admission_read_deadline,
+            write_deadline: float = settings.admission_write_deadline
+    ):
+        self.enabled = enabled
+        self.budgets = {"read": Budget(read_max), "write": Budget(write_max)}
+        self.deadlines = {"read": read_deadline, "write": write_deadline}
+        self.limits: Dict[str, AdaptiveLimit] = {}
+
+    def limit_for(self, route: str, kind: str) -> AdaptiveLimit:
+        """The adaptive limit of one route, created on first use."""
+        limit = self.limits.get(route)
+        if limit is None:
+            limit = AdaptiveLimit(self.deadlines[kind], max_limit=self.budgets[kind].max_concurrency)
+            self.limits[route] = limit
+        return limit
+
+    def _take(self, limit: AdaptiveLimit, budget: Budget) -> None:
+        limit.take()
+        budget.inflight += 1
+
+    def _wake(self, budget: Budget) -> None:
+        for waiter in list(budget.waiters):
+            if not budget.has_capacity:
+                return
+            limit, future = waiter
+            if future.done():
+                budget.waiters.remove(waiter)
+            elif limit.has_capacity:
+                budget.waiters.remove(waiter)
+                self._take(limit, budget)
+                future.set_result(None)
+
+    def _reject(self, limit: AdaptiveLimit, route: str, wait: float) -> AdmissionRejectedError:
+        limit.rejected += 1
+        return AdmissionRejectedError(
+            f"{route} is over capacity, retry later",
+            retry_after=max(1, math.ceil(wait))
+        )
+
+    async def acquire(self, route: str, kind: str) -> AdaptiveLimit:
+        """Take a slot for ``route`` or raise AdmissionRejectedError."""
+        limit = self.limit_for(route, kind)
+        budget = self.budgets[kind]
+
+        # Only requests for the same route queue behind each other; a waiter
+        # stuck on its own route's limit must not hold up routes with room.
+        if limit.has_capacity and budget.has_capacity and not limit.waiting:
+            self._take(limit, budget)
+            return limit
+
+        ahead = limit.waiting if budget.has_capacity else len(budget.waiters)
+        wait = limit.latency * (ahead + 1) / max(int(limit.limit), 1)
+        if limit.latency + wait > limit.deadline:
+            raise self._reject(limit, route, wait)
+
+        future = asyncio.get_running_loop().create_future()
+        budget.waiters.append((limit, future))
+        limit.waiting += 1
+        try:
+            await asyncio.wait_for(future, limit.deadline - limit.latency)
+        except asyncio.TimeoutError:
+            raise self._reject(limit, route, wait)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(limit, kind, None, failed=False)
+            raise
+        finally:
+            limit.waiting -= 1
+        return limit
+
+    def release(self, limit: AdaptiveLimit, kind: str, latency: Optional[float], failed: bool) -> None:
+        """Return a slot and record how long the request took; a latency of None records nothing."""
+        budget = self.budgets[kind]
+        limit.inflight -= 1
+        budget.inflight -= 1
+        if latency is not None:
+            limit.on_sample(latency, failed)
+        self._wake(budget)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Current limits, latencies and budget usage."""
+        return {
+            "budgets": {
+                kind: {"max": budget.max_concurrency, "inflight": budget.inflight, "waiting": len(budget.waiters)}
+                for kind, budget in self.budgets.items()
+            },
+            "routes": {route: limit.snapshot() for route, limit in sorted(self.limits.items())},
+        }
+
+
+admission_controller = AdmissionController()
+
+
+async def admit(request: Request):
+    """Route dependency that holds an admission slot for the whole request."""
+    if not admission_controller.enabled:
+        yield
+        return
+
+    kind = "read" if request.method in READ_METHODS else "write"
+    route = route_name(request.scope)
+    limit = await admission_controller.acquire(route, kind)
+
+    started = time.perf_counter()
+    latency = None
+    failed = False
+    try:
+        yield
+        latency = time.perf_counter() - started
+    except (HTTPException, RequestValidationError) as exc:
+        # Client errors say nothing about load, so only server errors are recorded.
+        if getattr(exc, "status_code", 422) >= 500:
+            latency = time.perf_counter() - started
+            failed = True
+        raise
+    except Exception:
+        latency = time.perf_counter() - started
+        failed = True
+        raise
+    finally:
+        admission_controller.release(limit, kind, latency, failed)
@@ -0,0 +1,95 @@
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+
+Cards = Tuple[int, ...]
+
+# Canonical two-character name of every card, indexed by its code (rank * 4 + suit).
+CARD_NAMES: Tuple[str, ...] = tuple(rank + suit for rank in RANKS for suit in SUITS)
+
+# Every accepted spelling ('Ah', 'ah', 'AH', ...) mapped straight to its code.
+CARD_CODES: Dict[str, int] = {}
+for _code, _name in enumerate(CARD_NAMES):
+    for _rank in {_name[0], _name[0].lower()}:
+        for _suit in {_name[1], _name[1].upper()}:
+            CARD_CODES[_rank + _suit] = _code
+
+HOLE_CARDS = 2
+BOARD_SIZES = (0, 3, 4, 5)
+
+
+def parse_card(card: str) -> int:
+    """Convert a card such as 'Ah' to an integer 0-51 (rank * 4 + suit)."""
+    code = CARD_CODES.get(card)
+    if code is None:
+        raise ValueError(f"Invalid card: {card!r}")
+    return code
+
+
+@lru_cache(maxsize=65536)
+def _parse_cards(cards: str) -> Cards:
+    if len(cards) % 2:
+        raise ValueError(f"Invalid card string: {cards!r}")
+    try:
+        return tuple(map(CARD_CODES.__getitem__, [cards[i:i + 2] for i in range(0, len(cards), 2)]))
+    except KeyError as e:
+        raise ValueError(f"Invalid card: {e.args[0]!r}") from None
+
+
+def parse_cards(cards: Optional[str]) -> Cards:
+    """Convert a concatenated card string such as '3hKdQs' to card codes; cached per string."""
+    if not cards:
+        return ()
+    return _parse_cards(cards)
+
+
+@lru_cache(maxsize=4096)
+def parse_hole_cards(cards: str) -> Cards:
+    """Parse a player's two hole cards."""
+    codes = parse_cards(cards)
+    if len(codes) != HOLE_CARDS:
+        raise ValueError(f"Expected {HOLE_CARDS} hole cards, got {cards!r}")
+    return codes
+
+
+@lru_cache(maxsize=65536)
+def parse_board(cards: Optional[str]) -> Cards:
+    """Parse community cards: none, a flop, a turn or a river."""
+    codes = parse_cards(cards)
+    if len(codes) not in BOARD_SIZES:
+        raise ValueError(f"Board must have 0, 3, 4 or 5 cards, got {cards!r}")
+    return codes
+
+
+def format_cards(codes: Iterable[int]) -> str:
+    """Convert card codes back to their canonical concatenated string."""
+    return "".join(CARD_NAMES[code] for code in codes)
+
+
+@lru_cache(maxsize=65536)
+def _normalize_cards(cards: str) -> str:
+    return format_cards(_parse_cards(cards))
+
+
+def normalize_cards(cards: Optional[str]) -> Optional[str]:
+    """Canonical spelling of a card string ('ahKD' -> 'AhKd'); None stays None."""
+    if not cards:
+        return cards
+    return _normalize_cards(cards)
+
+
+def rank_of(code: int) -> int:
+    """Rank index 0-12 (deuce to ace) of a card code."""
+    return code >> 2
+
+
+def suit_of(code: int) -> int:
+    """Suit index 0-3 of a card code."""
+    return code & 3
+
+
+def cache_info():
+    """Hit/miss statistics of the card-string cache."""
+    return _parse_cards.cache_info()
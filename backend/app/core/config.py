@@ -14,6 +14,16 @@ class Settings(BaseSettings):
     database_name: str = os.getenv("DATABASE_NAME", "poker_db")
     database_user: str = os.getenv("DATABASE_USER", "poker_user")
     database_password: str = os.getenv("DATABASE_PASSWORD", "poker_password")
+    database_replicas: str = os.getenv("DATABASE_REPLICAS", "")  # comma-separated host[:port]
+    database_shards: str = os.getenv("DATABASE_SHARDS", "")  # comma-separated host[:port][/database]
+    database_pool_min: int = 1
+    database_pool_max: int = 20
+    database_read_your_writes: bool = True
+    read_your_writes_header: str = "X-Read-After-LSN"
+    database_connect_timeout: int = 3
+    database_replica_cooldown: float = 30.0
+
+    run_migrations_on_startup: bool = False
 
     api_version: str = "v1"
     api_title: str = "Poker API"
@@ -22,6 +32,42 @@ class Settings(BaseSettings):
     small_blind: int = 20
     num_players: int = 6
 
+    executor_kind: str = "thread"
+    executor_workers: Optional[int] = None
+    executor_max_queue_depth: int = 64
+    executor_timeout: float = 10.0
+
+    admission_enabled: bool = True
+    admission_initial_limit: int = 16
+    admission_read_max_concurrency: int = 32
+    admission_write_max_concurrency: int = 16
+    admission_read_deadline: float = 2.0
+    admission_write_deadline: float = 10.0
+    admission_latency_tolerance: float = 2.0
+
+    profiling_enabled: bool = False
+    profiling_sample_every: int = 100
+    profiling_interval: float = 0.001
+    profiling_header: str = "X-Profile"
+    admin_token: Optional[str] = None
+
+    equity_cache_size: int = 1024
+    equity_max_enumeration: int = 50000
+    equity_max_work: int = 5000000
+    equity_samples: int = 20000
+    equity_seed: int = 0
+
+    board_texture_cache_size: int = 65536
+
+    icm_cache_size: int = 1024
+    icm_max_states: int = 200000
+    icm_samples: int = 20000
+    icm_seed: int = 0
+
+    ws_send_buffer_size: int = 64
+    history_channel: str = "history"
+    table_notify_channel: str = "table_hub"
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,42 +1,274 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import itertools
+import logging
+import os
+import threading
+import time
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 from contextlib import contextmanager
-from typing import Generator, Any, Dict, List
+from contextvars import ContextVar
+from typing import Callable, Generator, Any, Dict, List, Optional, Set, TypeVar
+import uuid
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+PRIMARY = 0
+
+T = TypeVar("T")
+
+
+def parse_lsn(lsn: Optional[str]) -> Optional[int]:
+    """Convert a Postgres LSN such as '16/B374D848' to an integer."""
+    if not lsn:
+        return None
+    high, low = lsn.split("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+def format_lsn(lsn: int) -> str:
+    """Inverse of parse_lsn."""
+    return f"{lsn >> 32:X}/{lsn & 0xFFFFFFFF:X}"
+
+
+class ReadAfter:
+    """Write position the current request must be able to read."""
+
+    def __init__(self, lsn: int = 0):
+        self.lsn = lsn
+
+
+_read_after: ContextVar[Optional[ReadAfter]] = ContextVar("read_after", default=None)
+
+# Errors that mean a node cannot be reached, as opposed to e.g. an exhausted pool.
+CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+def _modified(cursor) -> bool:
+    """Whether the last statement on a cursor changed data (plain SELECTs do not)."""
+    status = getattr(cursor, "statusmessage", None) or ""
+    return bool(status) and not status.startswith("SELECT")
+
+
+def parse_hosts(hosts: str, default_port: int) -> List[Dict[str, Any]]:
+    """Parse a comma-separated 'host[:port][/database]' list."""
+    nodes = []
+    for entry in hosts.split(","):
+        entry = entry.strip()
+        if entry:
+            address, _, database = entry.partition("/")
+            host, _, port = address.partition(":")
+            node = {"host": host, "port": int(port) if port else default_port}
+            if database:
+                node["database"] = database
+            nodes.append(node)
+    return nodes
+
+
+def key_hash(key: str) -> int:
+    """Stable 64-bit hash of a shard key (unlike hash(), identical in every process)."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """Jump consistent hash: growing to N+1 buckets moves only 1/(N+1) of the keys."""
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
 
 class Database:
-    """Database connection manager."""
+    """Database connection manager.
 
-    def __init__(self):
-        self.connection_params = {
+    Writes go to the primary; reads issued with ``read_only=True`` are spread
+    over the replicas, each node having its own connection pool. A replica
+    that fails to answer is skipped for ``replica_cooldown`` seconds.
+    """
+
+    def __init__(
+            self,
+            primary: Optional[Dict[str, Any]] = None,
+            replicas: Optional[List[Dict[str, Any]]] = None,
+            pool_min: int = settings.database_pool_min,
+            pool_max: int = settings.database_pool_max,
+            read_your_writes: bool = settings.database_read_your_writes,
+            connect_timeout: int = settings.database_connect_timeout,
+            replica_cooldown: float = settings.database_replica_cooldown
+    ):
+        self.connection_params = primary or {
             "host": settings.database_host,
             "port": settings.database_port,
             "database": settings.database_name,
             "user": settings.database_user,
             "password": settings.database_password,
         }
+        if replicas is None:
+            replicas = [
+                {**self.connection_params, **node}
+                for node in parse_hosts(settings.database_replicas, settings.database_port)
+            ]
+        self.replica_params = replicas
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self.read_your_writes = read_your_writes
+        self.connect_timeout = connect_timeout
+        self.replica_cooldown = replica_cooldown
+
+        self._pools: Dict[int, ThreadedConnectionPool] = {}
+        self._pool_pid: Optional[int] = None
+        self._inherited_pools: List[Dict[int, ThreadedConnectionPool]] = []
+        self._lock = threading.Lock()
+        self._next_replica = itertools.count()
+        self._replica_lsn: Dict[int, int] = {}
+        self._down_until: Dict[int, float] = {}
+        # Connections handed out per pool, so a retired pool is closed only once unused.
+        self._leases: Dict[ThreadedConnectionPool, int] = {}
+        self._retired: Set[ThreadedConnectionPool] = set()
+
+    def _get_pool(self, node: int) -> ThreadedConnectionPool:
+        with self._lock:
+            if self._pool_pid != os.getpid():
+                # Pools inherited through fork share sockets with the parent;
+                # keep them referenced so they are never closed from here.
+                if self._pools:
+                    self._inherited_pools.append(self._pools)
+                self._pools = {}
+                self._replica_lsn = {}
+                self._pool_pid = os.getpid()
+
+            pool = self._pools.get(node)
+            if pool is None:
+                params = self.connection_params if node == PRIMARY else self.replica_params[node - 1]
+                pool = ThreadedConnectionPool(
+                    self.pool_min, self.pool_max, **{"connect_timeout": self.connect_timeout, **params}
+                )
+                self._pools[node] = pool
+            return pool
+
+    def _checkout(self, node: int):
+        pool = self._get_pool(node)
+        conn = pool.getconn()
+        with self._lock:
+            self._leases[pool] = self._leases.get(pool, 0) + 1
+        return pool, conn
+
+    def _checkin(self, pool: ThreadedConnectionPool, conn) -> None:
+        broken = False
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            broken = True
+        with self._lock:
+            self._leases[pool] -= 1
+            retired = pool in self._retired
+            unused = retired and not self._leases[pool]
+            if unused:
+                self._retired.discard(pool)
+                del self._leases[pool]
+        pool.putconn(conn, close=broken or retired or bool(conn.closed))
+        if unused:
+            pool.closeall()
+
+    def _replica_caught_up(self, node: int) -> bool:
+        """Whether a replica has replayed the write position the current request must see."""
+        session = _read_after.get()
+        target = session.lsn if session else 0
+        if not target or self._replica_lsn.get(node, 0) >= target:
+            return True
+
+        pool, conn = self._checkout(node)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT pg_last_wal_replay_lsn()")
+            replayed = parse_lsn(cursor.fetchone()[0])
+            cursor.close()
+        finally:
+            self._checkin(pool, conn)
+
+        if replayed is None:
+            return False
+        self._replica_lsn[node] = max(replayed, self._replica_lsn.get(node, 0))
+        return replayed >= target
+
+    def _mark_down(self, node: int) -> None:
+        """Stop using a replica that failed until its cooldown has passed."""
+        logger.warning(f"Replica {node} unavailable, skipping it for {self.replica_cooldown}s")
+        with self._lock:
+            self._down_until[node] = time.monotonic() + self.replica_cooldown
+            pool = self._pools.pop(node, None)
+            if pool is None:
+                return
+            # Connections still checked out (e.g. an open stream) are closed as they come back.
+            in_use = self._leases.get(pool, 0) > 0
+            if in_use:
+                self._retired.add(pool)
+            else:
+                self._leases.pop(pool, None)
+        if not in_use:
+            pool.closeall()
+
+    def _read_node(self) -> int:
+        if not self.replica_params:
+            return PRIMARY
+
+        start = next(self._next_replica)
+        now = time.monotonic()
+        for offset in range(len(self.replica_params)):
+            node = 1 + (start + offset) % len(self.replica_params)
+            if self._down_until.get(node, 0) > now:
+                continue
+            if self.read_your_writes:
+                try:
+                    if not self._replica_caught_up(node):
+                        continue
+                except CONNECTION_ERRORS:
+                    self._mark_down(node)
+                    continue
+            return node
+        return PRIMARY
+
+    def _record_write(self, cursor, session: ReadAfter) -> None:
+        cursor.execute("SELECT pg_current_wal_lsn()")
+        row = cursor.fetchone()
+        lsn = parse_lsn(row["pg_current_wal_lsn"] if isinstance(row, dict) else row[0])
+        session.lsn = max(session.lsn, lsn or 0)
 
     @contextmanager
-    def get_connection(self) -> Generator:
+    def get_connection(self, read_only: bool = False) -> Generator:
         """Get database connection context manager."""
-        conn = None
+        node = self._read_node() if read_only else PRIMARY
+        try:
+            pool, conn = self._checkout(node)
+        except CONNECTION_ERRORS:
+            if node == PRIMARY:
+                raise
+            self._mark_down(node)
+            pool, conn = self._checkout(PRIMARY)
+
         try:
-            conn = psycopg2.connect(**self.connection_params)
             yield conn
         finally:
-            if conn:
-                conn.close()
+            self._checkin(pool, conn)
 
     @contextmanager
-    def get_cursor(self, dict_cursor: bool = True) -> Generator:
+    def get_cursor(self, dict_cursor: bool = True, read_only: bool = False) -> Generator:
         """Get database cursor context manager."""
-        with self.get_connection() as conn:
+        with self.get_connection(read_only=read_only) as conn:
             cursor_factory = RealDictCursor if dict_cursor else None
             cursor = conn.cursor(cursor_factory=cursor_factory)
             try:
                 yield cursor
+                wrote = _modified(cursor)
                 conn.commit()
+                session = _read_after.get()
+                if wrote and session is not None and self.read_your_writes and self.replica_params:
+                    self._record_write(cursor, session)
             except Exception:
                 conn.rollback()
                 raise
@@ -48,18 +280,40 @@ class Database:
         with self.get_cursor() as cursor:
             cursor.execute(query, params)
 
-    def fetch_one(self, query: str, params: tuple = None) -> Dict[str, Any]:
+    def fetch_one(self, query: str, params: tuple = None, read_only: bool = False) -> Dict[str, Any]:
         """Fetch one row from the database."""
-        with self.get_cursor() as cursor:
+        with self.get_cursor(read_only=read_only) as cursor:
             cursor.execute(query, params)
             return cursor.fetchone()
 
-    def fetch_all(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+    def fetch_all(self, query: str, params: tuple = None, read_only: bool = False) -> List[Dict[str, Any]]:
         """Fetch all rows from the database."""
-        with self.get_cursor() as cursor:
+        with self.get_cursor(read_only=read_only) as cursor:
             cursor.execute(query, params)
             return cursor.fetchall()
 
+    def stream(
+            self,
+            query: str,
+            params: tuple = None,
+            chunk_size: int = 1000,
+            read_only: bool = False
+    ) -> Generator:
+        """Yield rows in chunks through a server-side cursor."""
+        with self.get_connection(read_only=read_only) as conn:
+            cursor = conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=RealDictCursor)
+            cursor.itersize = chunk_size
+            try:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+                conn.rollback()
+
     def init_db(self):
         """Initialize database tables."""
         create_table_query = """
@@ -74,10 +328,114 @@ class Database:
             actions TEXT NOT NULL,
             board_cards VARCHAR(255),
             winnings JSONB NOT NULL,
+            num_players INTEGER NOT NULL DEFAULT 6,
+            board_pairing SMALLINT,
+            board_max_suit SMALLINT,
+            board_flush_draw BOOLEAN,
+            board_straight_possible BOOLEAN,
+            board_straight_draw BOOLEAN,
+            board_nut_category SMALLINT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
+        ALTER TABLE hands ADD COLUMN IF NOT EXISTS num_players INTEGER NOT NULL DEFAULT 6;
+        ALTER TABLE hands
+            ADD COLUMN IF NOT EXISTS board_pairing SMALLINT,
+            ADD COLUMN IF NOT EXISTS board_max_suit SMALLINT,
+            ADD COLUMN IF NOT EXISTS board_flush_draw BOOLEAN,
+            ADD COLUMN IF NOT EXISTS board_straight_possible BOOLEAN,
+            ADD COLUMN IF NOT EXISTS board_straight_draw BOOLEAN,
+            ADD COLUMN IF NOT EXISTS board_nut_category SMALLINT;
         """
         self.execute(create_table_query)
 
 
-db = Database()
\ No newline at end of file
+class ReadYourWritesMiddleware:
+    """ASGI middleware that carries a client's last write position between workers.
+
+    Responses carry the LSN of the request's writes (or the one it was sent);
+    a client that echoes it back is never served from a replica that has not
+    replayed it, whichever worker handles the read.
+    """
+
+    def __init__(self, app, header: str = settings.read_your_writes_header):
+        self.app = app
+        self.header = header.lower().encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        session = ReadAfter()
+        for name, value in scope["headers"]:
+            if name == self.header:
+                try:
+                    session.lsn = parse_lsn(value.decode("latin-1")) or 0
+                except ValueError:
+                    pass
+
+        async def send_with_lsn(message):
+            if message["type"] == "http.response.start" and session.lsn:
+                headers = list(message.get("headers", [])) + [(self.header, format_lsn(session.lsn).encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _read_after.set(session)
+        try:
+            await self.app(scope, receive, send_with_lsn)
+        finally:
+            _read_after.reset(token)
+
+
+class ShardSet:
+    """Hands spread over independent databases, placed by a hash of hand_id.
+
+    Shards can only be appended: jump hashing keeps existing keys in place
+    except for the share that moves to the new shard (see rebalance_shards).
+    """
+
+    def __init__(self, databases: List[Database]):
+        self.databases = databases
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.databases)
+
+    def shard_for(self, key: str) -> int:
+        """Index of the shard that owns ``key``."""
+        if len(self.databases) == 1:
+            return 0
+        return jump_hash(key_hash(key), len(self.databases))
+
+    def for_key(self, key: str) -> Database:
+        """Database that owns ``key``."""
+        return self.databases[self.shard_for(key)]
+
+    def fan_out(self, func: Callable[[Database], T]) -> List[T]:
+        """Run ``func`` against every shard concurrently; results in shard order."""
+        if len(self.databases) == 1:
+            return [func(self.databases[0])]
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=len(self.databases), thread_name_prefix="shard")
+            self._executor_pid = os.getpid()
+        return list(self._executor.map(func, self.databases))
+
+    def init_db(self) -> None:
+        """Create or upgrade the schema on every shard."""
+        for database in self.databases:
+            database.init_db()
+
+
+db = Database()
+
+
+def build_shards(shard_hosts: str = settings.database_shards) -> ShardSet:
+    """Shards from DATABASE_SHARDS, or just the default database when unset."""
+    nodes = parse_hosts(shard_hosts, settings.database_port)
+    if not nodes:
+        return ShardSet([db])
+    return ShardSet([Database(primary={**db.connection_params, **node}, replicas=[]) for node in nodes])
+
+
+shards = build_shards()
\ No newline at end of file
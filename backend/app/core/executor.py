@@ -0,0 +1,114 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from app.core.config import settings
+from app.core.profiling import sampling_profiler
+
+
+class ExecutorOverloadedError(Exception):
+    """Raised when too many CPU-bound calls are already queued."""
+
+
+class ExecutorTimeoutError(Exception):
+    """Raised when a CPU-bound call does not finish in time."""
+
+
+_call_state = threading.local()
+
+
+def check_deadline() -> None:
+    """Raise ExecutorTimeoutError once the pool call running on this thread is past its deadline.
+
+    Long computations call this periodically, because a running thread
+    cannot be cancelled from outside.
+    """
+    deadline = getattr(_call_state, "deadline", None)
+    if deadline is not None and time.monotonic() > deadline:
+        raise ExecutorTimeoutError("CPU-bound call stopped at its deadline")
+
+
+def _call_with_deadline(deadline: float, func: Callable[..., Any], *args: Any) -> Any:
+    # time.monotonic() is system-wide on Linux, so the deadline also holds in pool processes.
+    _call_state.deadline = deadline
+    try:
+        return func(*args)
+    finally:
+        _call_state.deadline = None
+
+
+class CPUExecutor:
+    """Runs CPU-bound calls off the event loop in a thread or process pool."""
+
+    def __init__(
+            self,
+            kind: str = settings.executor_kind,
+            max_workers: Optional[int] = settings.executor_workers,
+            max_queue_depth: int = settings.executor_max_queue_depth,
+            timeout: Optional[float] = settings.executor_timeout
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.timeout = timeout
+        self._pool: Optional[Executor] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of submitted calls that have not finished yet."""
+        return self._in_flight
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cpu")
+        return self._pool
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` in the pool and await its result."""
+        with self._lock:
+            if self._in_flight >= self.max_queue_depth:
+                raise ExecutorOverloadedError(
+                    f"{self._in_flight} CPU-bound calls already queued"
+                )
+            self._in_flight += 1
+
+        try:
+            if self.timeout is not None:
+                func = functools.partial(_call_with_deadline, time.monotonic() + self.timeout, func)
+            if self.kind == "thread":
+                func = sampling_profiler.bind(func)
+            future = self._get_pool().submit(func, *args)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise ExecutorTimeoutError(f"CPU-bound call exceeded {self.timeout}s")
+
+    def shutdown(self) -> None:
+        """Stop the pool; it is recreated on the next call."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+cpu_executor = CPUExecutor()
@@ -0,0 +1,211 @@
+import asyncio
+import contextvars
+import functools
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+
+Stack = Tuple[str, ...]
+
+_current_profile: contextvars.ContextVar = contextvars.ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    """Stack samples collected while one request was running."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, task: Optional[asyncio.Task]):
+        self.loop = loop
+        # thread id -> task that must be current on that thread (None for worker threads)
+        self.threads: Dict[int, Optional[asyncio.Task]] = {threading.get_ident(): task}
+        self.samples: Counter = Counter()
+
+
+class RouteProfile:
+    """Samples aggregated over every profiled request of one route."""
+
+    def __init__(self):
+        self.requests = 0
+        self.seconds = 0.0
+        self.samples: Counter = Counter()
+
+
+def _collapse(frame) -> Stack:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+def route_name(scope) -> str:
+    """'METHOD /path/{param}' for a routed request, so samples group by route."""
+    route = scope.get("route")
+    if route is None:
+        return f"{scope['method']} <unmatched>"
+
+    path = scope["path"]
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return f"{scope['method']} {path}"
+
+    # Routes of included routers report their template without the include prefix;
+    # the prefix is whatever precedes the part of the path the route itself matched.
+    for index, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[index:]):
+            return f"{scope['method']} {path[:index]}{path_format}"
+    return f"{scope['method']} {path_format}"
+
+
+class SamplingProfiler:
+    """Samples Python stacks of profiled requests and aggregates them per route."""
+
+    def __init__(
+            self,
+            enabled: bool = settings.profiling_enabled,
+            sample_every: int = settings.profiling_sample_every,
+            interval: float = settings.profiling_interval
+    ):
+        self.enabled = enabled
+        self.sample_every = sample_every
+        self.interval = interval
+        self.routes: Dict[str, RouteProfile] = {}
+        self._active: Dict[int, RequestProfile] = {}
+        self._ids = itertools.count()
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def should_profile(self, forced: bool) -> bool:
+        """Pick one out of every ``sample_every`` requests, or a forced one."""
+        if not self.enabled:
+            return False
+        if forced:
+            return True
+        return self.sample_every > 0 and next(self._counter) % self.sample_every == 0
+
+    def start(self) -> Tuple[int, RequestProfile]:
+        """Begin sampling the current task; call from inside the request."""
+        loop = asyncio.get_running_loop()
+        profile = RequestProfile(loop, asyncio.current_task())
+        profile_id = next(self._ids)
+        with self._lock:
+            self._active[profile_id] = profile
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._sample_loop, name="request-sampler", daemon=True)
+                self._thread.start()
+        return profile_id, profile
+
+    def stop(self, profile_id: int, route: str, seconds: float) -> None:
+        """Finish sampling and fold the samples into the route aggregate."""
+        with self._lock:
+            profile = self._active.pop(profile_id, None)
+            if profile is None:
+                return
+            aggregate = self.routes.setdefault(route, RouteProfile())
+            aggregate.requests += 1
+            aggregate.seconds += seconds
+            aggregate.samples.update(profile.samples)
+
+    def bind(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap ``func`` so worker-thread time counts toward the current profile."""
+        profile = _current_profile.get()
+        if profile is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            thread_id = threading.get_ident()
+            profile.threads[thread_id] = None
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.threads.pop(thread_id, None)
+
+        return wrapper
+
+    def _sample_loop(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                active = list(self._active.values())
+                if not active:
+                    self._thread = None
+                    return
+
+            frames = sys._current_frames()
+            for profile in active:
+                for thread_id, task in list(profile.threads.items()):
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    if task is not None and asyncio.current_task(profile.loop) is not task:
+                        continue
+                    stack = _collapse(frame)
+                    if stack:
+                        profile.samples[stack] += 1
+
+    def collapsed(self, route: Optional[str] = None) -> str:
+        """Render samples as flamegraph collapsed stacks ('a;b;c count' lines)."""
+        lines = []
+        with self._lock:
+            for name, aggregate in sorted(self.routes.items()):
+                if route is not None and name != route:
+                    continue
+                for stack, count in aggregate.samples.most_common():
+                    prefix = () if route is not None else (name,)
+                    lines.append(f"{';'.join(prefix + stack)} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Profiled request counts, time and sample counts per route."""
+        with self._lock:
+            return {
+                name: {
+                    "requests": aggregate.requests,
+                    "seconds": round(aggregate.seconds, 6),
+                    "samples": sum(aggregate.samples.values()),
+                }
+                for name, aggregate in sorted(self.routes.items())
+            }
+
+    def reset(self) -> None:
+        """Drop all aggregated samples."""
+        with self._lock:
+            self.routes.clear()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles sampled or explicitly requested HTTP requests."""
+
+    def __init__(self, app, profiler: "SamplingProfiler" = None, header: str = settings.profiling_header):
+        self.app = app
+        self.profiler = profiler or sampling_profiler
+        self.header = header.lower().encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        forced = any(name == self.header and value not in (b"", b"0") for name, value in scope["headers"])
+        if not self.profiler.should_profile(forced):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id, profile = self.profiler.start()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_profile.reset(token)
+            self.profiler.stop(profile_id, route_name(scope), time.perf_counter() - started)
+
+
+sampling_profiler = SamplingProfiler()
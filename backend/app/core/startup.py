@@ -0,0 +1,29 @@
+import time
+from typing import Dict
+
+
+class StartupTimer:
+    """Records how long each phase of worker startup takes."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self._last = self.started
+
+    def mark(self, phase: str) -> None:
+        """Close the current phase under the given name."""
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self._last) * 1000, 2)
+        self._last = now
+
+    @property
+    def total_ms(self) -> float:
+        """Time from first import to the latest mark."""
+        return round((self._last - self.started) * 1000, 2)
+
+    def report(self) -> Dict:
+        """Startup timings for logging and the health endpoint."""
+        return {"total_ms": self.total_ms, "phases_ms": dict(self.phases)}
+
+
+startup_timer = StartupTimer()
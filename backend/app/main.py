@@ -1,19 +1,34 @@
-from fastapi import FastAPI
+from app.core.startup import startup_timer
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from app.core.admission import AdmissionRejectedError, admission_controller, admit
 from app.core.config import settings
-from app.core.database import db
-from app.api.routes import hands
+from app.core.database import ReadYourWritesMiddleware, db, shards
+from app.core.executor import cpu_executor, ExecutorOverloadedError, ExecutorTimeoutError
+from app.core.profiling import ProfilingMiddleware
+from app.services.table_relay import table_relay
+from app.api.routes import hands, tables, equity, tournaments, admin
+
+startup_timer.mark("imports")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    print("Initializing database...")
-    db.init_db()
-    print("Database initialized successfully")
+    if settings.run_migrations_on_startup:
+        print("Initializing database...")
+        shards.init_db()
+        print("Database initialized successfully")
+        startup_timer.mark("migrations")
+    table_relay.start()
+    startup_timer.mark("lifespan")
+    print(f"Startup completed in {startup_timer.total_ms} ms: {startup_timer.phases}")
     yield
     print("Application shutting down...")
+    table_relay.stop()
+    cpu_executor.shutdown()
 
 
 app = FastAPI(
@@ -28,9 +43,49 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[settings.read_your_writes_header],
 )
 
-app.include_router(hands.router, prefix="/api/v1")
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+
+
+@app.exception_handler(ExecutorOverloadedError)
+async def executor_overloaded_handler(request: Request, exc: ExecutorOverloadedError):
+    """Reject work when the CPU executor queue is full."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(AdmissionRejectedError)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejectedError):
+    """Shed requests that could not finish before their route's deadline."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.exception_handler(ExecutorTimeoutError)
+async def executor_timeout_handler(request: Request, exc: ExecutorTimeoutError):
+    """Report CPU-bound calls that ran past their timeout."""
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": str(exc)}
+    )
+
+
+app.include_router(hands.router, prefix="/api/v1", dependencies=[Depends(admit)])
+app.include_router(tables.router, prefix="/api/v1")
+app.include_router(equity.router, prefix="/api/v1", dependencies=[Depends(admit)])
+app.include_router(tournaments.router, prefix="/api/v1", dependencies=[Depends(admit)])
+app.include_router(admin.router)
+
+startup_timer.mark("app")
 
 
 @app.get("/")
@@ -41,6 +96,9 @@ async def root():
         "version": settings.api_version,
         "endpoints": {
             "hands": "/api/v1/hands",
+            "tables": "/api/v1/tables/{table_id}/ws",
+            "equity": "/api/v1/equity/ranges",
+            "icm": "/api/v1/tournaments/icm",
             "docs": "/docs",
             "redoc": "/redoc"
         }
@@ -68,6 +126,18 @@ async def health_check():
         }
 
 
+@app.get("/health/startup")
+async def startup_report():
+    """Worker startup timings."""
+    return startup_timer.report()
+
+
+@app.get("/health/admission")
+async def admission_report():
+    """Adaptive concurrency limits and budget usage."""
+    return admission_controller.snapshot()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from datetime import datetime
 import json
+from app.core.config import settings
 
 
 @dataclass
@@ -16,6 +17,7 @@ class Hand:
     player_cards: Dict[int, str]  # {player_number: cards}
     actions: str  # Short format action sequence
     board_cards: Optional[str] = None
+    num_players: int = settings.num_players
     winnings: Dict[int, int] = field(default_factory=dict)  # {player_number: amount}
     id: Optional[int] = None
     created_at: Optional[datetime] = None
@@ -26,6 +28,7 @@ class Hand:
             "id": self.id,
             "hand_id": self.hand_id,
             "stack_size": self.stack_size,
+            "num_players": self.num_players,
             "dealer_position": self.dealer_position,
             "small_blind_position": self.small_blind_position,
             "big_blind_position": self.big_blind_position,
@@ -48,6 +51,7 @@ class Hand:
             id=data.get("id"),
             hand_id=data["hand_id"],
             stack_size=data["stack_size"],
+            num_players=data.get("num_players") or settings.num_players,
             dealer_position=data["dealer_position"],
             small_blind_position=data["small_blind_position"],
             big_blind_position=data["big_blind_position"],
@@ -86,4 +90,10 @@ class Hand:
         else:
             lines.append("Winnings: Not calculated")
 
+        return lines
+
+    def format_for_export(self) -> List[str]:
+        """Format hand for a history file, keeping the table size the display omits."""
+        lines = self.format_for_history()
+        lines.insert(2, f"Seats: {self.num_players}")
         return lines
\ No newline at end of file
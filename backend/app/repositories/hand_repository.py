@@ -1,11 +1,55 @@
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime
+from itertools import islice
+import heapq
 import json
+from psycopg2.extras import Json, execute_values
 from app.models.hand import Hand
-from app.core.database import db
+from app.core.database import Database, ShardSet, shards
+from app.services.board_texture import texture_columns
+
+# Stored columns other than the per-shard id, in insert order.
+ROW_COLUMNS = (
+    "hand_id", "stack_size", "dealer_position", "small_blind_position", "big_blind_position",
+    "player_cards", "actions", "board_cards", "winnings", "num_players",
+    "board_pairing", "board_max_suit", "board_flush_draw",
+    "board_straight_possible", "board_straight_draw", "board_nut_category", "created_at",
+)
+
+
+def _created_at(row: Dict):
+    return row["created_at"]
+
+
+def _merge_rows(chunked: Iterable[List[Dict]]) -> Iterator[Dict]:
+    for rows in chunked:
+        yield from rows
 
 
 class HandRepository:
-    """Repository for hand data access."""
+    """Repository for hand data access.
+
+    Each hand lives on the shard its hand_id hashes to; queries over many
+    hands fan out to every shard and k-way merge the results on created_at.
+    """
+
+    def __init__(self, shard_set: Optional[ShardSet] = None):
+        self.shards = shard_set or shards
+
+    def _shard(self, index: int) -> Database:
+        return self.shards.databases[index]
+
+    def _recent(self, limit: int) -> List[Hand]:
+        query = """
+            SELECT * FROM hands 
+            ORDER BY created_at DESC 
+            LIMIT %s
+        """
+
+        results = self.shards.fan_out(lambda database: database.fetch_all(query, (limit,), read_only=True))
+        merged = heapq.merge(*results, key=_created_at, reverse=True)
+
+        return [Hand.from_dict(row) for row in islice(merged, limit)]
 
     def create(self, hand: Hand) -> Hand:
         """Create a new hand in the database."""
@@ -13,8 +57,10 @@ class HandRepository:
             INSERT INTO hands (
                 hand_id, stack_size, dealer_position, 
                 small_blind_position, big_blind_position,
-                player_cards, actions, board_cards, winnings
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                player_cards, actions, board_cards, winnings, num_players,
+                board_pairing, board_max_suit, board_flush_draw,
+                board_straight_possible, board_straight_draw, board_nut_category
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             RETURNING id, created_at
         """
 
@@ -27,22 +73,63 @@ class HandRepository:
             json.dumps(hand.player_cards),
             hand.actions,
             hand.board_cards,
-            json.dumps(hand.winnings)
+            json.dumps(hand.winnings),
+            hand.num_players,
+            *texture_columns(hand.board_cards)
         )
 
-        result = db.fetch_one(query, params)
+        result = self.shards.for_key(hand.hand_id).fetch_one(query, params)
         hand.id = result["id"]
         hand.created_at = result["created_at"]
 
         return hand
 
+    def bulk_create(self, hands: List[Hand]) -> int:
+        """Insert many hands at once, skipping IDs that already exist."""
+        if not hands:
+            return 0
+
+        query = """
+            INSERT INTO hands (
+                hand_id, stack_size, dealer_position,
+                small_blind_position, big_blind_position,
+                player_cards, actions, board_cards, winnings, num_players,
+                board_pairing, board_max_suit, board_flush_draw,
+                board_straight_possible, board_straight_draw, board_nut_category
+            ) VALUES %s
+            ON CONFLICT (hand_id) DO NOTHING
+            RETURNING id
+        """
+
+        groups: Dict[int, List[Tuple]] = {}
+        for hand in hands:
+            groups.setdefault(self.shards.shard_for(hand.hand_id), []).append((
+                hand.hand_id,
+                hand.stack_size,
+                hand.dealer_position,
+                hand.small_blind_position,
+                hand.big_blind_position,
+                json.dumps(hand.player_cards),
+                hand.actions,
+                hand.board_cards,
+                json.dumps(hand.winnings),
+                hand.num_players,
+                *texture_columns(hand.board_cards)
+            ))
+
+        inserted = 0
+        for index, rows in groups.items():
+            with self._shard(index).get_cursor() as cursor:
+                inserted += len(execute_values(cursor, query, rows, page_size=1000, fetch=True))
+        return inserted
+
     def get_by_id(self, hand_id: str) -> Optional[Hand]:
         """Get a hand by its ID."""
         query = """
             SELECT * FROM hands WHERE hand_id = %s
         """
 
-        result = db.fetch_one(query, (hand_id,))
+        result = self.shards.for_key(hand_id).fetch_one(query, (hand_id,), read_only=True)
 
         if result:
             return Hand.from_dict(result)
@@ -50,27 +137,115 @@ class HandRepository:
 
     def get_all(self, limit: int = 100) -> List[Hand]:
         """Get all hands, ordered by creation date."""
+        return self._recent(limit)
+
+    def get_recent(self, limit: int = 10) -> List[Hand]:
+        """Get recent hands."""
+        return self._recent(limit)
+
+    def get_id_bounds(self, shard: int = 0) -> Tuple[Optional[int], Optional[int]]:
+        """Get the smallest and largest row ids on one shard (ids are per shard)."""
         query = """
-            SELECT * FROM hands 
-            ORDER BY created_at DESC 
-            LIMIT %s
+            SELECT MIN(id) AS min_id, MAX(id) AS max_id FROM hands
         """
 
-        results = db.fetch_all(query, (limit,))
+        result = self._shard(shard).fetch_one(query)
+        return result["min_id"], result["max_id"]
 
-        return [Hand.from_dict(row) for row in results]
+    def stream_range(
+            self,
+            start_id: int,
+            end_id: int,
+            chunk_size: int = 1000,
+            shard: int = 0
+    ) -> Iterator[List[Dict]]:
+        """Stream raw rows of one shard with start_id <= id < end_id in id order, from the primary."""
+        query = """
+            SELECT * FROM hands
+            WHERE id >= %s AND id < %s
+            ORDER BY id
+        """
 
-    def get_recent(self, limit: int = 10) -> List[Hand]:
-        """Get recent hands."""
+        # Jobs that write back what they stream must not read a standby: long cursors
+        # there get cancelled by recovery conflicts, and replica lag hides the newest rows.
+        yield from self._shard(shard).stream(query, (start_id, end_id), chunk_size=chunk_size)
+
+    def stream_by_time(
+            self,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            chunk_size: int = 1000
+    ) -> Iterator[List[Dict]]:
+        """Stream raw rows created in [start, end) in creation order, merged across shards."""
         query = """
-            SELECT * FROM hands 
-            ORDER BY created_at DESC 
-            LIMIT %s
+            SELECT * FROM hands
+            WHERE (%s::timestamp IS NULL OR created_at >= %s)
+              AND (%s::timestamp IS NULL OR created_at < %s)
+            ORDER BY created_at, id
+        """
+
+        params = (start, start, end, end)
+        merged = heapq.merge(
+            *(
+                _merge_rows(database.stream(query, params, chunk_size=chunk_size, read_only=True))
+                for database in self.shards.databases
+            ),
+            key=_created_at
+        )
+        while True:
+            rows = list(islice(merged, chunk_size))
+            if not rows:
+                return
+            yield rows
+
+    def copy_rows(self, rows: List[Dict], shard: int) -> int:
+        """Insert stored rows as they are (created_at included) into one shard."""
+        if not rows:
+            return 0
+
+        query = f"""
+            INSERT INTO hands ({", ".join(ROW_COLUMNS)}) VALUES %s
+            ON CONFLICT (hand_id) DO NOTHING
+        """
+
+        values = [
+            tuple(Json(row[name]) if isinstance(row[name], dict) else row[name] for name in ROW_COLUMNS)
+            for row in rows
+        ]
+
+        with self._shard(shard).get_cursor() as cursor:
+            execute_values(cursor, query, values, page_size=1000)
+            return len(values)
+
+    def delete_many(self, hand_ids: List[str], shard: int) -> int:
+        """Delete hands by ID from one shard."""
+        if not hand_ids:
+            return 0
+
+        query = """
+            DELETE FROM hands WHERE hand_id = ANY(%s)
+        """
+
+        with self._shard(shard).get_cursor() as cursor:
+            cursor.execute(query, (hand_ids,))
+            return cursor.rowcount
+
+    def bulk_update_winnings(self, updates: List[Tuple[int, Dict[int, int]]], shard: int = 0) -> int:
+        """Overwrite winnings for many rows of one shard, given (id, winnings) pairs."""
+        if not updates:
+            return 0
+
+        query = """
+            UPDATE hands SET winnings = data.winnings::jsonb
+            FROM (VALUES %s) AS data (id, winnings)
+            WHERE hands.id = data.id
         """
 
-        results = db.fetch_all(query, (limit,))
+        rows = [(row_id, json.dumps(winnings)) for row_id, winnings in updates]
 
-        return [Hand.from_dict(row) for row in results]
+        with self._shard(shard).get_cursor() as cursor:
+            execute_values(cursor, query, rows, page_size=1000)
+            return len(rows)
 
     def delete(self, hand_id: str) -> bool:
         """Delete a hand by its ID."""
@@ -78,17 +253,17 @@ class HandRepository:
             DELETE FROM hands WHERE hand_id = %s
         """
 
-        with db.get_cursor() as cursor:
+        with self.shards.for_key(hand_id).get_cursor() as cursor:
             cursor.execute(query, (hand_id,))
             return cursor.rowcount > 0
 
     def exists(self, hand_id: str) -> bool:
-        """Check if a hand exists."""
+        """Check if a hand exists, on the primary so a lagging replica cannot miss it."""
         query = """
             SELECT EXISTS(SELECT 1 FROM hands WHERE hand_id = %s)
         """
 
-        result = db.fetch_one(query, (hand_id,))
+        result = self.shards.for_key(hand_id).fetch_one(query, (hand_id,))
         return result["exists"] if result else False
 
 
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class RangeEquityRequest(BaseModel):
+    """Schema for a range-vs-range equity query."""
+
+    range_a: str = Field(..., description="First range, e.g. 'QQ+,AKs'")
+    range_b: str = Field(..., description="Second range, e.g. 'JJ,AQs'")
+    board_cards: Optional[str] = Field(None, description="Community cards (0, 3, 4 or 5 cards)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "range_a": "QQ+,AKs",
+                "range_b": "JJ-99,AQs",
+                "board_cards": "3hKdQs"
+            }
+        }
+
+
+class RangeEquityResponse(BaseModel):
+    """Schema for range equity results."""
+
+    range_a_equity: float
+    range_b_equity: float
+    range_a_win: float
+    range_b_win: float
+    tie: float
+    matchups: int
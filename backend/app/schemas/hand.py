@@ -1,25 +1,140 @@
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional
+from pydantic import BaseModel, Discriminator, Field, StringConstraints, Tag, model_validator
+from typing import Annotated, Dict, List, Literal, Optional, Union
+from typing_extensions import NotRequired, TypedDict
 from datetime import datetime
+from app.core.cards import format_cards, normalize_cards, parse_board, parse_cards, parse_hole_cards
+from app.core.config import settings
+
+MIN_PLAYERS = 2
+MAX_PLAYERS = 10
+
+# Checked by pydantic-core before any Python validator runs.
+CARD_PATTERN = r"[2-9TJQKAtjqka][cdhsCDHS]"
+HoleCards = Annotated[str, StringConstraints(pattern=rf"^(?:{CARD_PATTERN}){{2}}$")]
+BoardCards = Annotated[str, StringConstraints(pattern=rf"^(?:{CARD_PATTERN}){{0,5}}$")]
+Seat = Annotated[str, StringConstraints(pattern=r"^\d{1,2}$")]
+
+
+class DealAction(TypedDict):
+    """Community cards dealt at the start of a street."""
+
+    round: Literal["flop", "turn", "river"]
+    action: NotRequired[Literal["deal"]]
+    cards: BoardCards
+
+
+class PlayerAction(TypedDict):
+    """A betting action by one seat."""
+
+    round: Literal["preflop", "flop", "turn", "river"]
+    player: Annotated[int, Field(ge=1, le=MAX_PLAYERS)]
+    action: Literal["fold", "check", "call", "bet", "raise", "allin"]
+    amount: NotRequired[Annotated[int, Field(ge=0)]]
+
+
+def _action_kind(action) -> str:
+    return "deal" if isinstance(action, dict) and "cards" in action else "player"
+
+
+# Actions stay plain dicts, the form settlement and the short format read.
+Action = Annotated[
+    Union[Annotated[DealAction, Tag("deal")], Annotated[PlayerAction, Tag("player")]],
+    Discriminator(_action_kind)
+]
+
+
+def _duplicates(cards: List[int]) -> str:
+    return format_cards(sorted(card for card in set(cards) if cards.count(card) > 1))
 
 
 class HandCreate(BaseModel):
     """Schema for creating a hand."""
 
-    hand_id: str = Field(..., description="Unique hand identifier")
-    stack_size: int = Field(..., description="Starting stack size for all players")
-    dealer_position: int = Field(..., ge=1, le=6, description="Dealer position (1-6)")
-    small_blind_position: int = Field(..., ge=1, le=6, description="Small blind position")
-    big_blind_position: int = Field(..., ge=1, le=6, description="Big blind position")
-    player_cards: Dict[str, str] = Field(..., description="Player cards mapping")
-    actions: List[Dict] = Field(..., description="List of actions taken")
-    board_cards: Optional[str] = Field(None, description="Community cards")
+    hand_id: str = Field(..., min_length=1, description="Unique hand identifier")
+    stack_size: int = Field(..., gt=0, description="Starting stack size for all players")
+    num_players: int = Field(
+        settings.num_players, ge=MIN_PLAYERS, le=MAX_PLAYERS, description="Number of seats at the table"
+    )
+    dealer_position: int = Field(..., ge=1, le=MAX_PLAYERS, description="Dealer position (1-num_players)")
+    small_blind_position: int = Field(..., ge=1, le=MAX_PLAYERS, description="Small blind position")
+    big_blind_position: int = Field(..., ge=1, le=MAX_PLAYERS, description="Big blind position")
+    player_cards: Dict[Seat, HoleCards] = Field(..., description="Player cards mapping")
+    actions: List[Action] = Field(..., description="List of actions taken")
+    board_cards: Optional[BoardCards] = Field(None, description="Community cards")
+
+    @model_validator(mode="after")
+    def check_seats(self) -> "HandCreate":
+        """Ensure every seat reference fits the table size."""
+        seats = range(1, self.num_players + 1)
+
+        for name in ("dealer_position", "small_blind_position", "big_blind_position"):
+            if getattr(self, name) not in seats:
+                raise ValueError(f"{name} must be between 1 and {self.num_players}")
+        if self.small_blind_position == self.big_blind_position:
+            raise ValueError("small_blind_position and big_blind_position must differ")
+
+        for player in self.player_cards:
+            if int(player) not in seats:
+                raise ValueError(f"Player {player} is not a seat at a {self.num_players}-player table")
+
+        for action in self.actions:
+            player = action.get("player")
+            if player is None:
+                continue
+            if player not in seats:
+                raise ValueError(f"Action for player {player} is not a seat at a {self.num_players}-player table")
+            if action["action"] in ("bet", "raise") and not action.get("amount"):
+                raise ValueError(f"Player {player} {action['action']} needs a positive amount")
+
+        return self
+
+    @model_validator(mode="after")
+    def check_streets(self) -> "HandCreate":
+        """Ensure nobody acts on a street before its cards are dealt."""
+        dealt = {"preflop"}
+        for action in self.actions:
+            if "cards" in action:
+                dealt.add(action["round"])
+            elif action["round"] not in dealt:
+                raise ValueError(f"Player {action['player']} acts on the {action['round']} before it is dealt")
+
+        return self
+
+    @model_validator(mode="after")
+    def check_cards(self) -> "HandCreate":
+        """Parse every card once, reject duplicates and store canonical spelling."""
+        cards = []
+        for player, hole in self.player_cards.items():
+            cards.extend(parse_hole_cards(hole))
+            self.player_cards[player] = normalize_cards(hole)
+
+        board = parse_board(self.board_cards)
+        cards.extend(board)
+        self.board_cards = normalize_cards(self.board_cards) or None
+
+        dealt = []
+        for action in self.actions:
+            if "cards" in action:
+                dealt.extend(parse_cards(action["cards"]))
+                action["cards"] = normalize_cards(action["cards"])
+
+        if len(set(cards)) != len(cards):
+            raise ValueError(f"Duplicate cards: {_duplicates(cards)}")
+        if len(set(dealt)) != len(dealt):
+            raise ValueError(f"Duplicate cards: {_duplicates(dealt)}")
+        if board and not set(dealt) <= set(board):
+            raise ValueError(f"Dealt cards are not on the board: {format_cards(sorted(set(dealt) - set(board)))}")
+        if not board and not set(dealt).isdisjoint(cards):
+            raise ValueError(f"Duplicate cards: {format_cards(sorted(set(dealt) & set(cards)))}")
+
+        return self
 
     class Config:
         json_schema_extra = {
             "example": {
                 "hand_id": "39b5999a-cdc1-4469-947e-649d30aa6158",
                 "stack_size": 10000,
+                "num_players": 6,
                 "dealer_position": 3,
                 "small_blind_position": 4,
                 "big_blind_position": 5,
@@ -53,6 +168,7 @@ class HandResponse(BaseModel):
     id: int
     hand_id: str
     stack_size: int
+    num_players: int
     dealer_position: int
     small_blind_position: int
     big_blind_position: int
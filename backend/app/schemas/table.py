@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, Literal
+
+
+class TableUpdate(BaseModel):
+    """Schema for a partial state update pushed over a table's websocket."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    type: Literal["update"]
+    state: Dict[str, Any] = Field(..., max_length=64, description="Top-level keys to set; null removes a key")
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+# Largest field the ICM endpoint accepts; Monte Carlo cost grows with every player.
+MAX_ICM_PLAYERS = 50
+
+
+class ICMRequest(BaseModel):
+    """Schema for a tournament-equity (ICM) query."""
+
+    stacks: List[int] = Field(
+        ..., min_length=2, max_length=MAX_ICM_PLAYERS, description="Chip stack of every remaining player"
+    )
+    payouts: List[float] = Field(
+        ..., min_length=1, max_length=MAX_ICM_PLAYERS, description="Prize for 1st, 2nd, ... place"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "stacks": [4200, 3100, 1800, 900],
+                "payouts": [50, 30, 20]
+            }
+        }
+
+
+class ICMResponse(BaseModel):
+    """Schema for ICM results."""
+
+    equities: List[float]
+    method: str
+    samples: int
+    prize_pool: float
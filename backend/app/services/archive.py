@@ -0,0 +1,410 @@
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import json
+import mmap
+import os
+import struct
+import zlib
+from app.core.cards import format_cards, parse_cards
+
+MAGIC = b"PKHA"
+VERSION = 1
+HEADER = struct.Struct("<4sH")
+TRAILER = struct.Struct("<Q4s")
+
+NO_CARD = 255
+BOARD_WIDTH = 5
+
+# Fixed-width integer columns and their array typecodes.
+INT_COLUMNS = {
+    "id": "q",
+    "created_at": "q",
+    "stack_size": "q",
+    "num_players": "B",
+    "dealer_position": "B",
+    "small_blind_position": "B",
+    "big_blind_position": "B",
+}
+COLUMNS = tuple(INT_COLUMNS) + ("hand_id", "player_cards", "board_cards", "actions", "winnings")
+
+# Action opcodes; the low nibble of the opcode byte holds the seat (or card count for streets).
+FOLD, CHECK, CALL, BET, RAISE, ALLIN, FLOP, TURN, RIVER = range(9)
+PLAYER_OPS = {"f": FOLD, "x": CHECK, "c": CALL, "allin": ALLIN}
+PLAYER_CODES = {op: code for code, op in PLAYER_OPS.items()}
+STREET_OPS = {"flop": FLOP, "turn": TURN, "river": RIVER}
+STREET_NAMES = {op: name for name, op in STREET_OPS.items()}
+
+
+def _micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return 0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1_000_000)
+
+
+def _datetime(micros: int) -> Optional[datetime]:
+    if not micros:
+        return None
+    return datetime.fromtimestamp(micros / 1_000_000, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_actions(actions_short: str) -> bytes:
+    """Pack a short format action string into opcode bytes."""
+    out = bytearray()
+    for token in actions_short.split():
+        prefix, _, value = token.partition(":")
+        if prefix in STREET_OPS:
+            cards = parse_cards(value)
+            out.append(STREET_OPS[prefix] << 4 | len(cards))
+            out.extend(cards)
+            continue
+
+        if not prefix.startswith("p") or not prefix[1:].isdigit() or not value:
+            raise ValueError(f"Invalid action: {token}")
+        seat = int(prefix[1:])
+        if value in PLAYER_OPS:
+            out.append(PLAYER_OPS[value] << 4 | seat)
+        elif value[0] in ("b", "r") and value[1:].isdigit():
+            out.append((BET if value[0] == "b" else RAISE) << 4 | seat)
+            _write_varint(out, int(value[1:]))
+        else:
+            raise ValueError(f"Invalid action: {token}")
+    return bytes(out)
+
+
+def decode_actions(data: bytes) -> str:
+    """Inverse of encode_actions."""
+    tokens = []
+    pos = 0
+    while pos < len(data):
+        op, low = data[pos] >> 4, data[pos] & 0x0F
+        pos += 1
+        if op in STREET_NAMES:
+            tokens.append(f"{STREET_NAMES[op]}:{format_cards(data[pos:pos + low])}")
+            pos += low
+        elif op in (BET, RAISE):
+            amount, pos = _read_varint(data, pos)
+            tokens.append(f"p{low}:{'b' if op == BET else 'r'}{amount}")
+        else:
+            tokens.append(f"p{low}:{PLAYER_CODES[op]}")
+    return " ".join(tokens)
+
+
+def _seat_map(value) -> Dict[int, Any]:
+    if isinstance(value, str):
+        value = json.loads(value)
+    return {int(seat): item for seat, item in value.items()}
+
+
+def _pack_strings(values: Sequence[bytes]) -> bytes:
+    lengths = array("I", (len(value) for value in values))
+    return struct.pack("<I", len(values)) + lengths.tobytes() + b"".join(values)
+
+
+def _unpack_strings(data: bytes) -> List[bytes]:
+    (count,) = struct.unpack_from("<I", data)
+    lengths = array("I")
+    lengths.frombytes(data[4:4 + 4 * count])
+    values, pos = [], 4 + 4 * count
+    for length in lengths:
+        values.append(data[pos:pos + length])
+        pos += length
+    return values
+
+
+@dataclass
+class BlockInfo:
+    """Where one block's compressed columns live, and the creation times it covers.
+
+    Rows come from every shard and their ids are only unique per shard, so
+    blocks are indexed by created_at alone.
+    """
+
+    rows: int
+    min_created_at: int
+    max_created_at: int
+    columns: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+
+class ArchiveWriter:
+    """Writes stored hands rows into a column-per-block compressed archive file."""
+
+    def __init__(self, path: str, block_size: int = 65536, level: int = 6):
+        self.path = path
+        self.block_size = block_size
+        self.level = level
+        self.blocks: List[BlockInfo] = []
+        self.rows = 0
+        self._pending: List[Dict] = []
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def append(self, row: Dict) -> None:
+        """Add one hands row (as returned by the repository)."""
+        self._pending.append(row)
+        if len(self._pending) >= self.block_size:
+            self._flush()
+
+    def extend(self, rows: Iterable[Dict]) -> None:
+        """Add many hands rows."""
+        for row in rows:
+            self.append(row)
+
+    def _encode_block(self, rows: List[Dict]) -> Dict[str, bytes]:
+        columns = {name: array(code) for name, code in INT_COLUMNS.items()}
+        player_cards = bytearray()
+        board_cards = bytearray()
+        winnings = array("i")
+        hand_ids, actions = [], []
+
+        for row in rows:
+            cards = _seat_map(row["player_cards"])
+            num_players = row.get("num_players") or len(cards)
+            values = dict(row, num_players=num_players, created_at=_micros(row.get("created_at")))
+            for name, column in columns.items():
+                column.append(values[name])
+
+            for seat in range(1, num_players + 1):
+                player_cards.extend(parse_cards(cards[seat]) if seat in cards else (NO_CARD, NO_CARD))
+
+            board = parse_cards(row.get("board_cards"))
+            board_cards.extend(board + (NO_CARD,) * (BOARD_WIDTH - len(board)))
+
+            amounts = _seat_map(row["winnings"])
+            winnings.extend(amounts.get(seat, 0) for seat in range(1, num_players + 1))
+
+            hand_ids.append(row["hand_id"].encode())
+            actions.append(encode_actions(row["actions"]))
+
+        encoded = {name: column.tobytes() for name, column in columns.items()}
+        encoded.update(
+            hand_id=_pack_strings(hand_ids),
+            player_cards=bytes(player_cards),
+            board_cards=bytes(board_cards),
+            actions=_pack_strings(actions),
+            winnings=winnings.tobytes(),
+        )
+        return encoded
+
+    def _flush(self) -> None:
+        rows, self._pending = self._pending, []
+        if not rows:
+            return
+
+        created = [_micros(row.get("created_at")) for row in rows]
+        info = BlockInfo(
+            rows=len(rows),
+            min_created_at=min(created),
+            max_created_at=max(created),
+        )
+        for name, payload in self._encode_block(rows).items():
+            compressed = zlib.compress(payload, self.level)
+            info.columns[name] = (self._file.tell(), len(compressed))
+            self._file.write(compressed)
+
+        self.blocks.append(info)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        """Flush the last block and write the index footer."""
+        if self._file.closed:
+            return
+        self._flush()
+        footer = json.dumps({
+            "version": VERSION,
+            "compression": "zlib",
+            "rows": self.rows,
+            "columns": list(COLUMNS),
+            "blocks": [asdict(block) for block in self.blocks],
+        }).encode()
+        self._file.write(footer)
+        self._file.write(TRAILER.pack(len(footer), MAGIC))
+        self._file.close()
+
+    def abort(self) -> None:
+        """Discard a partly written archive so it is never mistaken for a complete one."""
+        if self._file.closed:
+            return
+        self._file.close()
+        os.remove(self.path)
+
+
+class ArchiveReader:
+    """Memory-mapped reader that decompresses only the blocks and columns asked for."""
+
+    def __init__(self, path: str, cache_blocks: int = 64):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version = HEADER.unpack_from(self._map, 0)
+        footer_length, trailer_magic = TRAILER.unpack_from(self._map, len(self._map) - TRAILER.size)
+        if magic != MAGIC or trailer_magic != MAGIC:
+            raise ValueError(f"Not a hands archive: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported archive version {version}")
+
+        footer_start = len(self._map) - TRAILER.size - footer_length
+        footer = json.loads(self._map[footer_start:footer_start + footer_length])
+        self.blocks = [
+            BlockInfo(**{**block, "columns": {k: tuple(v) for k, v in block["columns"].items()}})
+            for block in footer["blocks"]
+        ]
+        self.columns = tuple(footer["columns"])
+
+        # Row index where each block starts, for random access.
+        self._starts = []
+        total = 0
+        for block in self.blocks:
+            self._starts.append(total)
+            total += block.rows
+        self.rows = total
+
+        self.read_column = lru_cache(maxsize=cache_blocks)(self._read_column)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.read_column.cache_clear()
+        self._map.close()
+        self._file.close()
+
+    def _raw(self, block_index: int, name: str) -> bytes:
+        offset, length = self.blocks[block_index].columns[name]
+        return zlib.decompress(self._map[offset:offset + length])
+
+    def _read_column(self, block_index: int, name: str) -> Sequence:
+        """Decode one column of one block; integer columns come back as arrays."""
+        if name not in self.columns:
+            raise KeyError(f"Unknown column: {name}")
+        data = self._raw(block_index, name)
+
+        if name in INT_COLUMNS:
+            values = array(INT_COLUMNS[name])
+            values.frombytes(data)
+            return values
+        if name == "hand_id":
+            return [value.decode() for value in _unpack_strings(data)]
+        if name == "actions":
+            return [decode_actions(value) for value in _unpack_strings(data)]
+        if name == "board_cards":
+            return [
+                tuple(code for code in data[i:i + BOARD_WIDTH] if code != NO_CARD)
+                for i in range(0, len(data), BOARD_WIDTH)
+            ]
+
+        # Per-seat columns are split using the block's num_players column.
+        if name == "winnings":
+            flat = array("i")
+            flat.frombytes(data)
+            width = 1
+        else:
+            flat = data
+            width = 2
+        values, pos = [], 0
+        for num_players in self.read_column(block_index, "num_players"):
+            end = pos + num_players * width
+            if width == 1:
+                values.append(tuple(flat[pos:end]))
+            else:
+                values.append(tuple(
+                    None if flat[i] == NO_CARD else (flat[i], flat[i + 1]) for i in range(pos, end, 2)
+                ))
+            pos = end
+        return values
+
+    def blocks_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[int]:
+        """Indexes of blocks that may hold hands created in [start, end)."""
+        low = _micros(start) if start else None
+        high = _micros(end) if end else None
+        return [
+            i for i, block in enumerate(self.blocks)
+            if (low is None or block.max_created_at >= low) and (high is None or block.min_created_at < high)
+        ]
+
+    def scan(self, name: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator:
+        """Yield one column's values for every hand created in [start, end)."""
+        low = _micros(start) if start else None
+        high = _micros(end) if end else None
+
+        for block_index in self.blocks_between(start, end):
+            block = self.blocks[block_index]
+            values = self.read_column(block_index, name)
+            if (low is None or block.min_created_at >= low) and (high is None or block.max_created_at < high):
+                yield from values
+                continue
+            created = self.read_column(block_index, "created_at")
+            for value, micros in zip(values, created):
+                if (low is None or micros >= low) and (high is None or micros < high):
+                    yield value
+
+    def row(self, index: int) -> Dict:
+        """Random access to one hand, shaped like a hands table row."""
+        if not 0 <= index < self.rows:
+            raise IndexError(index)
+        block_index = bisect_right(self._starts, index) - 1
+        offset = index - self._starts[block_index]
+
+        def value(name: str):
+            return self.read_column(block_index, name)[offset]
+
+        seats = range(1, value("num_players") + 1)
+        return {
+            "id": value("id"),
+            "hand_id": value("hand_id"),
+            "stack_size": value("stack_size"),
+            "num_players": value("num_players"),
+            "dealer_position": value("dealer_position"),
+            "small_blind_position": value("small_blind_position"),
+            "big_blind_position": value("big_blind_position"),
+            "player_cards": {
+                str(seat): format_cards(cards) for seat, cards in zip(seats, value("player_cards")) if cards
+            },
+            "actions": value("actions"),
+            "board_cards": format_cards(value("board_cards")) or None,
+            "winnings": {str(seat): amount for seat, amount in zip(seats, value("winnings"))},
+            "created_at": _datetime(value("created_at")),
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(self.rows):
+            yield self.row(index)
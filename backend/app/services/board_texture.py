@@ -0,0 +1,116 @@
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple, Optional, Sequence, Tuple
+from app.core.cards import parse_board, parse_hole_cards
+from app.core.config import settings
+from app.services.equity import FLUSH, QUADS, STRAIGHT, STRAIGHT_FLUSH, TRIPS, evaluate
+
+UNPAIRED, PAIRED, TWO_PAIR, BOARD_TRIPS, BOARD_FULL_HOUSE, BOARD_QUADS = range(6)
+
+# Rank masks of every five-rank straight window, the wheel included.
+STRAIGHT_WINDOWS: Tuple[int, ...] = tuple(0b11111 << low for low in range(9)) + (0b1000000001111,)
+
+
+class BoardTexture(NamedTuple):
+    """Features of a flop, turn or river that do not depend on hole cards."""
+
+    pairing: int
+    max_suit: int
+    flush_draw: bool
+    straight_possible: bool
+    straight_draw: bool
+    nut_category: int
+
+
+def _pairing(rank_counts: Sequence[int]) -> int:
+    top = sorted(rank_counts, reverse=True) + [0]
+    if top[0] == 4:
+        return BOARD_QUADS
+    if top[0] == 3:
+        return BOARD_FULL_HOUSE if top[1] >= 2 else BOARD_TRIPS
+    if top[0] == 2:
+        return TWO_PAIR if top[1] == 2 else PAIRED
+    return UNPAIRED
+
+
+def _window_count(rank_mask: int) -> int:
+    """Most board ranks inside any one straight window."""
+    return max((rank_mask & window).bit_count() for window in STRAIGHT_WINDOWS)
+
+
+@lru_cache(maxsize=settings.board_texture_cache_size)
+def _texture(board: Tuple[int, ...]) -> BoardTexture:
+    ranks = Counter(card >> 2 for card in board)
+    suits = Counter(card & 3 for card in board)
+    rank_mask = sum(1 << rank for rank in ranks)
+    max_suit = max(suits.values())
+    to_come = len(board) < 5
+    in_window = _window_count(rank_mask)
+
+    # Two hole cards complete whatever the board leaves open.
+    suited_window = max(
+        _window_count(sum(1 << (card >> 2) for card in board if card & 3 == suit))
+        for suit in suits
+    )
+    if suited_window >= 3:
+        nut_category = STRAIGHT_FLUSH
+    elif max(ranks.values()) >= 2:
+        nut_category = QUADS
+    elif max_suit >= 3:
+        nut_category = FLUSH
+    elif in_window >= 3:
+        nut_category = STRAIGHT
+    else:
+        nut_category = TRIPS
+
+    return BoardTexture(
+        pairing=_pairing(list(ranks.values())),
+        max_suit=max_suit,
+        flush_draw=to_come and max_suit >= 2,
+        straight_possible=in_window >= 3,
+        straight_draw=to_come and in_window >= 2,
+        nut_category=nut_category,
+    )
+
+
+def board_texture(board_cards: Optional[str]) -> Optional[BoardTexture]:
+    """Texture of a 3-5 card board, computed once per distinct board; None before the flop."""
+    board = parse_board(board_cards)
+    if not board:
+        return None
+    return _texture(tuple(sorted(board)))
+
+
+def category(score: int) -> int:
+    """Hand category (HIGH_CARD .. STRAIGHT_FLUSH) of an evaluate() score."""
+    return score >> 20
+
+
+def outs(hole_cards: str, board_cards: str) -> Tuple[int, ...]:
+    """Unseen cards that improve the hand category of hole cards on a flop or turn."""
+    hole = parse_hole_cards(hole_cards)
+    board = parse_board(board_cards)
+    if len(board) not in (3, 4):
+        raise ValueError("Outs need a flop or a turn")
+    if set(hole) & set(board):
+        raise ValueError("Hole cards overlap the board")
+
+    # An out must improve the hand beyond what the new card does for the board alone.
+    cards = hole + board
+    current = category(evaluate(cards))
+    return tuple(
+        card for card in range(52)
+        if card not in cards
+        and category(evaluate(cards + (card,))) > max(current, category(evaluate(board + (card,))))
+    )
+
+
+def texture_columns(board_cards: Optional[str]) -> Tuple:
+    """Values for the hands.board_* columns, in BoardTexture field order."""
+    texture = board_texture(board_cards)
+    return tuple(texture) if texture else (None,) * len(BoardTexture._fields)
+
+
+def cache_info():
+    """Expose hit/miss statistics of the board texture cache."""
+    return _texture.cache_info()
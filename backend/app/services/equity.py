@@ -0,0 +1,385 @@
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations, permutations
+from math import comb
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+import random
+from app.core.cards import RANKS, SUITS, parse_card, parse_cards
+from app.core.config import settings
+from app.core.executor import check_deadline
+
+Combo = Tuple[int, int]
+SuitMap = Tuple[int, int, int, int]
+
+# Every relabelling of the four suits.
+SUIT_PERMUTATIONS: List[SuitMap] = list(permutations(range(4)))
+
+# Straight bit patterns from ace-high down to the wheel, with their top rank.
+STRAIGHTS: List[Tuple[int, int]] = (
+    [(0b11111 << low, low + 4) for low in range(8, -1, -1)]
+    + [(0b1000000001111, 3)]
+)
+
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+
+# One hand evaluation costs about as much as this many matchup comparisons.
+EVALUATION_COST = 50
+
+
+def _score(category: int, kickers: Sequence[int]) -> int:
+    score = category
+    for i in range(5):
+        score = (score << 4) | (kickers[i] if i < len(kickers) else 0)
+    return score
+
+
+def _straight_high(mask: int) -> int:
+    for pattern, high in STRAIGHTS:
+        if mask & pattern == pattern:
+            return high
+    return -1
+
+
+def _top_ranks(mask: int, count: int) -> List[int]:
+    ranks = []
+    for rank in range(12, -1, -1):
+        if mask >> rank & 1:
+            ranks.append(rank)
+            if len(ranks) == count:
+                break
+    return ranks
+
+
+def evaluate(cards: Sequence[int]) -> int:
+    """Score the best five-card hand out of 5-7 cards; higher is better."""
+    rank_counts = [0] * 13
+    suit_masks = [0, 0, 0, 0]
+    rank_mask = 0
+
+    for card in cards:
+        rank = card >> 2
+        rank_counts[rank] += 1
+        suit_masks[card & 3] |= 1 << rank
+        rank_mask |= 1 << rank
+
+    for mask in suit_masks:
+        if mask.bit_count() >= 5:
+            high = _straight_high(mask)
+            if high >= 0:
+                return _score(STRAIGHT_FLUSH, [high])
+            flush = _score(FLUSH, _top_ranks(mask, 5))
+            break
+    else:
+        flush = None
+
+    quads = trips = -1
+    pairs = []
+    for rank in range(12, -1, -1):
+        count = rank_counts[rank]
+        if count == 4:
+            quads = rank
+        elif count == 3:
+            if trips < 0:
+                trips = rank
+            else:
+                pairs.append(rank)
+        elif count == 2:
+            pairs.append(rank)
+
+    if quads >= 0:
+        return _score(QUADS, [quads] + _top_ranks(rank_mask & ~(1 << quads), 1))
+    if trips >= 0 and pairs:
+        return _score(FULL_HOUSE, [trips, pairs[0]])
+    if flush is not None:
+        return flush
+
+    high = _straight_high(rank_mask)
+    if high >= 0:
+        return _score(STRAIGHT, [high])
+    if trips >= 0:
+        return _score(TRIPS, [trips] + _top_ranks(rank_mask & ~(1 << trips), 2))
+    if len(pairs) >= 2:
+        rest = rank_mask & ~(1 << pairs[0]) & ~(1 << pairs[1])
+        return _score(TWO_PAIR, pairs[:2] + _top_ranks(rest, 1))
+    if pairs:
+        return _score(PAIR, [pairs[0]] + _top_ranks(rank_mask & ~(1 << pairs[0]), 3))
+    return _score(HIGH_CARD, _top_ranks(rank_mask, 5))
+
+
+def _pair_combos(rank: int) -> List[Combo]:
+    return [(rank * 4 + a, rank * 4 + b) for a, b in combinations(range(4), 2)]
+
+
+def _unpaired_combos(high: int, low: int, suitedness: str) -> List[Combo]:
+    combos = []
+    for a in range(4):
+        for b in range(4):
+            if suitedness == "s" and a != b:
+                continue
+            if suitedness == "o" and a == b:
+                continue
+            combos.append((high * 4 + a, low * 4 + b))
+    return combos
+
+
+def _parse_range_token(token: str) -> List[Combo]:
+    if "-" in token:
+        start, end = token.split("-", 1)
+        if len(start) not in (2, 3) or len(end) not in (2, 3):
+            raise ValueError(f"Invalid range token: {token!r}")
+        _parse_hand_class(start)
+        _parse_hand_class(end)
+        first, second = RANKS.index(start[0]), RANKS.index(start[1])
+        end_first, end_second = RANKS.index(end[0]), RANKS.index(end[1])
+
+        if first == second and end_first == end_second:
+            low, high = sorted((first, end_first))
+            return [c for rank in range(low, high + 1) for c in _pair_combos(rank)]
+        if first == end_first and start[2:] == end[2:] and first != second and end_first != end_second:
+            low, high = sorted((second, end_second))
+            return [c for kicker in range(low, high + 1)
+                    for c in _unpaired_combos(first, kicker, start[2:])]
+        raise ValueError(f"Invalid range token: {token!r}")
+
+    if token.endswith("+"):
+        base = token[:-1]
+        if len(base) not in (2, 3):
+            raise ValueError(f"Invalid range token: {token!r}")
+        _parse_hand_class(base)
+        first, second = RANKS.index(base[0]), RANKS.index(base[1])
+        if first == second:
+            return [c for rank in range(first, 13) for c in _pair_combos(rank)]
+        return [c for kicker in range(second, first)
+                for c in _unpaired_combos(first, kicker, base[2:])]
+
+    return _parse_hand_class(token)
+
+
+def _parse_hand_class(token: str) -> List[Combo]:
+    if len(token) == 4 and token[1] in SUITS:
+        first, second = parse_card(token[:2]), parse_card(token[2:])
+        if first == second:
+            raise ValueError(f"Invalid combo: {token!r}")
+        return [(max(first, second), min(first, second))]
+
+    if len(token) not in (2, 3) or token[0] not in RANKS or token[1] not in RANKS:
+        raise ValueError(f"Invalid range token: {token!r}")
+    first, second = RANKS.index(token[0]), RANKS.index(token[1])
+    suitedness = token[2:]
+    if suitedness not in ("", "s", "o"):
+        raise ValueError(f"Invalid range token: {token!r}")
+
+    if first == second:
+        if suitedness:
+            raise ValueError(f"Pairs cannot be suited or offsuit: {token!r}")
+        return _pair_combos(first)
+    if first < second:
+        raise ValueError(f"Higher rank must come first: {token!r}")
+    return _unpaired_combos(first, second, suitedness)
+
+
+def parse_range(range_str: str) -> FrozenSet[Combo]:
+    """Expand range notation such as 'QQ+,AKs,KTo-K8o,AsKd' into card combos."""
+    combos = set()
+    for token in range_str.replace(" ", "").split(","):
+        if token:
+            for first, second in _parse_range_token(token):
+                combos.add((max(first, second), min(first, second)))
+    if not combos:
+        raise ValueError(f"Empty range: {range_str!r}")
+    return frozenset(combos)
+
+
+def _map_card(card: int, suit_map: SuitMap) -> int:
+    return (card & ~3) | suit_map[card & 3]
+
+
+def _map_combos(combos, suit_map: SuitMap) -> Tuple[Combo, ...]:
+    mapped = []
+    for first, second in combos:
+        first, second = _map_card(first, suit_map), _map_card(second, suit_map)
+        mapped.append((max(first, second), min(first, second)))
+    return tuple(sorted(mapped))
+
+
+def canonicalize(
+        board: Sequence[int],
+        range_a: FrozenSet[Combo],
+        range_b: FrozenSet[Combo]
+) -> Tuple[Tuple[int, ...], Tuple[Combo, ...], Tuple[Combo, ...]]:
+    """Pick the suit relabelling that gives the smallest board/range key."""
+    return min(
+        (
+            tuple(sorted(_map_card(card, suit_map) for card in board)),
+            _map_combos(range_a, suit_map),
+            _map_combos(range_b, suit_map),
+        )
+        for suit_map in SUIT_PERMUTATIONS
+    )
+
+
+def _stabilizer(board: Tuple[int, ...], range_a, range_b) -> List[SuitMap]:
+    """Suit relabellings that leave the board and both ranges unchanged."""
+    board_set, set_a, set_b = set(board), set(range_a), set(range_b)
+    return [
+        suit_map for suit_map in SUIT_PERMUTATIONS
+        if {_map_card(card, suit_map) for card in board} == board_set
+        and set(_map_combos(range_a, suit_map)) == set_a
+        and set(_map_combos(range_b, suit_map)) == set_b
+    ]
+
+
+def _runout_count(board: Tuple[int, ...]) -> int:
+    """Runouts _runouts() yields at most for a board."""
+    total = comb(52 - len(board), 5 - len(board))
+    return settings.equity_samples if total > settings.equity_max_enumeration else total
+
+
+def _runouts(board: Tuple[int, ...], dead_mask: int, symmetries: List[SuitMap]):
+    """Yield (runout, weight) pairs, one per suit-isomorphism class."""
+    deck = [card for card in range(52) if not dead_mask >> card & 1]
+    missing = 5 - len(board)
+
+    if comb(len(deck), missing) > settings.equity_max_enumeration:
+        rng = random.Random(settings.equity_seed)
+        for _ in range(settings.equity_samples):
+            yield tuple(rng.sample(deck, missing)), 1
+        return
+
+    if len(symmetries) <= 1:
+        for runout in combinations(deck, missing):
+            yield runout, 1
+        return
+
+    classes = Counter(
+        min(tuple(sorted(_map_card(card, suit_map) for card in runout)) for suit_map in symmetries)
+        for runout in combinations(deck, missing)
+    )
+    yield from classes.items()
+
+
+def _mask(cards: Sequence[int]) -> int:
+    mask = 0
+    for card in cards:
+        mask |= 1 << card
+    return mask
+
+
+def _enumerated_matchups(board, combos_a, combos_b, board_mask: int) -> Tuple[int, int, int]:
+    """Score every matchup on every runout (or on sampled runouts for early streets)."""
+    symmetries = _stabilizer(board, [combo for combo, _ in combos_a], [combo for combo, _ in combos_b])
+
+    wins_a = wins_b = ties = 0
+    for runout, weight in _runouts(board, board_mask, symmetries):
+        check_deadline()
+        full_board = board + runout
+        runout_mask = _mask(runout)
+
+        values_b = [
+            (evaluate(full_board + combo), mask)
+            for combo, mask in combos_b if not mask & runout_mask
+        ]
+        for combo, mask_a in combos_a:
+            if mask_a & runout_mask:
+                continue
+            value_a = evaluate(full_board + combo)
+            for value_b, mask_b in values_b:
+                if mask_a & mask_b:
+                    continue
+                if value_a > value_b:
+                    wins_a += weight
+                elif value_b > value_a:
+                    wins_b += weight
+                else:
+                    ties += weight
+
+    return wins_a, wins_b, ties
+
+
+def _sampled_matchups(board, combos_a, combos_b, board_mask: int) -> Tuple[int, int, int]:
+    """Score random (combo, combo, runout) triples; conflicting combo pairs are redrawn."""
+    if not any(not mask_a & mask_b for _, mask_a in combos_a for _, mask_b in combos_b):
+        return 0, 0, 0
+
+    rng = random.Random(settings.equity_seed)
+    missing = 5 - len(board)
+    deck = [card for card in range(52) if not board_mask >> card & 1]
+    # Both combos remove at most four cards, so this many draws always leave enough live ones.
+    draws = missing + 4
+
+    wins_a = wins_b = ties = 0
+    sample = attempts = 0
+    while sample < settings.equity_samples:
+        attempts += 1
+        if attempts % 1000 == 0:
+            check_deadline()
+        combo_a, mask_a = rng.choice(combos_a)
+        combo_b, mask_b = rng.choice(combos_b)
+        if mask_a & mask_b:
+            continue
+        sample += 1
+
+        dead_mask = mask_a | mask_b
+        runout = tuple([card for card in rng.sample(deck, draws) if not dead_mask >> card & 1][:missing])
+
+        value_a = evaluate(board + runout + combo_a)
+        value_b = evaluate(board + runout + combo_b)
+        if value_a > value_b:
+            wins_a += 1
+        elif value_b > value_a:
+            wins_b += 1
+        else:
+            ties += 1
+
+    return wins_a, wins_b, ties
+
+
+@lru_cache(maxsize=settings.equity_cache_size)
+def _canonical_equity(
+        board: Tuple[int, ...],
+        range_a: Tuple[Combo, ...],
+        range_b: Tuple[Combo, ...]
+) -> Tuple[float, float, float, int]:
+    board_mask = _mask(board)
+    combos_a = [(combo, _mask(combo)) for combo in range_a if not _mask(combo) & board_mask]
+    combos_b = [(combo, _mask(combo)) for combo in range_b if not _mask(combo) & board_mask]
+    if not combos_a or not combos_b:
+        raise ValueError("Every combo in a range conflicts with the board")
+
+    # Matchups times runouts, with each hand evaluation weighted by its cost.
+    work = _runout_count(board) * (
+        len(combos_a) * len(combos_b) + EVALUATION_COST * (len(combos_a) + len(combos_b))
+    )
+    if work > settings.equity_max_work:
+        wins_a, wins_b, ties = _sampled_matchups(board, combos_a, combos_b, board_mask)
+    else:
+        wins_a, wins_b, ties = _enumerated_matchups(board, combos_a, combos_b, board_mask)
+
+    total = wins_a + wins_b + ties
+    if total == 0:
+        raise ValueError("Ranges have no non-conflicting matchups")
+    return wins_a / total, wins_b / total, ties / total, total
+
+
+def range_vs_range_equity(range_a: str, range_b: str, board_cards: Optional[str] = None) -> Dict[str, float]:
+    """Equity of two ranges on a board; ties count half for each side."""
+    board = parse_cards(board_cards)
+    if len(board) > 5 or len(board) in (1, 2) or len(set(board)) != len(board):
+        raise ValueError(f"Invalid board: {board_cards!r}")
+
+    key = canonicalize(board, parse_range(range_a), parse_range(range_b))
+    win_a, win_b, tie, total = _canonical_equity(*key)
+
+    return {
+        "range_a_equity": win_a + tie / 2,
+        "range_b_equity": win_b + tie / 2,
+        "range_a_win": win_a,
+        "range_b_win": win_b,
+        "tie": tie,
+        "matchups": total,
+    }
+
+
+def cache_info():
+    """Expose hit/miss statistics of the canonical result cache."""
+    return _canonical_equity.cache_info()
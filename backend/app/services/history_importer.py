@@ -0,0 +1,219 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterator, List, Optional, Tuple
+import json
+import logging
+import mmap
+import os
+import re
+from app.models.hand import Hand
+from app.schemas.hand import HandCreate, MIN_PLAYERS
+from app.services.poker_service import poker_service
+from app.services.settlement import settle_hand
+
+logger = logging.getLogger(__name__)
+
+HAND_HEADER = b"Hand #"
+
+SETUP_PATTERN = re.compile(
+    r"Stack (\d+); Dealer: Player (\d+); Player (\d+) Small blind; Player (\d+) Big blind"
+)
+PLAYER_CARDS_PATTERN = re.compile(r"Player (\d+): ([^;\s]+)")
+
+
+@dataclass
+class ImportProgress:
+    """Progress of an import, also used as the resume checkpoint."""
+
+    path: str
+    offset: int = 0
+    total_bytes: int = 0
+    parsed: int = 0
+    imported: int = 0
+    skipped: int = 0
+
+
+def parse_hand_block(lines: List[str]) -> HandCreate:
+    """Convert the lines written by Hand.format_for_export (or format_for_history) into a HandCreate."""
+    fields = {}
+    for line in lines:
+        if line.startswith("Hand #"):
+            fields["Hand"] = line[len("Hand #"):]
+        else:
+            key, _, value = line.partition(":")
+            fields[key] = value.strip()
+
+    if "Hand" not in fields or "Hands" not in fields or "Actions" not in fields:
+        raise ValueError("Incomplete hand block")
+
+    setup_line = next((line for line in lines if line.startswith("Stack ")), "")
+    setup = SETUP_PATTERN.match(setup_line)
+    if not setup:
+        raise ValueError(f"Invalid setup line: {setup_line!r}")
+
+    actions, board_cards = poker_service.convert_short_format_to_actions(fields["Actions"])
+    player_cards = dict(PLAYER_CARDS_PATTERN.findall(fields["Hands"]))
+
+    if "Seats" in fields:
+        num_players = int(fields["Seats"])
+    else:
+        # History display lines lack the table size; the highest seat referenced is the best lower bound.
+        seats = [int(seat) for seat in player_cards]
+        seats += [int(setup.group(i)) for i in (2, 3, 4)]
+        seats += [action["player"] for action in actions if "player" in action]
+        num_players = max(seats + [MIN_PLAYERS])
+
+    return HandCreate(
+        hand_id=fields["Hand"],
+        stack_size=int(setup.group(1)),
+        num_players=num_players,
+        dealer_position=int(setup.group(2)),
+        small_blind_position=int(setup.group(3)),
+        big_blind_position=int(setup.group(4)),
+        player_cards=player_cards,
+        actions=actions,
+        board_cards=board_cards
+    )
+
+
+def iter_hand_blocks(source, start: int = 0) -> Iterator[Tuple[List[str], int]]:
+    """Yield (lines, end_offset) for every hand, reading one line at a time.
+
+    ``source`` is a binary file or an mmap; ``end_offset`` is where the next
+    hand starts, so it is safe to resume from.
+    """
+    source.seek(start)
+    block: List[str] = []
+
+    while True:
+        line_start = source.tell()
+        raw = source.readline()
+        if not raw:
+            break
+        if raw.startswith(HAND_HEADER) and block:
+            yield block, line_start
+            block = []
+        line = raw.decode("utf-8").strip()
+        if line:
+            block.append(line)
+
+    if block:
+        yield block, source.tell()
+
+
+def _init_worker() -> None:
+    # Per-action INFO logging dominates settlement time at import volume.
+    logging.getLogger("app.services.poker_service").setLevel(logging.WARNING)
+
+
+def _settle(hand_data: HandCreate) -> Optional[Hand]:
+    try:
+        return settle_hand(hand_data)
+    except Exception as e:
+        logger.warning(f"Could not settle hand {hand_data.hand_id}: {e}")
+        return None
+
+
+class HistoryImporter:
+    """Streams hand-history text files into the hands table."""
+
+    def __init__(
+            self,
+            loader: Optional[Callable[[List[Hand]], int]] = None,
+            batch_size: int = 1000,
+            workers: Optional[int] = None,
+            use_mmap: bool = False,
+            on_progress: Optional[Callable[[ImportProgress], None]] = None
+    ):
+        if loader is None:
+            from app.repositories.hand_repository import hand_repository
+            loader = hand_repository.bulk_create
+
+        self.loader = loader
+        self.batch_size = batch_size
+        self.workers = workers
+        self.use_mmap = use_mmap
+        self.on_progress = on_progress
+
+    def load_checkpoint(self, path: str, checkpoint_path: Optional[str]) -> ImportProgress:
+        """Read the checkpoint for ``path``, or start from the beginning."""
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                progress = ImportProgress(**json.load(f))
+            if progress.path == os.path.abspath(path):
+                return progress
+        return ImportProgress(path=os.path.abspath(path))
+
+    def save_checkpoint(self, progress: ImportProgress, checkpoint_path: Optional[str]) -> None:
+        """Atomically persist progress so a failed run can resume."""
+        if not checkpoint_path:
+            return
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(progress), f)
+        os.replace(tmp_path, checkpoint_path)
+
+    def run(self, path: str, checkpoint_path: Optional[str] = None) -> ImportProgress:
+        """Import every hand in ``path``, resuming from the checkpoint if any."""
+        progress = self.load_checkpoint(path, checkpoint_path)
+        progress.total_bytes = os.path.getsize(path)
+
+        if self.workers == 0:
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+        try:
+            with open(path, "rb") as f:
+                if self.use_mmap and progress.total_bytes:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                        self._import(source, progress, executor, checkpoint_path)
+                else:
+                    self._import(f, progress, executor, checkpoint_path)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return progress
+
+    def _import(self, source, progress: ImportProgress, executor, checkpoint_path: Optional[str]) -> None:
+        batch: List[HandCreate] = []
+
+        for lines, end_offset in iter_hand_blocks(source, progress.offset):
+            progress.parsed += 1
+            try:
+                batch.append(parse_hand_block(lines))
+            except ValueError as e:
+                progress.skipped += 1
+                logger.warning(f"Skipping malformed hand at offset {end_offset}: {e}")
+
+            if len(batch) >= self.batch_size:
+                self._flush(batch, end_offset, progress, executor, checkpoint_path)
+                batch = []
+
+        self._flush(batch, progress.total_bytes, progress, executor, checkpoint_path)
+
+    def _flush(
+            self,
+            batch: List[HandCreate],
+            end_offset: int,
+            progress: ImportProgress,
+            executor,
+            checkpoint_path: Optional[str]
+    ) -> None:
+        if executor is None:
+            settled = [_settle(hand_data) for hand_data in batch]
+        else:
+            chunksize = max(1, len(batch) // (4 * (self.workers or os.cpu_count() or 1)))
+            settled = list(executor.map(_settle, batch, chunksize=chunksize))
+
+        hands = [hand for hand in settled if hand is not None]
+        inserted = self.loader(hands) if hands else 0
+
+        progress.imported += inserted
+        progress.skipped += len(batch) - inserted
+        progress.offset = end_offset
+        self.save_checkpoint(progress, checkpoint_path)
+
+        if self.on_progress:
+            self.on_progress(progress)
@@ -0,0 +1,98 @@
+from functools import lru_cache
+from math import comb
+from typing import Dict, List, Sequence, Tuple
+import heapq
+import random
+from app.core.config import settings
+from app.core.executor import check_deadline
+
+
+def _validate(stacks: Sequence[int], payouts: Sequence[float]) -> None:
+    if len(stacks) < 2:
+        raise ValueError("ICM needs at least two players")
+    if any(stack <= 0 for stack in stacks):
+        raise ValueError("Every stack must be positive")
+    if not payouts or any(payout < 0 for payout in payouts):
+        raise ValueError("Payouts must be a non-empty list of non-negative amounts")
+
+
+def subset_states(players: int, places: int) -> int:
+    """Finishing-position subsets the exact recursion visits."""
+    return sum(comb(players, k) for k in range(min(places, players)))
+
+
+def _exact_equity(stacks: Tuple[int, ...], payouts: Tuple[float, ...]) -> List[float]:
+    """Malmuth-Harville ICM, memoized over the set of players already placed."""
+    total = sum(stacks)
+    places = min(len(payouts), len(stacks))
+    equity = [0.0] * len(stacks)
+
+    # placed-players mask -> (probability those players took the top places, their chips)
+    layer: Dict[int, Tuple[float, int]] = {0: (1.0, 0)}
+    for place in range(places):
+        payout = payouts[place]
+        next_layer: Dict[int, Tuple[float, int]] = {}
+        for mask, (probability, placed_chips) in layer.items():
+            check_deadline()
+            remaining = total - placed_chips
+            for player, stack in enumerate(stacks):
+                if mask >> player & 1:
+                    continue
+                p = probability * stack / remaining
+                equity[player] += p * payout
+                if place + 1 < places:
+                    key = mask | 1 << player
+                    previous = next_layer.get(key)
+                    next_layer[key] = (p + previous[0] if previous else p, placed_chips + stack)
+        layer = next_layer
+
+    return equity
+
+
+def _monte_carlo_equity(stacks: Tuple[int, ...], payouts: Tuple[float, ...]) -> List[float]:
+    """Sample finishing orders; exponential races with rate = stack follow Harville exactly."""
+    rng = random.Random(settings.icm_seed)
+    places = min(len(payouts), len(stacks))
+    equity = [0.0] * len(stacks)
+    players = range(len(stacks))
+
+    for sample in range(settings.icm_samples):
+        if sample % 1000 == 0:
+            check_deadline()
+        times = [rng.expovariate(stack) for stack in stacks]
+        for place, player in enumerate(heapq.nsmallest(places, players, key=times.__getitem__)):
+            equity[player] += payouts[place]
+
+    return [value / settings.icm_samples for value in equity]
+
+
+@lru_cache(maxsize=settings.icm_cache_size)
+def _canonical_equity(stacks: Tuple[int, ...], payouts: Tuple[float, ...]) -> Tuple[Tuple[float, ...], str]:
+    if subset_states(len(stacks), len(payouts)) <= settings.icm_max_states:
+        return tuple(_exact_equity(stacks, payouts)), "exact"
+    return tuple(_monte_carlo_equity(stacks, payouts)), "monte_carlo"
+
+
+def icm_equity(stacks: Sequence[int], payouts: Sequence[float]) -> Dict:
+    """Prize equity of every stack under ICM, in the order the stacks were given."""
+    _validate(stacks, payouts)
+
+    # Order-independent cache key: results are computed for sorted stacks and mapped back.
+    order = sorted(range(len(stacks)), key=lambda i: stacks[i], reverse=True)
+    values, method = _canonical_equity(tuple(stacks[i] for i in order), tuple(payouts))
+
+    equities = [0.0] * len(stacks)
+    for position, player in enumerate(order):
+        equities[player] = values[position]
+
+    return {
+        "equities": equities,
+        "method": method,
+        "samples": settings.icm_samples if method == "monte_carlo" else 0,
+        "prize_pool": float(sum(payouts[:len(stacks)])),
+    }
+
+
+def cache_info():
+    """Expose hit/miss statistics of the canonical result cache."""
+    return _canonical_equity.cache_info()
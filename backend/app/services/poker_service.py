@@ -1,77 +1,129 @@
 from typing import Dict, List, Optional, Tuple
+from app.core.cards import parse_board, parse_hole_cards
 from app.core.config import settings
+from app.services.equity import evaluate, range_vs_range_equity
+from app.services.icm import icm_equity
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-try:
-    from pokerkit import Automation, NoLimitTexasHoldem, Mode
+# Resolved lazily by load_pokerkit(); None until the first call.
+POKERKIT_AVAILABLE: Optional[bool] = None
+_pokerkit = None
 
-    POKERKIT_AVAILABLE = True
-    logger.info("PokerKit successfully imported")
-except ImportError as e:
-    POKERKIT_AVAILABLE = False
-    logger.warning(f"PokerKit not available: {e}. Using simple calculation only.")
+
+def load_pokerkit():
+    """Import pokerkit on first use; returns the module or None if unavailable."""
+    global _pokerkit, POKERKIT_AVAILABLE
+
+    if POKERKIT_AVAILABLE is None:
+        try:
+            import pokerkit
+
+            _pokerkit = pokerkit
+            POKERKIT_AVAILABLE = True
+            logger.info("PokerKit successfully imported")
+        except ImportError as e:
+            POKERKIT_AVAILABLE = False
+            logger.warning(f"PokerKit not available: {e}. Using simple calculation only.")
+
+    return _pokerkit
 
 
 class PokerService:
     """Service for poker game logic and calculations."""
 
-    def __init__(self):
-        if POKERKIT_AVAILABLE:
-            self.automations = (
-                Automation.ANTE_POSTING,
-                Automation.BET_COLLECTION,
-                Automation.BLIND_OR_STRADDLE_POSTING,
-                Automation.HOLE_CARDS_SHOWING_OR_MUCKING,
-                Automation.HAND_KILLING,
-                Automation.CHIPS_PUSHING,
-                Automation.CHIPS_PULLING,
-            )
+    @property
+    def automations(self) -> Tuple:
+        """PokerKit automations for state-based evaluation (imports pokerkit)."""
+        pokerkit = load_pokerkit()
+        if pokerkit is None:
+            return ()
+
+        Automation = pokerkit.Automation
+        return (
+            Automation.ANTE_POSTING,
+            Automation.BET_COLLECTION,
+            Automation.BLIND_OR_STRADDLE_POSTING,
+            Automation.HOLE_CARDS_SHOWING_OR_MUCKING,
+            Automation.HAND_KILLING,
+            Automation.CHIPS_PUSHING,
+            Automation.CHIPS_PULLING,
+        )
 
     def calculate_winnings(
             self,
             stack_size: int,
             player_cards: Dict[str, str],
             actions: List[Dict],
-            board_cards: str = None
+            board_cards: str = None,
+            num_players: int = settings.num_players,
+            small_blind_position: int = 4,
+            big_blind_position: int = 5
     ) -> Dict[int, int]:
         """Calculate winnings with proper player tracking."""
 
         logger.info("=== STARTING CALCULATE_WINNINGS ===")
         logger.info(f"Stack size: {stack_size}")
+        logger.info(f"Table size: {num_players}")
         logger.info(f"Player cards: {player_cards}")
         logger.info(f"Actions count: {len(actions)}")
         logger.info(f"Board cards: {board_cards}")
 
-        result = self._simple_calculation_fixed(stack_size, player_cards, actions, board_cards)
+        result = self._simple_calculation_fixed(
+            stack_size, player_cards, actions, board_cards,
+            num_players, small_blind_position, big_blind_position
+        )
         logger.info(f"Final calculated winnings: {result}")
         return result
 
+    def calculate_range_equity(
+            self,
+            range_a: str,
+            range_b: str,
+            board_cards: str = None
+    ) -> Dict[str, float]:
+        """Calculate the equity of one hand range against another on a board."""
+
+        logger.info(f"Range equity: {range_a} vs {range_b} on {board_cards}")
+        return range_vs_range_equity(range_a, range_b, board_cards)
+
+    def calculate_tournament_equity(self, stacks: List[int], payouts: List[float]) -> Dict:
+        """Calculate ICM prize equity for tournament stacks and payouts."""
+
+        logger.info(f"Tournament equity: {len(stacks)} stacks, {len(payouts)} paid places")
+        return icm_equity(stacks, payouts)
+
     def _simple_calculation_fixed(
             self,
             stack_size: int,
             player_cards: Dict[str, str],
             actions: List[Dict],
-            board_cards: str = None
+            board_cards: str = None,
+            num_players: int = settings.num_players,
+            small_blind_position: int = 4,
+            big_blind_position: int = 5
     ) -> Dict[int, int]:
         """Fixed calculation that properly tracks players."""
 
         logger.info("=== USING FIXED SIMPLE CALCULATION ===")
 
+        seats = range(1, num_players + 1)
         folded_players = set()
-        player_contributions = {i: 0 for i in range(1, 7)}
+        player_contributions = {i: 0 for i in seats}
 
-        player_contributions[4] = settings.small_blind
-        player_contributions[5] = settings.big_blind
+        player_contributions[small_blind_position] = settings.small_blind
+        player_contributions[big_blind_position] = settings.big_blind
 
-        logger.info(f"Initial contributions (blinds): Player 4: {settings.small_blind}, Player 5: {settings.big_blind}")
+        logger.info(
+            f"Initial contributions (blinds): Player {small_blind_position}: {settings.small_blind}, "
+            f"Player {big_blind_position}: {settings.big_blind}")
 
         current_round = 'preflop'
-        round_bets = {i: 0 for i in range(1, 7)}
-        round_bets[4] = settings.small_blind
-        round_bets[5] = settings.big_blind
+        round_bets = {i: 0 for i in seats}
+        round_bets[small_blind_position] = settings.small_blind
+        round_bets[big_blind_position] = settings.big_blind
 
         for action_data in actions:
             action_round = action_data.get("round", "preflop")
@@ -84,7 +136,7 @@ class PokerService:
             if action_round != current_round and action_round in ['flop', 'turn', 'river']:
                 logger.info(f"Round transition: {current_round} -> {action_round}")
                 current_round = action_round
-                round_bets = {i: 0 for i in range(1, 7)}
+                round_bets = {i: 0 for i in seats}
                 continue
 
             if not player_num or not action_type:
@@ -113,10 +165,16 @@ class PokerService:
                 player_contributions[player_num] += raise_to
                 logger.info(
                     f"Player {player_num} raised to {amount} (total contribution: {player_contributions[player_num]})")
+            elif action_type == "allin":
+                all_in = stack_size - player_contributions[player_num]
+                round_bets[player_num] += all_in
+                player_contributions[player_num] += all_in
+                logger.info(
+                    f"Player {player_num} went all-in for {all_in} (total contribution: {player_contributions[player_num]})")
 
         total_pot = sum(player_contributions.values())
 
-        active_players = [i for i in range(1, 7) if i not in folded_players and player_contributions[i] > 0]
+        active_players = [i for i in seats if i not in folded_players and player_contributions[i] > 0]
 
         logger.info(f"Total pot: {total_pot}")
         logger.info(f"Player contributions: {player_contributions}")
@@ -124,7 +182,7 @@ class PokerService:
         logger.info(f"Active players (made it to showdown): {active_players}")
 
         winnings = {}
-        for i in range(1, 7):
+        for i in seats:
             winnings[i] = -player_contributions[i]
 
         if len(active_players) == 0:
@@ -135,120 +193,55 @@ class PokerService:
             winnings[winner] = total_pot - player_contributions[winner]
             logger.info(f"Single winner: Player {winner} wins {total_pot - player_contributions[winner]}")
         else:
-            winner = self._determine_winner_fixed(active_players, player_cards, board_cards)
-            if winner:
+            winners = self._determine_winners(active_players, player_cards, board_cards)
+            if len(winners) == 1:
+                winner = winners[0]
                 winnings[winner] = total_pot - player_contributions[winner]
                 logger.info(
                     f"Winner by hand evaluation: Player {winner} wins {total_pot - player_contributions[winner]}")
             else:
-                share = total_pot
-                remainder = total_pot % len(active_players)
-                for i, player in enumerate(active_players):
+                winners = winners or active_players
+                share = total_pot // len(winners)
+                remainder = total_pot % len(winners)
+                for i, player in enumerate(winners):
                     player_share = share + (1 if i < remainder else 0)
                     winnings[player] = player_share - player_contributions[player]
-                logger.info(f"Split pot among {len(active_players)} active players")
+                logger.info(f"Split pot among players {winners}")
 
         logger.info(f"Final winnings calculation: {winnings}")
         return winnings
 
-    def _determine_winner_fixed(self, active_players: List[int], player_cards: Dict[str, str], board_cards: str) -> \
-    Optional[int]:
-        """Determine winner based on hand strength."""
+    def _determine_winners(self, active_players: List[int], player_cards: Dict[str, str], board_cards: str) -> \
+    List[int]:
+        """Players holding the best hand on a full board; empty if it cannot be evaluated."""
         try:
-            if not board_cards or len(board_cards) < 10:
+            board = parse_board(board_cards)
+            if len(board) < 5:
                 logger.warning("Insufficient board cards for evaluation")
-                return None
+                return []
 
             logger.info(f"Evaluating hands for players: {active_players}")
-            logger.info(f"Board cards: {board_cards}")
-
-            board = [board_cards[i:i + 2] for i in range(0, min(10, len(board_cards)), 2)]
-            logger.info(f"Board parsed: {board}")
-
-            best_player = None
-            best_hand_rank = -1
-            best_kickers = []
 
+            scores = {}
             for player in active_players:
                 player_key = str(player)
                 if player_key not in player_cards:
                     logger.warning(f"Player {player} not found in player_cards")
                     continue
 
-                hole_cards_str = player_cards[player_key]
-                if len(hole_cards_str) < 4:
-                    logger.warning(f"Invalid hole cards for Player {player}: {hole_cards_str}")
-                    continue
-
-                hole = [hole_cards_str[i:i + 2] for i in range(0, 4, 2)]
-                all_cards = hole + board
-
-                logger.info(f"Player {player}: hole={hole}, all_cards={all_cards}")
-
-                hand_rank, kickers = self._evaluate_hand_simple(all_cards)
-
-                logger.info(f"Player {player}: hand_rank={hand_rank}, kickers={kickers}")
-
-                if (hand_rank > best_hand_rank or
-                        (hand_rank == best_hand_rank and kickers > best_kickers)):
-                    best_hand_rank = hand_rank
-                    best_kickers = kickers
-                    best_player = player
+                scores[player] = evaluate(parse_hole_cards(player_cards[player_key]) + board)
+                logger.info(f"Player {player}: score={scores[player]}")
 
-            logger.info(f"Best hand: Player {best_player} with rank {best_hand_rank}")
-            return best_player
+            if not scores:
+                return []
+            best = max(scores.values())
+            winners = [player for player, score in scores.items() if score == best]
+            logger.info(f"Best hand: Players {winners}")
+            return winners
 
-        except Exception as e:
+        except ValueError as e:
             logger.error(f"Hand evaluation failed: {e}")
-            return None
-
-    def _evaluate_hand_simple(self, cards: List[str]) -> Tuple[int, List[int]]:
-        """Simple hand evaluation returning (hand_rank, kickers)."""
-        try:
-            ranks = []
-            suits = []
-
-            for card in cards:
-                if len(card) >= 2:
-                    rank = self._card_rank(card)
-                    suit = card[1]
-                    ranks.append(rank)
-                    suits.append(suit)
-
-            rank_counts = {}
-            for rank in ranks:
-                rank_counts[rank] = rank_counts.get(rank, 0) + 1
-
-            sorted_by_count = sorted(rank_counts.items(), key=lambda x: (x[1], x[0]), reverse=True)
-
-            counts = [count for rank, count in sorted_by_count]
-            kickers = [rank for rank, count in sorted_by_count]
-
-            if counts[0] == 4:
-                return (7, kickers)
-            elif counts[0] == 3 and counts[1] == 2:
-                return (6, kickers)
-            elif counts[0] == 3:
-                return (3, kickers)
-            elif counts[0] == 2 and counts[1] == 2:
-                return (2, kickers)
-            elif counts[0] == 2:
-                return (1, kickers)
-            else:
-                return (0, sorted(ranks, reverse=True)[:5])
-
-        except Exception as e:
-            logger.error(f"Hand evaluation error: {e}")
-            return (0, [0])
-
-    def _card_rank(self, card: str) -> int:
-        """Convert card rank to numeric value."""
-        if len(card) < 1:
-            return 0
-        rank = card[0]
-        rank_map = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
-                    'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
-        return rank_map.get(rank, 0)
+            return []
 
     def convert_actions_to_short_format(self, actions: List[Dict]) -> str:
         """Convert action list to short format string."""
@@ -289,5 +282,38 @@ class PokerService:
 
         return " ".join(short_actions)
 
+    def convert_short_format_to_actions(self, actions_short: str) -> Tuple[List[Dict], Optional[str]]:
+        """Convert a short format string back to an action list and board cards."""
+        actions = []
+        board_cards = ""
+        current_round = "preflop"
+        short_codes = {"f": "fold", "x": "check", "c": "call"}
+
+        for token in actions_short.split():
+            prefix, _, value = token.partition(":")
+
+            if prefix in ("flop", "turn", "river"):
+                current_round = prefix
+                board_cards += value
+                actions.append({"round": prefix, "cards": value})
+                continue
+
+            if not prefix.startswith("p") or not prefix[1:].isdigit() or not value:
+                raise ValueError(f"Invalid action: {token}")
+
+            action_data = {"round": current_round, "player": int(prefix[1:])}
+            if value in short_codes:
+                action_data["action"] = short_codes[value]
+            elif value == "allin":
+                action_data["action"] = "allin"
+            elif value[0] in ("b", "r") and value[1:].isdigit():
+                action_data["action"] = "bet" if value[0] == "b" else "raise"
+                action_data["amount"] = int(value[1:])
+            else:
+                raise ValueError(f"Invalid action: {token}")
+            actions.append(action_data)
+
+        return actions, board_cards or None
+
 
 poker_service = PokerService()
\ No newline at end of file
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Dict, List
+import logging
+from app.repositories.hand_repository import hand_repository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RebalanceStats:
+    """Rows scanned on one shard and how many belonged elsewhere."""
+
+    shard: int
+    scanned: int = 0
+    moved: int = 0
+
+
+def rebalance_shard(shard: int, chunk_size: int = 5000, dry_run: bool = False) -> RebalanceStats:
+    """Move every row of ``shard`` whose hand_id now hashes to another shard.
+
+    Rows are copied before they are deleted, so an interrupted run loses
+    nothing and can simply be repeated.
+    """
+    stats = RebalanceStats(shard)
+    min_id, max_id = hand_repository.get_id_bounds(shard=shard)
+    if min_id is None:
+        return stats
+
+    for rows in hand_repository.stream_range(min_id, max_id + 1, chunk_size=chunk_size, shard=shard):
+        moves: Dict[int, List[Dict]] = {}
+        for row in rows:
+            stats.scanned += 1
+            target = hand_repository.shards.shard_for(row["hand_id"])
+            if target != shard:
+                moves.setdefault(target, []).append(row)
+
+        for target, moved in moves.items():
+            stats.moved += len(moved)
+            if dry_run:
+                continue
+            hand_repository.copy_rows(moved, target)
+            hand_repository.delete_many([row["hand_id"] for row in moved], shard)
+            logger.info(f"Moved {len(moved)} hands from shard {shard} to shard {target}")
+
+    return stats
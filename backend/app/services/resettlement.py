@@ -0,0 +1,180 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+from app.core.config import settings
+from app.repositories.hand_repository import hand_repository
+from app.services.poker_service import poker_service
+
+logger = logging.getLogger(__name__)
+
+IdRange = Tuple[int, int]
+
+
+@dataclass
+class ResettleStats:
+    """Counts for one id range, or the sum over several."""
+
+    start_id: int
+    end_id: int
+    scanned: int = 0
+    changed: int = 0
+    failed: int = 0
+
+    def add(self, other: "ResettleStats") -> None:
+        self.scanned += other.scanned
+        self.changed += other.changed
+        self.failed += other.failed
+
+
+def resettle_row(row: Dict) -> Dict[int, int]:
+    """Recalculate winnings for a stored hands row."""
+    player_cards = row["player_cards"]
+    if isinstance(player_cards, str):
+        player_cards = json.loads(player_cards)
+
+    actions, _ = poker_service.convert_short_format_to_actions(row["actions"])
+
+    return poker_service.calculate_winnings(
+        stack_size=row["stack_size"],
+        player_cards={str(k): v for k, v in player_cards.items()},
+        actions=actions,
+        board_cards=row["board_cards"],
+        num_players=row.get("num_players") or settings.num_players,
+        small_blind_position=row["small_blind_position"],
+        big_blind_position=row["big_blind_position"]
+    )
+
+
+def resettle_range(
+        start_id: int,
+        end_id: int,
+        chunk_size: int = 5000,
+        dry_run: bool = False,
+        shard: int = 0
+) -> ResettleStats:
+    """Re-settle rows of one shard with start_id <= id < end_id, updating only changed winnings."""
+    stats = ResettleStats(start_id, end_id)
+
+    for rows in hand_repository.stream_range(start_id, end_id, chunk_size=chunk_size, shard=shard):
+        updates = []
+        for row in rows:
+            stats.scanned += 1
+            try:
+                winnings = resettle_row(row)
+            except Exception as e:
+                stats.failed += 1
+                logger.warning(f"Could not re-settle hand {row['hand_id']}: {e}")
+                continue
+
+            stored = row["winnings"]
+            if isinstance(stored, str):
+                stored = json.loads(stored)
+            if {str(k): v for k, v in winnings.items()} != stored:
+                updates.append((row["id"], winnings))
+
+        stats.changed += len(updates)
+        if updates and not dry_run:
+            hand_repository.bulk_update_winnings(updates, shard=shard)
+
+    return stats
+
+
+def _init_worker() -> None:
+    # Per-action INFO logging dominates settlement time at this volume.
+    logging.getLogger("app.services.poker_service").setLevel(logging.WARNING)
+
+
+class ResettleJob:
+    """Re-runs settlement over one shard's hands table in parallel, resumable by id range."""
+
+    def __init__(
+            self,
+            partition_size: int = 100_000,
+            chunk_size: int = 5000,
+            workers: Optional[int] = None,
+            dry_run: bool = False,
+            on_progress: Optional[Callable[[ResettleStats, ResettleStats], None]] = None,
+            shard: int = 0
+    ):
+        self.partition_size = partition_size
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.dry_run = dry_run
+        self.on_progress = on_progress
+        self.shard = shard
+
+    def partitions(self, start_id: int, end_id: int) -> List[IdRange]:
+        """Split [start_id, end_id) into fixed-size id ranges."""
+        return [
+            (low, min(low + self.partition_size, end_id))
+            for low in range(start_id, end_id, self.partition_size)
+        ]
+
+    def load_checkpoint(self, checkpoint_path: Optional[str]) -> List[IdRange]:
+        """Id ranges finished by an earlier run."""
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                return [tuple(r) for r in json.load(f)["completed"]]
+        return []
+
+    def save_checkpoint(self, completed: List[IdRange], totals: ResettleStats, checkpoint_path: Optional[str]) -> None:
+        """Atomically record finished id ranges."""
+        if not checkpoint_path:
+            return
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"completed": sorted(completed), "totals": asdict(totals)}, f)
+        os.replace(tmp_path, checkpoint_path)
+
+    def run(
+            self,
+            start_id: Optional[int] = None,
+            end_id: Optional[int] = None,
+            checkpoint_path: Optional[str] = None
+    ) -> ResettleStats:
+        """Re-settle [start_id, end_id); defaults to the whole table."""
+        if start_id is None or end_id is None:
+            min_id, max_id = hand_repository.get_id_bounds(shard=self.shard)
+            if min_id is None:
+                return ResettleStats(0, 0)
+            start_id = min_id if start_id is None else start_id
+            end_id = max_id + 1 if end_id is None else end_id
+
+        completed = self.load_checkpoint(checkpoint_path)
+        pending = [r for r in self.partitions(start_id, end_id) if r not in completed]
+        totals = ResettleStats(start_id, end_id)
+
+        if self.workers == 0:
+            for low, high in pending:
+                self._finish(
+                    resettle_range(low, high, self.chunk_size, self.dry_run, self.shard),
+                    completed, totals, checkpoint_path
+                )
+            return totals
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+            futures = [
+                executor.submit(resettle_range, low, high, self.chunk_size, self.dry_run, self.shard)
+                for low, high in pending
+            ]
+            for future in as_completed(futures):
+                self._finish(future.result(), completed, totals, checkpoint_path)
+
+        return totals
+
+    def _finish(
+            self,
+            stats: ResettleStats,
+            completed: List[IdRange],
+            totals: ResettleStats,
+            checkpoint_path: Optional[str]
+    ) -> None:
+        totals.add(stats)
+        completed.append((stats.start_id, stats.end_id))
+        if not self.dry_run:
+            self.save_checkpoint(completed, totals, checkpoint_path)
+        if self.on_progress:
+            self.on_progress(stats, totals)
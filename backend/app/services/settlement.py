@@ -0,0 +1,34 @@
+from app.models.hand import Hand
+from app.schemas.hand import HandCreate
+from app.services.poker_service import poker_service
+
+
+def settle_hand(hand_data: HandCreate) -> Hand:
+    """Build a hand entity with calculated winnings and short format actions."""
+
+    winnings = poker_service.calculate_winnings(
+        stack_size=hand_data.stack_size,
+        player_cards=hand_data.player_cards,
+        actions=hand_data.actions,
+        board_cards=hand_data.board_cards,
+        num_players=hand_data.num_players,
+        small_blind_position=hand_data.small_blind_position,
+        big_blind_position=hand_data.big_blind_position
+    )
+
+    actions_short = poker_service.convert_actions_to_short_format(
+        hand_data.actions
+    )
+
+    return Hand(
+        hand_id=hand_data.hand_id,
+        stack_size=hand_data.stack_size,
+        dealer_position=hand_data.dealer_position,
+        small_blind_position=hand_data.small_blind_position,
+        big_blind_position=hand_data.big_blind_position,
+        player_cards={int(k): v for k, v in hand_data.player_cards.items()},
+        actions=actions_short,
+        board_cards=hand_data.board_cards,
+        num_players=hand_data.num_players,
+        winnings=winnings
+    )
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Set
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to consumers that could not keep up with the table.
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+_MISSING = object()
+
+
+class TableConnection:
+    """A single subscriber with its own bounded send buffer."""
+
+    def __init__(self, table_id: str, websocket: Any, buffer_size: int):
+        self.table_id = table_id
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.evicted = False
+
+
+class TableHub:
+    """Holds live table state and fans out batched diffs to subscribers.
+
+    State lives in this process. Server channels reach every worker through
+    the table relay; tables published to by clients are live only among
+    subscribers of the same worker. A table's state is dropped when its last subscriber leaves, except on
+    server channels, which only the server may publish to.
+    """
+
+    def __init__(
+            self,
+            send_buffer_size: int = settings.ws_send_buffer_size,
+            server_channels: Iterable[str] = (settings.history_channel,)
+    ):
+        self.send_buffer_size = send_buffer_size
+        self.server_channels = frozenset(server_channels)
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._connections: Dict[str, Set[TableConnection]] = {}
+        self._owners: Dict[str, TableConnection] = {}
+        self._flush_scheduled = False
+
+    def connect(self, table_id: str, websocket: Any) -> TableConnection:
+        """Register a subscriber and queue a full snapshot for it."""
+        connection = TableConnection(table_id, websocket, self.send_buffer_size)
+        self._connections.setdefault(table_id, set()).add(connection)
+        connection.queue.put_nowait({
+            "type": "snapshot",
+            "table_id": table_id,
+            "version": self._versions.get(table_id, 0),
+            "state": dict(self._states.get(table_id, {})),
+        })
+        return connection
+
+    def disconnect(self, connection: TableConnection) -> None:
+        """Remove a subscriber from its table, forgetting the table once nobody watches it."""
+        table_id = connection.table_id
+        if self._owners.get(table_id) is connection:
+            del self._owners[table_id]
+
+        connections = self._connections.get(table_id)
+        if connections is not None:
+            connections.discard(connection)
+            if not connections:
+                del self._connections[table_id]
+                if table_id not in self.server_channels:
+                    self._states.pop(table_id, None)
+                    self._versions.pop(table_id, None)
+                    self._pending.pop(table_id, None)
+
+    def claim(self, connection: TableConnection) -> bool:
+        """Let a subscriber publish to its table unless another client or the server owns it."""
+        if connection.table_id in self.server_channels:
+            return False
+        return self._owners.setdefault(connection.table_id, connection) is connection
+
+    def send_error(self, connection: TableConnection, detail: str) -> None:
+        """Queue an error frame for one subscriber."""
+        try:
+            connection.queue.put_nowait({"type": "error", "table_id": connection.table_id, "detail": detail})
+        except asyncio.QueueFull:
+            self._evict(connection)
+
+    def get_state(self, table_id: str) -> Dict[str, Any]:
+        """Return a copy of the current table state."""
+        return dict(self._states.get(table_id, {}))
+
+    def publish(self, table_id: str, changes: Dict[str, Any]) -> None:
+        """Apply top-level changes to a table; a value of None removes the key.
+
+        Changes published within the same event-loop tick are merged and sent
+        as a single diff.
+        """
+        state = self._states.setdefault(table_id, {})
+        pending = self._pending.setdefault(table_id, {})
+
+        for key, value in changes.items():
+            current = state.get(key, _MISSING)
+            unchanged = current is _MISSING if value is None else current == value
+            if unchanged and key not in pending:
+                continue
+            if value is None:
+                state.pop(key, None)
+            else:
+                state[key] = value
+            pending[key] = value
+
+        if not pending:
+            del self._pending[table_id]
+            return
+
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._flush_scheduled = True
+        loop.call_soon(self.flush)
+
+    def flush(self) -> None:
+        """Send every pending diff to the subscribers of its table."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+
+        for table_id, changes in pending.items():
+            version = self._versions.get(table_id, 0) + 1
+            self._versions[table_id] = version
+
+            message = {
+                "type": "diff",
+                "table_id": table_id,
+                "version": version,
+                "set": {k: v for k, v in changes.items() if v is not None},
+                "unset": [k for k, v in changes.items() if v is None],
+            }
+
+            for connection in list(self._connections.get(table_id, ())):
+                try:
+                    connection.queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    self._evict(connection)
+
+    def _evict(self, connection: TableConnection) -> None:
+        """Drop a subscriber whose send buffer is full."""
+        logger.warning(f"Evicting slow consumer from table {connection.table_id}")
+        connection.evicted = True
+        self.disconnect(connection)
+
+        while not connection.queue.empty():
+            connection.queue.get_nowait()
+        connection.queue.put_nowait(None)
+
+    async def run_sender(self, connection: TableConnection) -> None:
+        """Drain a subscriber's buffer onto its websocket."""
+        while True:
+            message: Optional[Dict[str, Any]] = await connection.queue.get()
+            try:
+                if message is None:
+                    await connection.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+                    return
+                await connection.websocket.send_json(message)
+            except Exception as e:
+                # The socket is gone; the receive loop sees the disconnect and cleans up.
+                logger.debug(f"Stopped sending to table {connection.table_id}: {e}")
+                return
+
+
+table_hub = TableHub()
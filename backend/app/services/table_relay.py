@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import uuid
+import psycopg2
+from psycopg2 import sql
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.core.database import Database, db
+from app.services.table_hub import TableHub, table_hub
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD_BYTES = 7999
+
+
+class TableRelay:
+    """Relays server-published table updates to every API worker over Postgres LISTEN/NOTIFY.
+
+    Updates are applied to this worker's hub at once and sent to the other
+    workers through the database. While the listener is down (no database,
+    or the connection dropped) updates reach this worker's subscribers only,
+    and it reconnects every ``reconnect_delay`` seconds.
+    """
+
+    def __init__(
+            self,
+            hub: TableHub = table_hub,
+            database: Database = db,
+            channel: str = settings.table_notify_channel,
+            reconnect_delay: float = 5.0
+    ):
+        self.hub = hub
+        self.database = database
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.origin = uuid.uuid4().hex
+        self._connection = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._retry: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def listening(self) -> bool:
+        return self._connection is not None
+
+    def start(self) -> None:
+        """Start listening for updates from other workers; call from the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._schedule_listen()
+
+    def stop(self) -> None:
+        """Stop listening and close the listener connection."""
+        if self._retry is not None:
+            self._retry.cancel()
+            self._retry = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._disconnect()
+        self._loop = None
+
+    def _schedule_listen(self) -> None:
+        self._retry = None
+        self._task = self._loop.create_task(self._listen())
+
+    def _connect(self):
+        connection = psycopg2.connect(**self.database.connection_params, connect_timeout=self.database.connect_timeout)
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+        except psycopg2.Error:
+            connection.close()
+            raise
+        return connection
+
+    async def _listen(self) -> None:
+        try:
+            # Connecting blocks for up to the connect timeout, so keep it off the event loop.
+            connection = await self._loop.run_in_executor(None, self._connect)
+        except psycopg2.Error as e:
+            logger.warning(f"Table relay cannot listen on {self.channel}, retrying in {self.reconnect_delay}s: {e}")
+            self._retry = self._loop.call_later(self.reconnect_delay, self._schedule_listen)
+            return
+        finally:
+            self._task = None
+
+        self._connection = connection
+        self._loop.add_reader(connection.fileno(), self._receive)
+        logger.info(f"Table relay listening on {self.channel}")
+
+    def _disconnect(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        if self._loop is not None:
+            self._loop.remove_reader(connection.fileno())
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    def _reconnect(self) -> None:
+        self._disconnect()
+        if self._loop is not None and self._retry is None and self._task is None:
+            self._retry = self._loop.call_later(self.reconnect_delay, self._schedule_listen)
+
+    def _receive(self) -> None:
+        try:
+            self._connection.poll()
+        except psycopg2.Error as e:
+            logger.warning(f"Table relay lost its listener connection: {e}")
+            self._reconnect()
+            return
+        self._drain()
+
+    def _drain(self) -> None:
+        while self._connection is not None and self._connection.notifies:
+            notify = self._connection.notifies.pop(0)
+            message = json.loads(notify.payload)
+            if message["origin"] != self.origin:
+                self.hub.publish(message["table_id"], message["changes"])
+
+    def publish(self, table_id: str, changes: Dict[str, Any]) -> None:
+        """Apply changes on this worker and forward them to the others."""
+        self.hub.publish(table_id, changes)
+        if self._connection is None:
+            return
+
+        payload = json.dumps({"origin": self.origin, "table_id": table_id, "changes": changes})
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            logger.warning(f"Update to table {table_id} is too large to relay ({len(payload)} bytes)")
+            return
+
+        try:
+            with self._connection.cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+        except psycopg2.Error as e:
+            logger.warning(f"Table relay could not forward an update to table {table_id}: {e}")
+            if self._connection.closed:
+                self._reconnect()
+            return
+        # Notifications that arrived with the query result never wake the reader.
+        self._drain()
+
+
+table_relay = TableRelay()
@@ -0,0 +1,176 @@
+import asyncio
+import math
+import random
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from app.core import admission
+from app.core.admission import AdaptiveLimit, AdmissionController, AdmissionRejectedError, admit
+from app.core.config import settings
+
+
+def test_admits_within_limit():
+    """Test requests under the limit are admitted and released."""
+    controller = AdmissionController(enabled=True, read_max=4, write_max=4, read_deadline=1, write_deadline=1)
+
+    async def scenario():
+        limit = await controller.acquire("GET /hands", "read")
+        assert controller.budgets["read"].inflight == 1
+        controller.release(limit, "read", 0.01, failed=False)
+
+    asyncio.run(scenario())
+    assert controller.budgets["read"].inflight == 0
+    assert controller.limits["GET /hands"].samples == 1
+
+
+def test_rejects_when_deadline_cannot_be_met():
+    """Test a full route rejects at once when the estimated wait exceeds its deadline."""
+    controller = AdmissionController(enabled=True, read_max=1, write_max=1, read_deadline=0.5, write_deadline=0.5)
+
+    async def scenario():
+        limit = await controller.acquire("GET /hands", "read")
+        controller.release(limit, "read", 1.0, failed=False)
+        held = await controller.acquire("GET /hands", "read")
+        with pytest.raises(AdmissionRejectedError) as error:
+            await controller.acquire("GET /hands", "read")
+        controller.release(held, "read", 1.0, failed=False)
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.retry_after >= 1
+    assert controller.limits["GET /hands"].rejected == 1
+
+
+def test_waiter_is_admitted_on_release():
+    """Test a queued request gets the slot freed by a finishing one."""
+    controller = AdmissionController(enabled=True, read_max=1, write_max=1, read_deadline=1, write_deadline=1)
+
+    async def scenario():
+        held = await controller.acquire("POST /hands", "write")
+        waiting = asyncio.ensure_future(controller.acquire("POST /hands", "write"))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        controller.release(held, "write", 0.001, failed=False)
+        limit = await waiting
+        controller.release(limit, "write", 0.001, failed=False)
+
+    asyncio.run(scenario())
+    assert controller.budgets["write"].inflight == 0
+    assert not controller.budgets["write"].waiters
+
+
+def test_reads_cannot_starve_writes():
+    """Test an exhausted read budget leaves the write budget untouched."""
+    controller = AdmissionController(enabled=True, read_max=2, write_max=2, read_deadline=0.01, write_deadline=1)
+
+    async def scenario():
+        reads = [await controller.acquire(f"GET /hands/{i}", "read") for i in range(2)]
+        with pytest.raises(AdmissionRejectedError):
+            await controller.acquire("GET /hands/recent", "read")
+        write = await controller.acquire("POST /hands", "write")
+        controller.release(write, "write", 0.001, failed=False)
+        for limit in reads:
+            controller.release(limit, "read", 0.001, failed=False)
+
+    asyncio.run(scenario())
+
+
+def test_limit_backs_off_on_slow_windows_and_recovers():
+    """Test the limit shrinks when a window's latency rises and grows again while busy."""
+    limit = AdaptiveLimit(deadline=1, initial=10, max_limit=20, tolerance=2, window=10)
+
+    for _ in range(10):
+        limit.on_sample(0.01)
+    for _ in range(10):
+        limit.on_sample(0.1)
+    assert limit.limit < 10
+
+    shrunk = limit.limit
+    for _ in range(int(shrunk)):
+        limit.take()
+    for _ in range(50):
+        limit.on_sample(0.01)
+    assert limit.limit > shrunk
+    assert limit.limit <= 20
+
+
+def test_single_slow_sample_does_not_back_off():
+    """Test one outlier in a window leaves the limit alone."""
+    limit = AdaptiveLimit(deadline=1, initial=16, tolerance=2, window=20)
+
+    for _ in range(20):
+        limit.on_sample(0.01)
+    for _ in range(19):
+        limit.on_sample(0.01)
+    limit.on_sample(1.0)
+    assert limit.limit == 16
+
+
+def test_jitter_without_overload_keeps_limit():
+    """Test ordinary latency jitter does not shrink the limit."""
+    rng = random.Random(7)
+    limit = AdaptiveLimit(deadline=10, initial=16, max_limit=16, tolerance=2)
+    for _ in range(8):
+        limit.take()
+
+    for i in range(5000):
+        # Occasional very fast requests must not set an unreachable baseline.
+        limit.on_sample(0.00005 if i % 50 == 0 else rng.lognormvariate(math.log(0.01), 0.5))
+    assert limit.limit >= 14
+
+
+def test_failures_shrink_limit_to_floor():
+    """Test failed requests back off but never below the minimum limit."""
+    limit = AdaptiveLimit(deadline=1, initial=4, min_limit=1, max_limit=8, window=10)
+
+    for _ in range(200):
+        limit.on_sample(0.01, failed=True)
+    assert limit.limit == 1
+    assert limit.has_capacity
+    assert limit.baseline == 0
+
+
+def test_waiters_on_a_full_route_do_not_block_other_routes():
+    """Test a request is admitted at once while only other routes have queued waiters."""
+    controller = AdmissionController(enabled=True, read_max=8, write_max=8, read_deadline=1, write_deadline=1)
+
+    async def scenario():
+        limit = controller.limit_for("GET /hands", "read")
+        limit.limit = 1
+        held = await controller.acquire("GET /hands", "read")
+        waiting = asyncio.ensure_future(controller.acquire("GET /hands", "read"))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+
+        other = await asyncio.wait_for(controller.acquire("GET /hands/recent", "read"), 0.1)
+        assert limit.waiting == 1
+
+        controller.release(other, "read", 0.001, failed=False)
+        controller.release(held, "read", 0.001, failed=False)
+        controller.release(await waiting, "read", 0.001, failed=False)
+
+    asyncio.run(scenario())
+    assert controller.budgets["read"].inflight == 0
+    assert controller.limits["GET /hands"].waiting == 0
+
+
+def test_client_errors_do_not_shrink_limit(monkeypatch):
+    """Test 4xx responses are neutral while 5xx responses count as failures."""
+    controller = AdmissionController(enabled=True)
+    monkeypatch.setattr(admission, "admission_controller", controller)
+    app = FastAPI()
+
+    @app.get("/status/{code}", dependencies=[Depends(admit)])
+    async def respond(code: int):
+        raise HTTPException(status_code=code)
+
+    client = TestClient(app)
+    for _ in range(40):
+        assert client.get("/status/400").status_code == 400
+    limit = controller.limits["GET /status/{code}"]
+    assert limit.samples == 0
+    assert limit.limit == settings.admission_initial_limit
+
+    for _ in range(40):
+        client.get("/status/500")
+    assert limit.limit < settings.admission_initial_limit
@@ -2,6 +2,7 @@ import pytest
 from fastapi.testclient import TestClient
 from app.main import app
 from app.core.database import db
+from app.repositories.hand_repository import hand_repository
 import uuid
 
 client = TestClient(app)
@@ -99,6 +100,77 @@ def test_create_duplicate_hand():
     assert response.status_code == 409
 
 
+def test_duplicate_that_slips_past_exists_check_returns_409(monkeypatch):
+    """Test the unique constraint maps to 409 when exists() misses a concurrent insert."""
+    hand_data = {
+        "hand_id": str(uuid.uuid4()),
+        "stack_size": 10000,
+        "dealer_position": 1,
+        "small_blind_position": 2,
+        "big_blind_position": 3,
+        "player_cards": {"1": "Tc2c", "2": "5d4c", "3": "Ah4s"},
+        "actions": [{"round": "preflop", "player": 1, "action": "fold"}],
+        "board_cards": None
+    }
+
+    response = client.post("/api/v1/hands/", json=hand_data)
+    assert response.status_code == 201
+
+    monkeypatch.setattr(hand_repository, "exists", lambda hand_id: False)
+    response = client.post("/api/v1/hands/", json=hand_data)
+    assert response.status_code == 409
+
+
+def test_create_heads_up_hand():
+    """Test creating a hand at a two-player table."""
+    hand_data = {
+        "hand_id": str(uuid.uuid4()),
+        "stack_size": 10000,
+        "num_players": 2,
+        "dealer_position": 1,
+        "small_blind_position": 1,
+        "big_blind_position": 2,
+        "player_cards": {
+            "1": "AsKs",
+            "2": "2d3d"
+        },
+        "actions": [
+            {"round": "preflop", "player": 1, "action": "raise", "amount": 120},
+            {"round": "preflop", "player": 2, "action": "fold"}
+        ],
+        "board_cards": None
+    }
+
+    response = client.post("/api/v1/hands/", json=hand_data)
+    assert response.status_code == 201
+
+    data = response.json()
+    assert data["num_players"] == 2
+    assert data["winnings"] == {"1": 40, "2": -40}
+
+
+def test_create_hand_with_seat_outside_table():
+    """Test a seat beyond the table size is rejected."""
+    hand_data = {
+        "hand_id": str(uuid.uuid4()),
+        "stack_size": 10000,
+        "num_players": 2,
+        "dealer_position": 1,
+        "small_blind_position": 1,
+        "big_blind_position": 2,
+        "player_cards": {
+            "1": "AsKs",
+            "2": "2d3d",
+            "3": "4h5h"
+        },
+        "actions": [],
+        "board_cards": None
+    }
+
+    response = client.post("/api/v1/hands/", json=hand_data)
+    assert response.status_code == 422
+
+
 def test_get_hand():
     """Test getting a specific hand."""
     hand_id = str(uuid.uuid4())
@@ -197,4 +269,61 @@ def test_delete_nonexistent_hand():
     """Test deleting a hand that doesn't exist returns 404."""
     fake_id = str(uuid.uuid4())
     response = client.delete(f"/api/v1/hands/{fake_id}")
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+
+def test_create_hand_with_duplicate_cards_is_rejected():
+    """Test a hand dealing the same card twice gets 422 before settlement runs."""
+    hand_data = {
+        "hand_id": str(uuid.uuid4()),
+        "stack_size": 10000,
+        "dealer_position": 1,
+        "small_blind_position": 2,
+        "big_blind_position": 3,
+        "player_cards": {"1": "AsKs", "2": "AsKs", "3": "4h5h"},
+        "actions": [{"round": "preflop", "player": 1, "action": "fold"}],
+        "board_cards": None
+    }
+
+    response = client.post("/api/v1/hands/", json=hand_data)
+    assert response.status_code == 422
+    assert "Duplicate" in str(response.json()["detail"])
+
+
+def test_create_hand_with_invalid_action_is_rejected():
+    """Test an unknown action type gets 422."""
+    hand_data = {
+        "hand_id": str(uuid.uuid4()),
+        "stack_size": 10000,
+        "dealer_position": 1,
+        "small_blind_position": 2,
+        "big_blind_position": 3,
+        "player_cards": {"1": "AsKs", "2": "QdQc", "3": "4h5h"},
+        "actions": [{"round": "preflop", "player": 1, "action": "shove"}],
+        "board_cards": None
+    }
+
+    response = client.post("/api/v1/hands/", json=hand_data)
+    assert response.status_code == 422
+
+
+def test_create_hand_with_undealt_street_action_is_rejected():
+    """Test a flop action with no flop deal gets 422 instead of being dropped by settlement."""
+    hand_data = {
+        "hand_id": str(uuid.uuid4()),
+        "stack_size": 10000,
+        "dealer_position": 1,
+        "small_blind_position": 2,
+        "big_blind_position": 3,
+        "player_cards": {"1": "AsKs", "2": "QdQc", "3": "4h5h"},
+        "actions": [
+            {"round": "preflop", "player": 1, "action": "call", "amount": 40},
+            {"round": "preflop", "player": 2, "action": "call", "amount": 40},
+            {"round": "preflop", "player": 3, "action": "check"},
+            {"round": "flop", "player": 2, "action": "bet", "amount": 100}
+        ],
+        "board_cards": None
+    }
+
+    response = client.post("/api/v1/hands/", json=hand_data)
+    assert response.status_code == 422
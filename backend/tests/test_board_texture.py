@@ -0,0 +1,51 @@
+import random
+from itertools import combinations
+import pytest
+from app.core.cards import format_cards, parse_cards
+from app.services.board_texture import (
+    BOARD_FULL_HOUSE, PAIRED, UNPAIRED, board_texture, category, outs, texture_columns
+)
+from app.services.equity import FLUSH, QUADS, STRAIGHT, STRAIGHT_FLUSH, TRIPS, evaluate
+
+
+@pytest.mark.parametrize("board, pairing, max_suit, flush_draw, straight_possible, straight_draw, nut", [
+    ("2c7dKh", UNPAIRED, 1, False, False, False, TRIPS),
+    ("9h8h2c", UNPAIRED, 2, True, False, True, TRIPS),
+    ("9h8h7c", UNPAIRED, 2, True, True, True, STRAIGHT),
+    ("Kh8h2h", UNPAIRED, 3, True, False, False, FLUSH),
+    ("KhKd2c", PAIRED, 1, False, False, False, QUADS),
+    ("9h8h7h", UNPAIRED, 3, True, True, True, STRAIGHT_FLUSH),
+    ("KhKd2c2dKs", BOARD_FULL_HOUSE, 2, False, False, False, QUADS),
+])
+def test_board_texture(board, pairing, max_suit, flush_draw, straight_possible, straight_draw, nut):
+    """Test texture features of typical flops and rivers."""
+    assert tuple(board_texture(board)) == (
+        pairing, max_suit, flush_draw, straight_possible, straight_draw, nut
+    )
+
+
+def test_nut_category_matches_enumeration():
+    """Test the analytic nut category against the best of every hole-card combo."""
+    rng = random.Random(7)
+    for size in (3, 4, 5):
+        for _ in range(20):
+            board = tuple(rng.sample(range(52), size))
+            deck = [card for card in range(52) if card not in board]
+            best = max(category(evaluate(board + combo)) for combo in combinations(deck, 2))
+            assert board_texture(format_cards(board)).nut_category == best, format_cards(board)
+
+
+def test_outs():
+    """Test outs for a flush draw and for an open-ended straight draw."""
+    assert len(outs("AhKh", "7h2h9c")) == 9 + 6
+    assert len(outs("9c8d", "7h6s2c")) == 8 + 6
+    assert parse_cards("Jd") not in outs("9c8d", "7h6s2c")
+
+    with pytest.raises(ValueError):
+        outs("AhKh", "7h2h9c4d5s")
+
+
+def test_texture_columns_without_board():
+    """Test preflop hands store NULL texture columns."""
+    assert texture_columns(None) == (None,) * 6
+    assert texture_columns("2c7dKh")[0] == UNPAIRED
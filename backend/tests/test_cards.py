@@ -0,0 +1,99 @@
+import pytest
+from pydantic import ValidationError
+from app.core.cards import format_cards, normalize_cards, parse_board, parse_card, parse_cards, parse_hole_cards
+from app.schemas.hand import HandCreate
+from app.services.poker_service import poker_service
+
+
+def test_parse_cards_round_trip():
+    """Test card strings parse to rank * 4 + suit codes and format back."""
+    assert parse_card("2c") == 0
+    assert parse_card("As") == 51
+    assert parse_cards("3hKdQs") == (6, 45, 43)
+    assert parse_cards(None) == ()
+    assert format_cards(parse_cards("3hKdQs")) == "3hKdQs"
+    assert normalize_cards("ahKD") == "AhKd"
+
+
+@pytest.mark.parametrize("cards", ["1c", "Ax", "AhK", "AhKdQ"])
+def test_invalid_cards_raise(cards):
+    """Test malformed card strings are rejected."""
+    with pytest.raises(ValueError):
+        parse_cards(cards)
+
+
+def test_hole_and_board_sizes():
+    """Test hole cards need exactly two cards and boards 0, 3, 4 or 5."""
+    assert parse_hole_cards("AhKd") == (50, 45)
+    assert parse_board("") == ()
+    with pytest.raises(ValueError):
+        parse_hole_cards("AhKdQs")
+    with pytest.raises(ValueError):
+        parse_board("AhKd")
+
+
+def test_hand_create_rejects_invalid_cards():
+    """Test invalid cards fail validation instead of reaching settlement."""
+    payload = {
+        "hand_id": "h1",
+        "stack_size": 10000,
+        "dealer_position": 1,
+        "small_blind_position": 2,
+        "big_blind_position": 3,
+        "player_cards": {"1": "ahkc", "2": "2c7d"},
+        "actions": [],
+        "board_cards": "3hkdqs"
+    }
+    hand = HandCreate(**payload)
+    assert hand.player_cards["1"] == "AhKc"
+    assert hand.board_cards == "3hKdQs"
+
+    with pytest.raises(ValidationError):
+        HandCreate(**{**payload, "player_cards": {"1": "Zz2c"}})
+
+
+def test_showdown_uses_full_evaluation_and_splits_ties():
+    """Test straights beat pairs and identical hands split the pot."""
+    actions = [{"round": "preflop", "player": 1, "action": "call", "amount": 40},
+               {"round": "preflop", "player": 2, "action": "call", "amount": 40},
+               {"round": "preflop", "player": 3, "action": "check"}]
+
+    winnings = poker_service.calculate_winnings(
+        stack_size=10000,
+        player_cards={"1": "9c8d", "2": "AhAd", "3": "2c3d"},
+        actions=actions,
+        board_cards="7h6s5dKcJs",
+        num_players=3,
+        small_blind_position=2,
+        big_blind_position=3
+    )
+    assert winnings == {1: 80, 2: -40, 3: -40}
+
+    winnings = poker_service.calculate_winnings(
+        stack_size=10000,
+        player_cards={"1": "9c8d", "2": "9h8h", "3": "2c3d"},
+        actions=actions,
+        board_cards="7h6s5dKcJs",
+        num_players=3,
+        small_blind_position=2,
+        big_blind_position=3
+    )
+    assert winnings == {1: 20, 2: 20, 3: -40}
+
+
+def test_all_in_contributes_remaining_stack():
+    """Test an all-in puts the player's whole remaining stack in the pot."""
+    actions = [{"round": "preflop", "player": 1, "action": "allin"},
+               {"round": "preflop", "player": 2, "action": "call"},
+               {"round": "preflop", "player": 3, "action": "fold"}]
+
+    winnings = poker_service.calculate_winnings(
+        stack_size=1000,
+        player_cards={"1": "AhAd", "2": "KhKd", "3": "2c3d"},
+        actions=actions,
+        board_cards="7h6s5dJcTs",
+        num_players=3,
+        small_blind_position=2,
+        big_blind_position=3
+    )
+    assert winnings == {1: 1040, 2: -1000, 3: -40}
@@ -0,0 +1,262 @@
+import os
+import psycopg2
+import psycopg2.pool
+import pytest
+from app.core import database
+from app.core.database import Database, ReadAfter, ReadYourWritesMiddleware, format_lsn, parse_lsn
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = None
+        self.statusmessage = None
+
+    def execute(self, query, params=None):
+        self.conn.queries.append(query.strip())
+        self.conn.node.queries.append(query.strip())
+        self.statusmessage = "INSERT 0 1" if query.startswith("INSERT") else "SELECT 1"
+        if "pg_current_wal_lsn" in query:
+            self.result = {"pg_current_wal_lsn": self.conn.node.lsn}
+        elif "pg_last_wal_replay_lsn" in query:
+            self.result = (self.conn.node.lsn,)
+        else:
+            self.result = {"node": self.conn.node.name}
+
+    def fetchone(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    closed = 0
+
+    def __init__(self, node):
+        self.node = node
+        self.queries = []
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeNode:
+    def __init__(self, name, lsn):
+        self.name = name
+        self.lsn = lsn
+        self.down = False
+        self.connects = []
+        self.queries = []
+        self.closed_pools = 0
+
+
+class FakePool:
+    nodes = {}
+
+    def __init__(self, minconn, maxconn, host, **kwargs):
+        self.node = self.nodes[host]
+        self.node.connects.append(kwargs)
+        if self.node.down:
+            raise psycopg2.OperationalError("timeout expired")
+
+    def getconn(self):
+        return FakeConnection(self.node)
+
+    def putconn(self, conn, close=False):
+        pass
+
+    def closeall(self):
+        self.node.closed_pools += 1
+
+
+@pytest.fixture
+def nodes(monkeypatch):
+    FakePool.nodes = {
+        "primary": FakeNode("primary", "0/100"),
+        "replica": FakeNode("replica", "0/100"),
+    }
+    monkeypatch.setattr(database, "ThreadedConnectionPool", FakePool)
+    return FakePool.nodes
+
+
+def make_db(read_your_writes=True):
+    return Database(
+        primary={"host": "primary"},
+        replicas=[{"host": "replica"}],
+        read_your_writes=read_your_writes
+    )
+
+
+def test_parse_lsn():
+    """Test LSNs compare correctly once parsed."""
+    assert parse_lsn("16/B374D848") > parse_lsn("16/3002D50")
+    assert parse_lsn(None) is None
+    assert format_lsn(parse_lsn("16/B374D848")) == "16/B374D848"
+
+
+def test_reads_go_to_replica_and_writes_to_primary(nodes):
+    """Test read-only queries use the replica pool."""
+    db = make_db()
+
+    assert db.fetch_one("SELECT 1", read_only=True)["node"] == "replica"
+    assert db.fetch_one("INSERT 1")["node"] == "primary"
+
+
+def test_read_your_writes_falls_back_to_primary(nodes):
+    """Test a request's reads go to the primary until the replica replays its write."""
+    db = make_db()
+    nodes["primary"].lsn = "0/200"
+
+    token = database._read_after.set(ReadAfter())
+    try:
+        db.fetch_one("INSERT 1")
+        assert db.fetch_one("SELECT 1", read_only=True)["node"] == "primary"
+
+        nodes["replica"].lsn = "0/200"
+        assert db.fetch_one("SELECT 1", read_only=True)["node"] == "replica"
+    finally:
+        database._read_after.reset(token)
+
+
+def test_other_requests_do_not_wait_for_writes(nodes):
+    """Test writes elsewhere in the process do not push unrelated reads onto the primary."""
+    db = make_db()
+    nodes["primary"].lsn = "0/200"
+    db.fetch_one("INSERT 1")
+
+    assert db.fetch_one("SELECT 1", read_only=True)["node"] == "replica"
+    assert not any("pg_last_wal_replay_lsn" in query for query in nodes["replica"].queries)
+
+
+def test_lagging_replica_is_skipped_for_a_caught_up_one(nodes):
+    """Test the next replica is tried before falling back to the primary."""
+    nodes["second"] = FakeNode("second", "0/200")
+    db = Database(primary={"host": "primary"}, replicas=[{"host": "replica"}, {"host": "second"}])
+
+    token = database._read_after.set(ReadAfter(parse_lsn("0/200")))
+    try:
+        assert {db.fetch_one("SELECT 1", read_only=True)["node"] for _ in range(4)} == {"second"}
+    finally:
+        database._read_after.reset(token)
+
+
+def test_primary_selects_record_no_write_position(nodes):
+    """Test a plain SELECT on the primary does not raise the request's write position."""
+    db = make_db()
+    nodes["primary"].lsn = "0/200"
+    session = ReadAfter()
+
+    token = database._read_after.set(session)
+    try:
+        db.fetch_one("SELECT 1")
+    finally:
+        database._read_after.reset(token)
+    assert session.lsn == 0
+
+
+def test_exhausted_pool_does_not_mark_replica_down(nodes, monkeypatch):
+    """Test only connection errors take a replica out of rotation."""
+    db = make_db()
+
+    def exhausted(self):
+        raise psycopg2.pool.PoolError("connection pool exhausted")
+
+    monkeypatch.setattr(FakePool, "getconn", exhausted)
+    with pytest.raises(psycopg2.pool.PoolError):
+        db.fetch_one("SELECT 1", read_only=True)
+    assert not db._down_until
+
+
+def test_without_read_your_writes_replica_is_used(nodes):
+    """Test the guarantee can be turned off."""
+    db = make_db(read_your_writes=False)
+
+    nodes["primary"].lsn = "0/200"
+    db.fetch_one("INSERT 1")
+    assert db.fetch_one("SELECT 1", read_only=True)["node"] == "replica"
+
+
+def test_pool_in_use_is_closed_only_after_checkin(nodes):
+    """Test marking a replica down does not close connections other callers still hold."""
+    db = make_db()
+
+    with db.get_connection(read_only=True) as conn:
+        assert conn.node.name == "replica"
+        db._mark_down(1)
+        assert nodes["replica"].closed_pools == 0
+    assert nodes["replica"].closed_pools == 1
+    assert db.fetch_one("SELECT 1", read_only=True)["node"] == "primary"
+
+
+def test_read_after_token_is_honoured_across_workers(nodes):
+    """Test a write's LSN is returned to the client and routes its later reads on another worker."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    worker_a, worker_b = make_db(), make_db()
+
+    def make_app(db):
+        app = FastAPI()
+
+        @app.post("/write")
+        async def write():
+            db.fetch_one("INSERT 1")
+
+        @app.get("/read")
+        async def read():
+            return db.fetch_one("SELECT 1", read_only=True)
+
+        app.add_middleware(ReadYourWritesMiddleware)
+        return TestClient(app)
+
+    nodes["primary"].lsn = "0/200"
+    lsn = make_app(worker_a).post("/write").headers["x-read-after-lsn"]
+    assert lsn == "0/200"
+
+    reader = make_app(worker_b)
+    assert reader.get("/read").json()["node"] == "replica"
+    assert reader.get("/read", headers={"X-Read-After-LSN": lsn}).json()["node"] == "primary"
+    assert reader.get("/read", headers={"X-Read-After-LSN": "garbage"}).json()["node"] == "replica"
+
+    nodes["replica"].lsn = "0/200"
+    assert reader.get("/read", headers={"X-Read-After-LSN": lsn}).json()["node"] == "replica"
+
+
+def test_unreachable_replica_is_skipped_during_cooldown(nodes):
+    """Test a replica that cannot be reached is not retried on every read."""
+    db = make_db()
+    nodes["replica"].down = True
+
+    for _ in range(3):
+        assert db.fetch_one("SELECT 1", read_only=True)["node"] == "primary"
+    assert len(nodes["replica"].connects) == 1
+    assert nodes["replica"].connects[0]["connect_timeout"] == db.connect_timeout
+
+    nodes["replica"].down = False
+    db._down_until.clear()
+    assert db.fetch_one("SELECT 1", read_only=True)["node"] == "replica"
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_REPLICAS"),
+    reason="set TEST_DATABASE_REPLICAS=host:port to run against a second local Postgres"
+)
+def test_replica_routing_against_local_instances():
+    """Test routing against a real primary and a second local instance."""
+    from app.core.config import settings
+
+    real_db = Database(
+        replicas=[
+            {**Database().connection_params, **node}
+            for node in database.parse_hosts(os.environ["TEST_DATABASE_REPLICAS"], settings.database_port)
+        ]
+    )
+    real_db.init_db()
+    assert real_db.fetch_one("SELECT 1 AS one", read_only=True)["one"] == 1
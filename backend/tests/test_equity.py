@@ -0,0 +1,96 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import equity
+from app.services.equity import evaluate, parse_cards, parse_range, range_vs_range_equity
+
+client = TestClient(app)
+
+
+def test_parse_range():
+    """Test range notation expands to the expected number of combos."""
+    assert len(parse_range("QQ+")) == 18
+    assert len(parse_range("AKs")) == 4
+    assert len(parse_range("AKo")) == 12
+    assert len(parse_range("ATs+")) == 16
+    assert len(parse_range("KTo-K8o,22-44")) == 3 * 12 + 3 * 6
+    assert len(parse_range("AsKs,AsKs")) == 1
+
+    with pytest.raises(ValueError):
+        parse_range("KAs")
+    with pytest.raises(ValueError):
+        parse_range("QQs")
+
+
+def test_evaluate_orders_categories():
+    """Test hand categories rank in the right order."""
+    straight_flush = evaluate(parse_cards("9s8s7s6s5s2d3c"))
+    quads = evaluate(parse_cards("9s9h9d9c5s2d3c"))
+    flush = evaluate(parse_cards("As8s7s6s2s2d3c"))
+    straight = evaluate(parse_cards("9s8d7s6s5h2d3c"))
+    wheel = evaluate(parse_cards("As2d3s4s5hKdQc"))
+    two_pair = evaluate(parse_cards("AsAd3s3d5hKdQc"))
+
+    assert straight_flush > quads > flush > straight > wheel > two_pair
+
+
+def test_isomorphic_boards_share_cache_entry():
+    """Test suit-isomorphic boards hit the same cached result."""
+    first = range_vs_range_equity("QQ+,AKs", "JJ,AQs", "3h7d9s")
+    hits = equity.cache_info().hits
+    second = range_vs_range_equity("QQ+,AKs", "JJ,AQs", "3c7s9h")
+
+    assert first == second
+    assert equity.cache_info().hits == hits + 1
+
+
+def test_river_equity_is_exact():
+    """Test a made hand on the river wins every matchup."""
+    result = range_vs_range_equity("AA", "KK", "AsKd2c7h9s")
+    assert result["range_a_equity"] == 1.0
+    assert result["tie"] == 0.0
+
+
+def test_large_ranges_sample_matchups(monkeypatch):
+    """Test queries past the work budget sample matchups instead of enumerating them."""
+    monkeypatch.setattr(equity.settings, "equity_samples", 2000)
+    result = range_vs_range_equity("22+,A2s+", "22+,K2s+", "2h7d9s")
+
+    assert result["matchups"] == 2000
+    assert abs(result["range_a_equity"] + result["range_b_equity"] - 1.0) < 1e-9
+
+    monkeypatch.setattr(equity.settings, "equity_max_work", 10 ** 12)
+    exact = range_vs_range_equity("QQ+", "JJ", "2h7d9s")
+    equity._canonical_equity.cache_clear()
+    monkeypatch.setattr(equity.settings, "equity_max_work", 0)
+    sampled = range_vs_range_equity("QQ+", "JJ", "2h7d9s")
+    assert sampled["matchups"] == 2000
+    assert abs(exact["range_a_equity"] - sampled["range_a_equity"]) < 0.05
+
+
+def test_sampling_redraws_conflicting_pairs(monkeypatch):
+    """Test sampled queries collect every requested sample and fail cleanly without valid pairs."""
+    monkeypatch.setattr(equity.settings, "equity_samples", 500)
+    monkeypatch.setattr(equity.settings, "equity_max_work", 0)
+
+    # Most AA vs AK pairs share an ace.
+    assert range_vs_range_equity("AA", "AKo", "2h7d9s")["matchups"] == 500
+
+    with pytest.raises(ValueError):
+        range_vs_range_equity("AA", "AA", "AcAd2s")
+
+
+def test_range_equity_endpoint():
+    """Test the range equity endpoint."""
+    response = client.post("/api/v1/equity/ranges", json={
+        "range_a": "AA",
+        "range_b": "KK",
+        "board_cards": "2c7d9h"
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["range_a_equity"] > 0.85
+    assert abs(data["range_a_equity"] + data["range_b_equity"] - 1.0) < 1e-9
+
+    response = client.post("/api/v1/equity/ranges", json={"range_a": "AA", "range_b": "XX"})
+    assert response.status_code == 400
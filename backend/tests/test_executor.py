@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.core.executor import CPUExecutor, ExecutorOverloadedError, ExecutorTimeoutError, check_deadline
+from app.services import icm
+
+
+def test_run_returns_result():
+    """Test a call runs in the pool and its result is returned."""
+    executor = CPUExecutor(kind="thread", max_workers=2, max_queue_depth=4, timeout=5)
+
+    assert asyncio.run(executor.run(sum, [1, 2, 3])) == 6
+    assert executor.in_flight == 0
+    executor.shutdown()
+
+
+def test_queue_depth_is_bounded():
+    """Test calls beyond the queue depth are rejected immediately."""
+    executor = CPUExecutor(kind="thread", max_workers=1, max_queue_depth=1, timeout=5)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutorOverloadedError):
+            await executor.run(sum, [1])
+        release.set()
+        await blocked
+
+    asyncio.run(scenario())
+    assert executor.in_flight == 0
+    executor.shutdown()
+
+
+def test_timeout():
+    """Test a call that runs too long raises a timeout error."""
+    executor = CPUExecutor(kind="thread", max_workers=1, max_queue_depth=4, timeout=0.05)
+    release = threading.Event()
+
+    with pytest.raises(ExecutorTimeoutError):
+        asyncio.run(executor.run(release.wait))
+
+    release.set()
+    executor.shutdown()
+
+
+def test_timed_out_call_frees_its_worker():
+    """Test a call that checks its deadline stops running once it times out."""
+    executor = CPUExecutor(kind="thread", max_workers=1, max_queue_depth=4, timeout=0.05)
+
+    def spin():
+        while True:
+            check_deadline()
+
+    with pytest.raises(ExecutorTimeoutError):
+        asyncio.run(executor.run(spin))
+
+    deadline = time.monotonic() + 1
+    while executor.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert executor.in_flight == 0
+    assert asyncio.run(executor.run(sum, [1, 2])) == 3
+    executor.shutdown()
+
+
+def test_icm_stops_at_deadline(monkeypatch):
+    """Test a long ICM estimate gives up inside the worker instead of running on."""
+    monkeypatch.setattr(icm.settings, "icm_samples", 10 ** 9)
+    monkeypatch.setattr(icm.settings, "icm_max_states", 0)
+    executor = CPUExecutor(kind="thread", max_workers=1, max_queue_depth=4, timeout=0.05)
+
+    started = time.monotonic()
+    with pytest.raises(ExecutorTimeoutError):
+        asyncio.run(executor.run(icm.icm_equity, [30, 20, 10, 5], [50, 30, 20]))
+    while executor.in_flight and time.monotonic() - started < 2:
+        time.sleep(0.01)
+    assert executor.in_flight == 0
+    executor.shutdown()
@@ -0,0 +1,107 @@
+import json
+from app.models.hand import Hand
+from app.services.history_importer import HistoryImporter, parse_hand_block
+from app.services.poker_service import poker_service
+
+
+def make_history(hand_id: str) -> str:
+    """Render a hand the way the history endpoint does."""
+    actions = [
+        {"round": "preflop", "player": 6, "action": "fold"},
+        {"round": "preflop", "player": 1, "action": "fold"},
+        {"round": "preflop", "player": 2, "action": "fold"},
+        {"round": "preflop", "player": 3, "action": "raise", "amount": 300},
+        {"round": "preflop", "player": 4, "action": "call", "amount": 300},
+        {"round": "preflop", "player": 5, "action": "fold"},
+        {"round": "flop", "cards": "3hKdQs"},
+        {"round": "flop", "player": 4, "action": "check"},
+        {"round": "flop", "player": 3, "action": "bet", "amount": 100},
+        {"round": "flop", "player": 4, "action": "fold"}
+    ]
+    hand = Hand(
+        hand_id=hand_id,
+        stack_size=10000,
+        dealer_position=3,
+        small_blind_position=4,
+        big_blind_position=5,
+        player_cards={1: "Tc2c", 2: "5d4c", 3: "Ah4s", 4: "QcTd", 5: "Js9d", 6: "8h6s"},
+        actions=poker_service.convert_actions_to_short_format(actions),
+        winnings={1: 0, 2: 0, 3: 340, 4: -300, 5: -40, 6: 0}
+    )
+    return "\n".join(hand.format_for_history()) + "\n\n"
+
+
+def test_parse_hand_block_round_trip():
+    """Test a formatted history block parses back into a HandCreate."""
+    hand_data = parse_hand_block(make_history("h1").splitlines())
+
+    assert hand_data.hand_id == "h1"
+    assert hand_data.dealer_position == 3
+    assert hand_data.player_cards["4"] == "QcTd"
+    assert hand_data.board_cards == "3hKdQs"
+    assert hand_data.actions[3] == {"round": "preflop", "player": 3, "action": "raise", "amount": 300}
+    assert poker_service.convert_actions_to_short_format(hand_data.actions) == \
+        make_history("h1").splitlines()[3][len("Actions: "):]
+
+
+def test_table_size_survives_round_trip():
+    """Test a 9-max hand with empty seats keeps its table size through export and import."""
+    hand = Hand(
+        hand_id="nine-max",
+        stack_size=10000,
+        num_players=9,
+        dealer_position=7,
+        small_blind_position=8,
+        big_blind_position=9,
+        player_cards={1: "Tc2c", 3: "5d4c", 8: "Ah4s", 9: "QcTd"},
+        actions=poker_service.convert_actions_to_short_format([
+            {"round": "preflop", "player": 1, "action": "fold"},
+            {"round": "preflop", "player": 3, "action": "fold"},
+            {"round": "preflop", "player": 8, "action": "fold"}
+        ]),
+        winnings={}
+    )
+    lines = hand.format_for_export()
+    assert lines[2] == "Seats: 9"
+    assert parse_hand_block(lines).num_players == 9
+
+    # Display lines carry no table size; the highest seat referenced is used instead.
+    assert "Seats: 9" not in hand.format_for_history()
+    assert parse_hand_block(hand.format_for_history()).num_players == 9
+
+
+def test_import_resumes_from_checkpoint(tmp_path):
+    """Test a failed import resumes after the last committed batch."""
+    source = tmp_path / "history.txt"
+    source.write_text("".join(make_history(f"h{i}") for i in range(5)) + "Hand #broken\n")
+    checkpoint = tmp_path / "checkpoint.json"
+
+    loaded = []
+
+    def failing_loader(hands):
+        if len(loaded) >= 2:
+            raise RuntimeError("database went away")
+        loaded.extend(hand.hand_id for hand in hands)
+        return len(hands)
+
+    importer = HistoryImporter(loader=failing_loader, batch_size=2, workers=0)
+    try:
+        importer.run(str(source), checkpoint_path=str(checkpoint))
+    except RuntimeError:
+        pass
+
+    assert loaded == ["h0", "h1"]
+    assert json.loads(checkpoint.read_text())["imported"] == 2
+
+    def loader(hands):
+        loaded.extend(hand.hand_id for hand in hands)
+        return len(hands)
+
+    progress = HistoryImporter(loader=loader, batch_size=2, workers=0, use_mmap=True).run(
+        str(source), checkpoint_path=str(checkpoint)
+    )
+
+    assert loaded == ["h0", "h1", "h2", "h3", "h4"]
+    assert progress.imported == 5
+    assert progress.skipped == 1
+    assert progress.offset == source.stat().st_size
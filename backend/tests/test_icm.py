@@ -0,0 +1,73 @@
+from itertools import permutations
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.services import icm
+from app.services.icm import icm_equity
+
+client = TestClient(app)
+
+
+def brute_force_icm(stacks, payouts):
+    """Naive ICM: probability of every full finishing order."""
+    equity = [0.0] * len(stacks)
+    for order in permutations(range(len(stacks))):
+        probability, remaining = 1.0, sum(stacks)
+        for player in order:
+            probability *= stacks[player] / remaining
+            remaining -= stacks[player]
+        for place, player in enumerate(order[:len(payouts)]):
+            equity[player] += probability * payouts[place]
+    return equity
+
+
+@pytest.mark.parametrize("stacks, payouts", [
+    ([1000, 2000, 3000], [50, 30, 20]),
+    ([4200, 3100, 1800, 900, 900, 2500], [50, 30, 20]),
+    ([500, 700], [100, 0, 0]),
+])
+def test_exact_icm_matches_brute_force(stacks, payouts):
+    """Test the subset recursion matches enumerating every finishing order."""
+    result = icm_equity(stacks, payouts)
+
+    assert result["method"] == "exact"
+    assert result["equities"] == pytest.approx(brute_force_icm(stacks, payouts))
+    assert sum(result["equities"]) == pytest.approx(result["prize_pool"])
+
+
+def test_large_field_uses_monte_carlo(monkeypatch):
+    """Test fields beyond the exact state limit are sampled and stay close to ICM."""
+    stacks = [4200, 3100, 1800, 900, 2500, 1500, 3300]
+    payouts = [50, 30, 20]
+    monkeypatch.setattr(settings, "icm_max_states", 10)
+    icm._canonical_equity.cache_clear()
+
+    result = icm_equity(stacks, payouts)
+
+    assert result["method"] == "monte_carlo"
+    assert result["equities"] == pytest.approx(brute_force_icm(stacks, payouts), abs=0.6)
+    icm._canonical_equity.cache_clear()
+
+
+def test_results_follow_input_order():
+    """Test cached results are mapped back to the caller's stack order."""
+    forward = icm_equity([1000, 2000, 3000], [50, 30, 20])["equities"]
+    backward = icm_equity([3000, 2000, 1000], [50, 30, 20])["equities"]
+
+    assert backward == list(reversed(forward))
+
+
+def test_icm_endpoint():
+    """Test the ICM endpoint and its validation."""
+    response = client.post("/api/v1/tournaments/icm", json={"stacks": [1000, 1000], "payouts": [70, 30]})
+    assert response.status_code == 200
+    assert response.json()["equities"] == pytest.approx([50.0, 50.0])
+
+    response = client.post("/api/v1/tournaments/icm", json={"stacks": [1000, 0], "payouts": [70, 30]})
+    assert response.status_code == 400
+
+    response = client.post("/api/v1/tournaments/icm", json={"stacks": [1000] * 51, "payouts": [70, 30]})
+    assert response.status_code == 422
+    response = client.post("/api/v1/tournaments/icm", json={"stacks": [1000, 1000], "payouts": [1] * 51})
+    assert response.status_code == 422
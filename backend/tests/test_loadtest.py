@@ -0,0 +1,46 @@
+import asyncio
+import random
+import httpx
+from app.commands.loadtest import LoadGenerator, percentile, synthetic_hand
+from app.schemas.hand import HandCreate
+from app.services.settlement import settle_hand
+
+
+def test_synthetic_hands_validate_and_settle():
+    """Test generated payloads pass validation and settle to a zero sum."""
+    rng = random.Random(1)
+    for num_players in (2, 6, 9):
+        for _ in range(20):
+            hand = settle_hand(HandCreate(**synthetic_hand(rng, num_players=num_players)))
+            assert len(hand.winnings) == num_players
+            assert sum(hand.winnings.values()) == 0
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_load_generator_mix():
+    """Test the generator sends the configured mix and records latencies."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(201, json={})
+        return httpx.Response(200, json=[])
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test") as client:
+            generator = LoadGenerator(client, concurrency=4, mix={"create": 1, "get": 1, "list": 2})
+            await generator.warm_up(2)
+            return await generator.run(requests=200)
+
+    result = asyncio.run(scenario())
+    summary = result.summary()
+
+    assert sum(row["requests"] for row in summary.values()) == 200
+    assert all(summary[op]["requests"] > 0 for op in ("create", "get", "list"))
+    assert result.statuses["create"] == {201: summary["create"]["requests"]}
@@ -0,0 +1,90 @@
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.routing import Route
+from app.main import app
+from app.core.profiling import route_name, sampling_profiler
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def profiler():
+    """Enable profiling for one test."""
+    sampling_profiler.enabled = True
+    sampling_profiler.reset()
+    yield sampling_profiler
+    sampling_profiler.enabled = False
+    sampling_profiler.reset()
+
+
+def test_admin_endpoints_disabled_by_default():
+    """Test the profiling admin surface is hidden unless enabled."""
+    assert client.get("/admin/profiles").status_code == 404
+
+
+def test_profile_requested_by_header(profiler):
+    """Test a request with the profile header is sampled, including worker-thread time."""
+    response = client.post(
+        "/api/v1/equity/ranges",
+        json={"range_a": "JJ+,AQs+", "range_b": "TT-77", "board_cards": "2c5d9h"},
+        headers={"X-Profile": "1"}
+    )
+    assert response.status_code == 200
+
+    client.get("/")
+
+    summary = client.get("/admin/profiles").json()
+    assert list(summary) == ["POST /api/v1/equity/ranges"]
+    assert summary["POST /api/v1/equity/ranges"]["requests"] == 1
+
+    collapsed = client.get("/admin/profiles/collapsed", params={"route": "POST /api/v1/equity/ranges"}).text
+    assert "evaluate (equity.py" in collapsed
+    for line in collapsed.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+
+    assert client.delete("/admin/profiles").status_code == 204
+    assert client.get("/admin/profiles").json() == {}
+
+
+def test_one_in_n_sampling(profiler, monkeypatch):
+    """Test every Nth request is profiled without a header."""
+    monkeypatch.setattr(profiler, "sample_every", 2)
+
+    for _ in range(4):
+        client.get("/")
+
+    assert profiler.summary()["GET /"]["requests"] == 2
+
+
+def test_route_name_uses_path_template():
+    """Test requests are named by their route template, include prefixes kept."""
+    route = Route("/hands/{hand_id}", lambda request: None)
+    scope = {
+        "method": "GET",
+        "path": "/api/v1/hands/abc-123",
+        "path_params": {"hand_id": "abc-123"},
+        "route": route
+    }
+    assert route_name(scope) == "GET /api/v1/hands/{hand_id}"
+
+    # A parameter equal to a literal segment must not be folded into the template.
+    scope = {"method": "GET", "path": "/api/v1/hands/hands", "path_params": {"hand_id": "hands"}, "route": route}
+    assert route_name(scope) == "GET /api/v1/hands/{hand_id}"
+    assert route_name({"method": "GET", "path": "/nope"}) == "GET <unmatched>"
+
+
+def test_route_name_of_included_router():
+    """Test the full template is recovered for a route of an included router."""
+    api = FastAPI()
+    router = APIRouter(prefix="/hands")
+    names = []
+
+    @router.get("/{hand_id}")
+    async def read(hand_id: str, request: Request):
+        names.append(route_name(request.scope))
+
+    api.include_router(router, prefix="/api/v1")
+    TestClient(api).get("/api/v1/hands/v1")
+    assert names == ["GET /api/v1/hands/{hand_id}"]
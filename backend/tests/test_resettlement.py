@@ -0,0 +1,72 @@
+import json
+from app.repositories.hand_repository import hand_repository
+from app.services.poker_service import poker_service
+from app.services.resettlement import ResettleJob
+
+
+def make_row(row_id: int, winnings) -> dict:
+    """A stored hands row where players 1 and 2 split the pot without a board."""
+    return {
+        "id": row_id,
+        "hand_id": f"h{row_id}",
+        "stack_size": 10000,
+        "num_players": 3,
+        "dealer_position": 1,
+        "small_blind_position": 2,
+        "big_blind_position": 3,
+        "player_cards": {"1": "AsKd", "2": "AhKs", "3": "2c7d"},
+        "actions": "p1:r100 p2:c p3:f",
+        "board_cards": None,
+        "winnings": winnings
+    }
+
+
+def test_split_pot_is_shared():
+    """Test tied players split the pot instead of each receiving all of it."""
+    actions, board_cards = poker_service.convert_short_format_to_actions(make_row(1, {})["actions"])
+    winnings = poker_service.calculate_winnings(
+        stack_size=10000,
+        player_cards=make_row(1, {})["player_cards"],
+        actions=actions,
+        board_cards=board_cards,
+        num_players=3,
+        small_blind_position=2,
+        big_blind_position=3
+    )
+
+    assert winnings == {1: 20, 2: 20, 3: -40}
+
+
+def test_resettle_updates_only_changed_rows(monkeypatch, tmp_path):
+    """Test only rows whose winnings differ are rewritten, and finished ranges are skipped on resume."""
+    rows = {
+        1: make_row(1, {"1": 140, "2": 140, "3": -40}),
+        2: make_row(2, {"1": 20, "2": 20, "3": -40}),
+        3: make_row(3, json.dumps({"1": 140, "2": 140, "3": -40})),
+    }
+    streamed = []
+    updated = []
+
+    def stream_range(start_id, end_id, chunk_size=1000, shard=0):
+        streamed.append((start_id, end_id))
+        yield [rows[i] for i in sorted(rows) if start_id <= i < end_id]
+
+    monkeypatch.setattr(hand_repository, "stream_range", stream_range)
+    monkeypatch.setattr(hand_repository, "bulk_update_winnings", lambda updates, shard=0: updated.extend(updates))
+
+    checkpoint = str(tmp_path / "resettle.json")
+    job = ResettleJob(partition_size=2, workers=0)
+    totals = job.run(1, 4, checkpoint_path=checkpoint)
+
+    assert totals.scanned == 3
+    assert totals.changed == 2
+    assert [row_id for row_id, _ in updated] == [1, 3]
+    assert updated[0][1] == {1: 20, 2: 20, 3: -40}
+
+    streamed.clear()
+    job.run(1, 6, checkpoint_path=checkpoint)
+    assert streamed == [(3, 5), (5, 6)]
+
+    streamed.clear()
+    job.run(1, 6, checkpoint_path=checkpoint)
+    assert streamed == []
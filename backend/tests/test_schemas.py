@@ -0,0 +1,87 @@
+import pytest
+from pydantic import ValidationError
+from app.schemas.hand import HandCreate
+
+
+def make_payload(**overrides) -> dict:
+    """A valid three-handed hand that reaches the flop."""
+    payload = {
+        "hand_id": "h1",
+        "stack_size": 10000,
+        "num_players": 3,
+        "dealer_position": 1,
+        "small_blind_position": 2,
+        "big_blind_position": 3,
+        "player_cards": {"1": "AsKd", "2": "AhKs", "3": "2c7d"},
+        "actions": [
+            {"round": "preflop", "player": 1, "action": "raise", "amount": 120},
+            {"round": "preflop", "player": 2, "action": "call", "amount": 120},
+            {"round": "preflop", "player": 3, "action": "fold"},
+            {"round": "flop", "action": "deal", "cards": "3hKcQs"},
+            {"round": "flop", "player": 2, "action": "check"},
+            {"round": "flop", "player": 1, "action": "bet", "amount": 200}
+        ],
+        "board_cards": "3hKcQs"
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_valid_payload_keeps_actions_as_dicts():
+    """Test typed actions still reach settlement as plain dicts."""
+    hand = HandCreate(**make_payload())
+
+    assert hand.actions[0] == {"round": "preflop", "player": 1, "action": "raise", "amount": 120}
+    assert hand.actions[3] == {"round": "flop", "action": "deal", "cards": "3hKcQs"}
+
+
+@pytest.mark.parametrize("overrides", [
+    {"actions": [{"round": "preflop", "player": 1, "action": "shove"}]},
+    {"actions": [{"round": "preflop", "player": 1, "action": "bet"}]},
+    {"actions": [{"round": "showdown", "player": 1, "action": "check"}]},
+    {"actions": [{"round": "preflop", "player": "one", "action": "fold"}]},
+    {"actions": [{"round": "preflop", "player": 1, "action": "call", "amount": -40}]},
+    {"actions": ["p1:f"]},
+    {"player_cards": {"1": "AsKdQh"}},
+    {"player_cards": {"1": "As", "2": "AhKs"}},
+    {"board_cards": "3hKc"},
+    {"stack_size": 0},
+])
+def test_malformed_payloads_are_rejected(overrides):
+    """Test malformed actions and cards fail validation."""
+    with pytest.raises(ValidationError):
+        HandCreate(**make_payload(**overrides))
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"player_cards": {"1": "AsKd", "2": "AsKs"}}, "Duplicate cards: As"),
+    ({"board_cards": "3hKdQs"}, "Duplicate cards: Kd"),
+    ({"board_cards": "3hKcQsKc"}, "Duplicate cards: Kc"),
+    ({"board_cards": "3hKcJs"}, "not on the board: Qs"),
+    ({"board_cards": None, "player_cards": {"1": "AsKd", "2": "3hKs"}}, "Duplicate cards: 3h"),
+])
+def test_duplicate_cards_are_rejected(overrides, message):
+    """Test the same card cannot appear twice across hands, board and deals."""
+    with pytest.raises(ValidationError, match=message):
+        HandCreate(**make_payload(**overrides))
+
+
+@pytest.mark.parametrize("actions", [
+    [
+        {"round": "preflop", "player": 1, "action": "call", "amount": 20},
+        {"round": "preflop", "player": 2, "action": "check"},
+        {"round": "flop", "player": 2, "action": "bet", "amount": 40}
+    ],
+    [
+        {"round": "preflop", "player": 1, "action": "call", "amount": 20},
+        {"round": "preflop", "player": 2, "action": "check"},
+        {"round": "flop", "cards": "3hKcQs"},
+        {"round": "flop", "player": 2, "action": "check"},
+        {"round": "flop", "player": 1, "action": "check"},
+        {"round": "turn", "player": 2, "action": "bet", "amount": 40}
+    ],
+])
+def test_street_actions_need_a_deal(actions):
+    """Test acting on a later street before its cards are dealt fails validation."""
+    with pytest.raises(ValidationError, match="before it is dealt"):
+        HandCreate(**make_payload(actions=actions, board_cards=None))
@@ -0,0 +1,126 @@
+import itertools
+import os
+from datetime import datetime, timedelta
+import pytest
+from app.core import database
+from app.core.database import ShardSet, jump_hash, key_hash
+from app.models.hand import Hand
+from app.repositories.hand_repository import HandRepository, hand_repository
+from app.services import rebalance
+
+START = datetime(2024, 1, 1)
+
+
+class FakeShard:
+    """Just enough of Database for the repository's routing and merge logic."""
+
+    clock = itertools.count()
+
+    def __init__(self):
+        self.rows = []
+
+    def fetch_one(self, query, params=None, read_only=False):
+        row = make_row(params[0], next(self.clock))
+        self.rows.append(row)
+        return row
+
+    def fetch_all(self, query, params=None, read_only=False):
+        return sorted(self.rows, key=lambda row: row["created_at"], reverse=True)[:params[0]]
+
+
+def make_row(hand_id: str, minute: int) -> dict:
+    return {
+        "id": minute,
+        "hand_id": hand_id,
+        "stack_size": 10000,
+        "num_players": 2,
+        "dealer_position": 1,
+        "small_blind_position": 1,
+        "big_blind_position": 2,
+        "player_cards": {"1": "AsKd", "2": "2c7d"},
+        "actions": "p1:f",
+        "board_cards": None,
+        "winnings": {"1": -20, "2": 20},
+        "created_at": START + timedelta(minutes=minute),
+    }
+
+
+def test_jump_hash_moves_only_keys_for_the_new_shard():
+    """Test growing from 4 to 5 shards moves about a fifth of the keys, all to the new shard."""
+    keys = [key_hash(f"hand-{i}") for i in range(5000)]
+    before = [jump_hash(key, 4) for key in keys]
+    after = [jump_hash(key, 5) for key in keys]
+
+    moved = [new for old, new in zip(before, after) if old != new]
+    assert set(moved) == {4}
+    assert 0.15 < len(moved) / len(keys) < 0.25
+    assert sorted(set(before)) == [0, 1, 2, 3]
+
+
+def test_parse_hosts_with_database():
+    """Test shard entries may name a database on a shared server."""
+    assert database.parse_hosts("localhost:5433/hands_1,db2", 5432) == [
+        {"host": "localhost", "port": 5433, "database": "hands_1"},
+        {"host": "db2", "port": 5432},
+    ]
+
+
+def test_hands_route_to_owning_shard_and_recent_merges():
+    """Test writes go to the hashed shard and get_recent k-way merges every shard."""
+    fakes = [FakeShard(), FakeShard(), FakeShard()]
+    shard_set = ShardSet(fakes)
+    repository = HandRepository(shard_set)
+
+    hand_ids = [f"hand-{i}" for i in range(30)]
+    for hand_id in hand_ids:
+        repository.create(Hand(hand_id, 10000, 1, 1, 2, {1: "AsKd"}, "p1:f"))
+
+    for index, fake in enumerate(fakes):
+        assert fake.rows
+        assert all(shard_set.shard_for(row["hand_id"]) == index for row in fake.rows)
+
+    recent = repository.get_recent(limit=5)
+    assert [hand.hand_id for hand in recent] == hand_ids[:-6:-1]
+
+
+def test_rebalance_moves_misplaced_rows(monkeypatch):
+    """Test rows are copied to their new shard before being deleted from the old one."""
+    stored = {0: [make_row(f"hand-{i}", i) for i in range(20)], 1: []}
+    calls = []
+
+    monkeypatch.setattr(hand_repository, "shards", ShardSet([object(), object()]))
+    monkeypatch.setattr(hand_repository, "get_id_bounds", lambda shard=0: (1, 20) if stored[shard] else (None, None))
+    monkeypatch.setattr(
+        hand_repository, "stream_range",
+        lambda start_id, end_id, chunk_size=1000, shard=0: iter([list(stored[shard])])
+    )
+    monkeypatch.setattr(hand_repository, "copy_rows", lambda rows, shard: calls.append(("copy", shard, len(rows))))
+    monkeypatch.setattr(hand_repository, "delete_many", lambda ids, shard: calls.append(("delete", shard, len(ids))))
+
+    stats = rebalance.rebalance_shard(0)
+
+    misplaced = [row for row in stored[0] if hand_repository.shards.shard_for(row["hand_id"]) == 1]
+    assert stats.scanned == 20
+    assert stats.moved == len(misplaced) > 0
+    assert calls == [("copy", 1, len(misplaced)), ("delete", 0, len(misplaced))]
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_SHARDS"),
+    reason="set TEST_DATABASE_SHARDS=host:port/db,host:port/db to run against local Postgres shards"
+)
+def test_sharded_repository_against_local_instances():
+    """Test inserts, lookups, merged history and rebalancing against real shards."""
+    shard_set = database.build_shards(os.environ["TEST_DATABASE_SHARDS"])
+    shard_set.init_db()
+    repository = HandRepository(shard_set)
+
+    hands = [Hand(f"shard-test-{i}-{os.getpid()}", 10000, 1, 1, 2, {1: "AsKd", 2: "2c7d"}, "p1:f",
+                  num_players=2, winnings={1: -20, 2: 20}) for i in range(20)]
+    assert repository.bulk_create(hands) == 20
+    assert repository.get_by_id(hands[0].hand_id).hand_id == hands[0].hand_id
+    recent = repository.get_recent(limit=10)
+    assert [hand.created_at for hand in recent] == sorted((hand.created_at for hand in recent), reverse=True)
+
+    for hand in hands:
+        repository.delete(hand.hand_id)
@@ -0,0 +1,251 @@
+import asyncio
+import socket
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.services import table_relay as relay_module
+from app.services.table_hub import TableHub
+from app.services.table_relay import TableRelay
+import uuid
+
+client = TestClient(app)
+
+
+class FakeWebSocket:
+    """Collects messages sent by the hub."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed_with = None
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+class BrokenWebSocket(FakeWebSocket):
+    """A websocket whose peer has gone away."""
+
+    async def send_json(self, message):
+        raise RuntimeError("Cannot call send once a close message has been sent")
+
+
+class FakeNotify:
+    def __init__(self, payload):
+        self.payload = payload
+
+
+class FakeListenCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if params is not None:
+            self.connection.server.notify(params[1])
+
+
+class FakeListenConnection:
+    """A psycopg2 connection that listens on an in-memory notification server."""
+
+    def __init__(self, server):
+        self.server = server
+        self.notifies = []
+        self.closed = False
+        self.autocommit = False
+        self._reader, self._writer = socket.socketpair()
+        server.connections.append(self)
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def cursor(self):
+        return FakeListenCursor(self)
+
+    def poll(self):
+        self._reader.recv(1024)
+
+    def close(self):
+        self.closed = True
+        self._reader.close()
+        self._writer.close()
+
+
+class FakeNotifyServer:
+    def __init__(self):
+        self.connections = []
+
+    def connect(self, **params):
+        return FakeListenConnection(self)
+
+    def notify(self, payload):
+        for connection in self.connections:
+            connection.notifies.append(FakeNotify(payload))
+            connection._writer.send(b"!")
+
+
+def test_table_channel_snapshot_and_diff():
+    """Test a subscriber gets a snapshot, then diffs of its own updates."""
+    table_id = str(uuid.uuid4())
+
+    with client.websocket_connect(f"/api/v1/tables/{table_id}/ws") as websocket:
+        snapshot = websocket.receive_json()
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["state"] == {}
+
+        websocket.send_json({"type": "update", "state": {"pot": 60, "round": "preflop"}})
+        diff = websocket.receive_json()
+        assert diff["type"] == "diff"
+        assert diff["version"] == 1
+        assert diff["set"] == {"pot": 60, "round": "preflop"}
+
+        websocket.send_json({"type": "update", "state": {"pot": 60, "round": None}})
+        diff = websocket.receive_json()
+        assert diff["set"] == {}
+        assert diff["unset"] == ["round"]
+
+        response = client.get(f"/api/v1/tables/{table_id}")
+        assert response.json() == {"pot": 60}
+
+    assert client.get(f"/api/v1/tables/{table_id}").json() == {}
+
+
+def test_malformed_messages_keep_connection_open():
+    """Test non-JSON and non-object messages get an error frame, not a closed socket."""
+    table_id = str(uuid.uuid4())
+
+    with client.websocket_connect(f"/api/v1/tables/{table_id}/ws") as websocket:
+        websocket.receive_json()
+
+        for bad in ("not json", "[1, 2]", '{"type": "update", "state": [1]}'):
+            websocket.send_text(bad)
+            error = websocket.receive_json()
+            assert error["type"] == "error"
+
+        websocket.send_json({"type": "update", "state": {"pot": 10}})
+        assert websocket.receive_json()["set"] == {"pot": 10}
+
+
+def test_only_owner_may_publish():
+    """Test a second client cannot publish to a claimed table, nor anyone to the history channel."""
+    table_id = str(uuid.uuid4())
+
+    with client.websocket_connect(f"/api/v1/tables/{table_id}/ws") as owner, \
+            client.websocket_connect(f"/api/v1/tables/{table_id}/ws") as other:
+        owner.receive_json()
+        other.receive_json()
+
+        owner.send_json({"type": "update", "state": {"pot": 60}})
+        assert owner.receive_json()["set"] == {"pot": 60}
+        assert other.receive_json()["set"] == {"pot": 60}
+
+        other.send_json({"type": "update", "state": {"pot": 0}})
+        assert other.receive_json()["type"] == "error"
+        assert client.get(f"/api/v1/tables/{table_id}").json() == {"pot": 60}
+
+    with client.websocket_connect(f"/api/v1/tables/{settings.history_channel}/ws") as websocket:
+        websocket.receive_json()
+        websocket.send_json({"type": "update", "state": {"latest_hand": {"hand_id": "forged"}}})
+        assert websocket.receive_json()["type"] == "error"
+    assert "forged" not in str(client.get(f"/api/v1/tables/{settings.history_channel}").json())
+
+
+def test_updates_in_one_tick_are_batched():
+    """Test several publishes before the loop yields produce a single diff."""
+
+    async def scenario():
+        hub = TableHub(send_buffer_size=8)
+        connection = hub.connect("t1", FakeWebSocket())
+        connection.queue.get_nowait()
+
+        hub.publish("t1", {"pot": 60})
+        hub.publish("t1", {"pot": 100, "current_bet": 40})
+        await asyncio.sleep(0)
+
+        assert connection.queue.qsize() == 1
+        diff = connection.queue.get_nowait()
+        assert diff["set"] == {"pot": 100, "current_bet": 40}
+
+    asyncio.run(scenario())
+
+
+def test_slow_consumer_is_evicted():
+    """Test a subscriber whose buffer fills up is dropped and closed."""
+
+    async def scenario():
+        hub = TableHub(send_buffer_size=2)
+        websocket = FakeWebSocket()
+        connection = hub.connect("t1", websocket)
+
+        for pot in range(5):
+            hub.publish("t1", {"pot": pot})
+            hub.flush()
+
+        assert connection.evicted
+        await hub.run_sender(connection)
+        assert websocket.sent == []
+        assert websocket.closed_with == 1013
+
+    asyncio.run(scenario())
+
+
+def test_sender_stops_quietly_when_socket_is_gone():
+    """Test a failed send ends the sender instead of raising into the event loop."""
+
+    async def scenario():
+        hub = TableHub(send_buffer_size=8)
+        connection = hub.connect("t1", BrokenWebSocket())
+        await asyncio.wait_for(hub.run_sender(connection), 1)
+
+    asyncio.run(scenario())
+
+
+def test_relay_reaches_subscribers_on_other_workers(monkeypatch):
+    """Test a server update published on one worker reaches subscribers of another, once."""
+    server = FakeNotifyServer()
+    monkeypatch.setattr(relay_module.psycopg2, "connect", server.connect)
+
+    async def scenario():
+        hubs = [TableHub(send_buffer_size=8) for _ in range(2)]
+        relays = [TableRelay(hub=hub, channel="tables") for hub in hubs]
+        for relay in relays:
+            relay.start()
+        while not all(relay.listening for relay in relays):
+            await asyncio.sleep(0.01)
+
+        watchers = [hub.connect(settings.history_channel, FakeWebSocket()) for hub in hubs]
+        for watcher in watchers:
+            watcher.queue.get_nowait()
+
+        relays[0].publish(settings.history_channel, {"latest_hand": {"hand_id": "h1"}})
+        for _ in range(50):
+            if all(watcher.queue.qsize() for watcher in watchers):
+                break
+            await asyncio.sleep(0.01)
+
+        diffs = [watcher.queue.get_nowait() for watcher in watchers]
+        for relay in relays:
+            relay.stop()
+        return diffs, [watcher.queue.qsize() for watcher in watchers]
+
+    diffs, leftover = asyncio.run(scenario())
+    assert [diff["set"] for diff in diffs] == [{"latest_hand": {"hand_id": "h1"}}] * 2
+    assert [diff["version"] for diff in diffs] == [1, 1]
+    assert leftover == [0, 0]
+    assert all(connection.closed for connection in server.connections)
+
+
+def test_relay_publishes_locally_without_listener():
+    """Test updates still reach this worker's subscribers when the relay is not listening."""
+    hub = TableHub(send_buffer_size=8)
+    relay = TableRelay(hub=hub)
+
+    relay.publish(settings.history_channel, {"latest_hand": {"hand_id": "h1"}})
+    assert hub.get_state(settings.history_channel) == {"latest_hand": {"hand_id": "h1"}}
@@ -34,6 +34,7 @@ export interface GameAction {
 export interface HandCreateRequest {
     hand_id: string;
     stack_size: number;
+    num_players?: number;
     dealer_position: number;
     small_blind_position: number;
     big_blind_position: number;
@@ -46,6 +47,7 @@ export interface HandResponse {
     id: number;
     hand_id: string;
     stack_size: number;
+    num_players: number;
     dealer_position: number;
     small_blind_position: number;
     big_blind_position: number;